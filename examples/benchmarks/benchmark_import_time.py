@@ -0,0 +1,59 @@
+# Copyright 2022-2023 OmniSafe Team. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Benchmark the startup time of ``import omnisafe`` in fresh processes."""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+
+HEAVY_MODULES = ('wandb', 'torch.utils.tensorboard', 'safety_gymnasium', 'moviepy')
+
+
+def time_import(statement: str) -> float:
+    """Time ``statement`` in a fresh Python process, including the interpreter startup.
+
+    Args:
+        statement (str): The Python statement to run.
+    """
+    start = time.perf_counter()
+    subprocess.run([sys.executable, '-c', statement], check=True)
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--repeats', type=int, default=5, help='Number of fresh processes')
+    args = parser.parse_args()
+
+    baseline = [time_import('import torch') for _ in range(args.repeats)]
+    timings = [time_import('import omnisafe') for _ in range(args.repeats)]
+    print(f'import torch:    {statistics.median(baseline):.3f}s (median of {args.repeats})')
+    print(f'import omnisafe: {statistics.median(timings):.3f}s (median of {args.repeats})')
+
+    loaded = subprocess.run(
+        [
+            sys.executable,
+            '-c',
+            'import sys, omnisafe; '
+            f'print(*[name for name in {HEAVY_MODULES!r} if name in sys.modules])',
+        ],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout.split()
+    print(f'heavy modules loaded by import omnisafe: {loaded or None}')
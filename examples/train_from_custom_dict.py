@@ -28,9 +28,15 @@ parser.add_argument(
     metavar='N',
     help='Number of paralleled progress for calculations.',
 )
+parser.add_argument(
+    '--algo',
+    default='PPOLag',
+    type=str,
+    help='The algorithm to train.',
+)
 custom_dict = {'epochs': 1, 'data_dir': './runs'}
 args, _ = parser.parse_known_args()
-agent = omnisafe.Agent('PPOLag', env_id, custom_cfgs=custom_dict, parallel=args.parallel)
+agent = omnisafe.Agent(args.algo, env_id, custom_cfgs=custom_dict, parallel=args.parallel)
 agent.learn()
 
 # obs = env.reset()
@@ -17,40 +17,7 @@
 import itertools
 from types import MappingProxyType
 
-from omnisafe.algorithms import model_based, off_policy, on_policy
-
-# Model-based Safe
-from omnisafe.algorithms.model_based import CAP, MBPPOLag, SafeLOOP
-
-# Off-Policy Safe
-from omnisafe.algorithms.off_policy import DDPG, SAC, SDDPG, TD3, DDPGLag, SACLag, TD3Lag
-
-# On-Policy Safe
-from omnisafe.algorithms.on_policy import (
-    CPO,
-    CUP,
-    FOCOPS,
-    PCPO,
-    PDO,
-    PPO,
-    RCPO,
-    TRPO,
-    CPPOPid,
-    NaturalPG,
-    OnCRPO,
-    PolicyGradient,
-    PPOEarlyTerminated,
-    PPOLag,
-    PPOLagEarlyTerminated,
-    PPOLagSaute,
-    PPOLagSimmerPid,
-    PPOLagSimmerQ,
-    PPOSaute,
-    PPOSimmerPid,
-    PPOSimmerQ,
-    TRPOLag,
-    TRPOPid,
-)
+from omnisafe.algorithms import model_based, off_policy, on_policy, registry
 
 
 ALGORITHMS = {
@@ -67,6 +34,15 @@ __all__ = ALGORITHMS['all'] = tuple(itertools.chain.from_iterable(ALGORITHMS.val
 
 assert len(ALGORITHM2TYPE) == len(__all__), 'Duplicate algorithm names found.'
 
+__getattr__ = registry.lazy_import(
+    __name__,
+    {
+        name: subpackage.__name__
+        for subpackage in (model_based, off_policy, on_policy)
+        for name in subpackage.__all__
+    },
+)
+
 ALGORITHMS = MappingProxyType(ALGORITHMS)  # make this immutable
 ALGORITHM2TYPE = MappingProxyType(ALGORITHM2TYPE)  # make this immutable
 
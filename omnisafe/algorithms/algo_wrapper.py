@@ -17,9 +17,9 @@
 import difflib
 import os
 import sys
+from typing import Optional
 
 import psutil
-from safety_gymnasium.utils.registration import safe_registry
 
 from omnisafe.algorithms import ALGORITHM2TYPE, ALGORITHMS, registry
 from omnisafe.utils import distributed_utils
@@ -51,6 +51,9 @@ class AlgoWrapper:
             f"{self.algo} doesn't exist. "
             f"Did you mean {difflib.get_close_matches(self.algo, ALGORITHMS['all'], n=1)[0]}?"
         )
+        # pylint: disable-next=import-outside-toplevel
+        from safety_gymnasium.utils.registration import safe_registry
+
         assert self.env_id in safe_registry, (
             f"{self.env_id} doesn't exist. "
             f'Did you mean {difflib.get_close_matches(self.env_id, safe_registry, n=1)[0]}?'
@@ -58,11 +61,17 @@ class AlgoWrapper:
         self.algo_type = ALGORITHM2TYPE.get(self.algo, None)
         if self.algo_type is None or self.algo_type == '':
             raise ValueError(f'{self.algo} is not supported!')
-        if self.algo_type in ['off-policy', 'model-based']:
-            assert self.parallel == 1, 'off-policy or model-based only support parallel==1!'
+        # the policy steps of CVPO and SDDPG solve a problem on the local batch of each process
+        if self.algo_type == 'model-based' or self.algo in ['CVPO', 'SDDPG']:
+            assert self.parallel == 1, f'{self.algo} only supports parallel==1!'
+
+    def learn(self, resume_from: Optional[str] = None):
+        """Agent Learning.
 
-    def learn(self):
-        """Agent Learning."""
+        Args:
+            resume_from (str, optional): The log directory of an interrupted run,
+                saved with ``checkpoint_training_state``, to resume training from.
+        """
         # Use number of physical cores as default.
         # If also hardware threading CPUs should be used
         # enable this by the use_number_of_threads=True
@@ -86,6 +95,8 @@ class AlgoWrapper:
             env_id=self.env_id,
             cfgs=cfgs,
         )
+        if resume_from is not None:
+            agent.load_training_state(resume_from)
         agent.learn()
         return agent.env.record_queue.get_mean('ep_ret', 'ep_cost', 'ep_len')
 
@@ -14,9 +14,15 @@
 # ==============================================================================
 """Model-Based algorithms."""
 
-from omnisafe.algorithms.model_based.cap import CAP
-from omnisafe.algorithms.model_based.mbppo_lag import MBPPOLag
-from omnisafe.algorithms.model_based.safeloop import SafeLOOP
+from typing import TYPE_CHECKING
+
+from omnisafe.algorithms import registry
+
+
+if TYPE_CHECKING:
+    from omnisafe.algorithms.model_based.cap import CAP
+    from omnisafe.algorithms.model_based.mbppo_lag import MBPPOLag
+    from omnisafe.algorithms.model_based.safeloop import SafeLOOP
 
 
 __all__ = [
@@ -24,3 +30,12 @@ __all__ = [
     'MBPPOLag',
     'SafeLOOP',
 ]
+
+__getattr__ = registry.lazy_import(
+    __name__,
+    {
+        'CAP': '.cap',
+        'MBPPOLag': '.mbppo_lag',
+        'SafeLOOP': '.safeloop',
+    },
+)
@@ -281,6 +281,24 @@ class EnsembleDynamicsModel:
         self._state = {}
         self._snapshots = {i: (None, 1e10) for i in range(self.network_size)}
 
+    def state_dict(self):
+        """Get the state of the ensemble, its optimizer and its input scaler."""
+        return {
+            'ensemble_model': self.ensemble_model.state_dict(),
+            'optimizer': self.ensemble_model.optimizer.state_dict(),
+            'scaler': (self.scaler.mean, self.scaler.std),
+            'elite_model_idxes': list(self.elite_model_idxes),
+        }
+
+    def load_state_dict(self, state_dict):
+        """Load the state returned by :meth:`state_dict`."""
+        self.ensemble_model.load_state_dict(state_dict['ensemble_model'])
+        self.ensemble_model.optimizer.load_state_dict(state_dict['optimizer'])
+        self.scaler.mean, self.scaler.std = state_dict['scaler']
+        self.scaler.mean_t = torch.as_tensor(self.scaler.mean, dtype=torch.float32).to(self.device)
+        self.scaler.std_t = torch.as_tensor(self.scaler.std, dtype=torch.float32).to(self.device)
+        self.elite_model_idxes = list(state_dict['elite_model_idxes'])
+
     # pylint: disable-next=too-many-locals, too-many-arguments
     def train(self, inputs, labels, batch_size=256, holdout_ratio=0.0, max_epochs_since_update=5):
         """train dynamics, holdout_ratio is the data ratio hold out for validation"""
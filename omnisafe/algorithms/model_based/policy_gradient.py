@@ -25,7 +25,7 @@ from omnisafe.algorithms.model_based.models import EnsembleDynamicsModel, Virtua
 from omnisafe.common.buffer import OffPolicyBuffer
 from omnisafe.common.logger import Logger
 from omnisafe.models.constraint_actor_critic import ConstraintActorCritic
-from omnisafe.utils import core
+from omnisafe.utils import core, training_state
 from omnisafe.utils.distributed_utils import proc_id
 from omnisafe.wrappers import wrapper_registry
 
@@ -57,6 +57,10 @@ class PolicyGradientModelBased:  # pylint: disable=too-many-instance-attributes
             seed=cfgs.seed,
             use_tensorboard=cfgs.use_tensorboard,
             use_wandb=cfgs.use_wandb,
+            async_logging=cfgs.async_logging,
+            async_checkpoint=cfgs.async_checkpoint,
+            keep_checkpoint_last=cfgs.keep_checkpoint_last,
+            keep_checkpoint_every=cfgs.keep_checkpoint_every,
             config=cfgs,
         )
 
@@ -101,6 +105,13 @@ class PolicyGradientModelBased:  # pylint: disable=too-many-instance-attributes
         # Setup statistics
         self.start_time = time.time()
         self.epoch_time = time.time()
+        # the counters to start from, set by :meth:`load_training_state`
+        self.start_progress = {
+            'time_step': 0,
+            'last_policy_update': 0,
+            'last_dynamics_update': 0,
+            'last_log': 0,
+        }
 
         self.logger.log('Start with training.')
 
@@ -122,8 +133,10 @@ class PolicyGradientModelBased:  # pylint: disable=too-many-instance-attributes
         self.start_time = time.time()
         ep_len, ep_ret, ep_cost = 0, 0, 0
         state = self.env.reset()
-        time_step = 0
-        last_policy_update, last_dynamics_update, last_log = 0, 0, 0
+        time_step = self.start_progress['time_step']
+        last_policy_update = self.start_progress['last_policy_update']
+        last_dynamics_update = self.start_progress['last_dynamics_update']
+        last_log = self.start_progress['last_log']
         while time_step < self.cfgs.max_real_time_steps:
             # select action
             action, action_info = self.select_action(time_step, state, self.env)
@@ -186,9 +199,42 @@ class PolicyGradientModelBased:  # pylint: disable=too-many-instance-attributes
                 self.log(time_step)
                 self.logger.torch_save()
                 last_log = time_step
+                if self.cfgs.checkpoint_training_state:
+                    self.save_training_state(
+                        {
+                            'time_step': time_step,
+                            'last_policy_update': last_policy_update,
+                            'last_dynamics_update': last_dynamics_update,
+                            'last_log': last_log,
+                        }
+                    )
         # Close opened files to avoid number of open files overflow
         self.logger.close()
 
+    def save_training_state(self, progress):
+        """Save the full training state and the replay buffer, to resume training from.
+
+        Args:
+            progress (dict): The step counters to resume from.
+        """
+        training_state.save_training_state(
+            self, self.logger.log_dir, progress=progress, buffer=self.off_replay_buffer
+        )
+
+    def load_training_state(self, log_dir):
+        """Load the training state saved by :meth:`save_training_state` of an interrupted run.
+
+        .. note::
+            The episode in progress when the state was saved is restarted.
+
+        Args:
+            log_dir (str): The log directory of the interrupted run.
+        """
+        self.start_progress = training_state.load_training_state(
+            self, log_dir, buffer=self.off_replay_buffer
+        )
+        self.logger.log(f"Resume training from step {self.start_progress['time_step']}.")
+
     def log(self, time_step: int):
         """
         logging data
@@ -22,6 +22,7 @@ import torch
 from omnisafe.algorithms import registry
 from omnisafe.algorithms.model_based.planner import ARCPlanner
 from omnisafe.algorithms.model_based.policy_gradient import PolicyGradientModelBased
+from omnisafe.common.polyak_averager import PolyakAverager
 from omnisafe.models.actor_q_critic import ActorQCritic
 from omnisafe.utils import core
 
@@ -101,7 +102,7 @@ class SafeLOOP(
             act_targ, logp_a_next = self.ac_targ.actor.predict(
                 obs, deterministic=False, need_log_prob=True
             )
-            q_targ = torch.min(torch.vstack(self.ac_targ.critic(next_obs, act_targ)), dim=0).values
+            q_targ = self.ac_targ.critic(next_obs, act_targ).min(dim=0).values
             backup = rew + self.cfgs.gamma * (1 - done) * (q_targ - self.alpha * logp_a_next)
         # MSE loss against Bellman backup
         loss_q = []
@@ -149,12 +150,7 @@ class SafeLOOP(
 
     def polyak_update_target(self):
         """Polyak update target network."""
-        with torch.no_grad():
-            for param, param_targ in zip(self.actor_critic.parameters(), self.ac_targ.parameters()):
-                # Notes: We use an in-place operations "mul_", "add_" to update target
-                # params, as opposed to "mul" and "add", which would make new tensors.
-                param_targ.data.mul_(self.cfgs.polyak)
-                param_targ.data.add_((1 - self.cfgs.polyak) * param.data)
+        self.target_averager.update()
 
     def update_value_net(self, data: dict) -> None:
         """Update value network.
@@ -198,6 +194,7 @@ class SafeLOOP(
             param.requires_grad = False
         for param in self.ac_targ.critic.parameters():
             param.requires_grad = False
+        self.target_averager = PolyakAverager(self.actor_critic, self.ac_targ, self.cfgs.polyak)
 
     def algorithm_specific_logs(self, time_step):
         """Log algo parameter"""
@@ -14,18 +14,24 @@
 # ==============================================================================
 """Off-policy algorithms."""
 
-from omnisafe.algorithms.off_policy.crpo import OffCRPO
-from omnisafe.algorithms.off_policy.cvpo import CVPO
-from omnisafe.algorithms.off_policy.ddpg import DDPG
-from omnisafe.algorithms.off_policy.ddpg_lag import DDPGLag
-from omnisafe.algorithms.off_policy.ddpg_pid import DDPGPid
-from omnisafe.algorithms.off_policy.sac import SAC
-from omnisafe.algorithms.off_policy.sac_lag import SACLag
-from omnisafe.algorithms.off_policy.sac_pid import SACPid
-from omnisafe.algorithms.off_policy.sddpg import SDDPG
-from omnisafe.algorithms.off_policy.td3 import TD3
-from omnisafe.algorithms.off_policy.td3_lag import TD3Lag
-from omnisafe.algorithms.off_policy.td3_pid import TD3Pid
+from typing import TYPE_CHECKING
+
+from omnisafe.algorithms import registry
+
+
+if TYPE_CHECKING:
+    from omnisafe.algorithms.off_policy.crpo import OffCRPO
+    from omnisafe.algorithms.off_policy.cvpo import CVPO
+    from omnisafe.algorithms.off_policy.ddpg import DDPG
+    from omnisafe.algorithms.off_policy.ddpg_lag import DDPGLag
+    from omnisafe.algorithms.off_policy.ddpg_pid import DDPGPid
+    from omnisafe.algorithms.off_policy.sac import SAC
+    from omnisafe.algorithms.off_policy.sac_lag import SACLag
+    from omnisafe.algorithms.off_policy.sac_pid import SACPid
+    from omnisafe.algorithms.off_policy.sddpg import SDDPG
+    from omnisafe.algorithms.off_policy.td3 import TD3
+    from omnisafe.algorithms.off_policy.td3_lag import TD3Lag
+    from omnisafe.algorithms.off_policy.td3_pid import TD3Pid
 
 
 __all__ = [
@@ -42,3 +48,21 @@ __all__ = [
     'SACPid',
     'OffCRPO',
 ]
+
+__getattr__ = registry.lazy_import(
+    __name__,
+    {
+        'OffCRPO': '.crpo',
+        'CVPO': '.cvpo',
+        'DDPG': '.ddpg',
+        'DDPGLag': '.ddpg_lag',
+        'DDPGPid': '.ddpg_pid',
+        'SAC': '.sac',
+        'SACLag': '.sac_lag',
+        'SACPid': '.sac_pid',
+        'SDDPG': '.sddpg',
+        'TD3': '.td3',
+        'TD3Lag': '.td3_lag',
+        'TD3Pid': '.td3_pid',
+    },
+)
@@ -21,6 +21,7 @@ import torch.nn.functional as F
 
 from omnisafe.algorithms import registry
 from omnisafe.algorithms.off_policy.ddpg import DDPG
+from omnisafe.utils import distributed_utils
 
 
 @registry.register
@@ -34,6 +35,9 @@ class OffCRPO(DDPG):
         - URL: `CRPO <https://arxiv.org/pdf/2011.05869.pdf>`_
     """
 
+    #: The update counters restored when resuming training.
+    state_attributes = ('rew_update', 'cost_update')
+
     def __init__(self, env_id: str, cfgs: NamedTuple) -> None:
         """Initialize CRPO."""
         DDPG.__init__(
@@ -94,7 +98,8 @@ class OffCRPO(DDPG):
         _, action = self.actor_critic.actor.predict(obs, deterministic=False, need_log_prob=False)
         loss_pi_c = self.actor_critic.cost_critic(obs, action)[0]
         loss_pi_c = F.relu(loss_pi_c - self.cost_limit)
-        if loss_pi_c.mean().item() > self.cost_limit:
+        # the cost is averaged over the processes, so that they all update the same objective
+        if float(distributed_utils.mpi_avg(loss_pi_c.mean().item())) > self.cost_limit:
             loss_pi = -loss_pi_c
             self.cost_update += 1
         else:
@@ -39,6 +39,9 @@ class CVPO(DDPG):
         - URL: https://arxiv.org/abs/2201.11927v2
     """
 
+    #: The dual variables restored when resuming training.
+    state_attributes = ('eta', 'lam')
+
     def __init__(
         self,
         env_id: str,
@@ -14,19 +14,29 @@
 # ==============================================================================
 """Implementation of the DDPG algorithm."""
 
+import os
 import time
 from copy import deepcopy
-from typing import Dict, NamedTuple, Tuple
+from typing import Dict, List, NamedTuple, Optional, Tuple
 
 import numpy as np
 import torch
+from torch import nn
 
 from omnisafe.algorithms import registry
-from omnisafe.common.buffer import VectorOffPolicyBuffer
+from omnisafe.common.async_collector import AsyncCollector
+from omnisafe.common.buffer import (
+    BatchPrefetcher,
+    DeduplicatedVectorOffPolicyBuffer,
+    MemmapVectorOffPolicyBuffer,
+    PrioritizedVectorOffPolicyBuffer,
+    VectorOffPolicyBuffer,
+)
 from omnisafe.common.logger import Logger
+from omnisafe.common.polyak_averager import PolyakAverager
 from omnisafe.common.record_queue import RecordQueue
 from omnisafe.models.constraint_actor_q_critic import ConstraintActorQCritic
-from omnisafe.utils import core, distributed_utils
+from omnisafe.utils import core, distributed_utils, training_state
 from omnisafe.wrappers import wrapper_registry
 
 
@@ -43,6 +53,9 @@ class DDPG:
         - URL: `DDPG <https://arxiv.org/abs/1509.02971>`_
     """
 
+    #: The decayed cost limit restored when resuming training.
+    state_attributes = ('cost_limit',)
+
     def __init__(self, env_id: str, cfgs: NamedTuple) -> None:
         """Initialize DDPG.
 
@@ -51,6 +64,7 @@ class DDPG:
             cfgs (NamedTuple): Configuration dictionary.
         """
         self.algo = self.__class__.__name__
+        self.env_id = env_id
         self.cfgs = deepcopy(cfgs)
         self.wrapper_type = self.cfgs.wrapper_type
         self.device = (
@@ -68,6 +82,8 @@ class DDPG:
             cfgs.steps_per_epoch // cfgs.env_cfgs.num_envs // distributed_utils.num_procs() + 1
         )
         self.total_steps = self.cfgs.epochs * self.cfgs.steps_per_epoch
+        # each process collects its share of the steps of each epoch
+        self.proc_steps_per_epoch = self.cfgs.steps_per_epoch // distributed_utils.num_procs()
         # the steps in each process should be integer
         assert self.cfgs.steps_per_epoch % distributed_utils.num_procs() == 0, (
             f'Number of processes ({distributed_utils.num_procs()})'
@@ -80,6 +96,10 @@ class DDPG:
         )
         # ensure valid number for iteration
         assert cfgs.update_every > 0, 'update_every should be greater than 0.'
+        # the number of updates with decoupled actors differs between the processes
+        assert (
+            cfgs.async_cfgs.num_actors == 0 or distributed_utils.num_procs() == 1
+        ), 'Decoupled actors are not supported with multiple processes.'
         self.max_ep_len = self.env.rollout_data.max_ep_len
 
         self.env.set_rollout_cfgs(
@@ -94,6 +114,10 @@ class DDPG:
             seed=cfgs.seed,
             use_tensorboard=cfgs.use_tensorboard,
             use_wandb=cfgs.use_wandb,
+            async_logging=cfgs.async_logging,
+            async_checkpoint=cfgs.async_checkpoint,
+            keep_checkpoint_last=cfgs.keep_checkpoint_last,
+            keep_checkpoint_every=cfgs.keep_checkpoint_every,
             config=cfgs,
         )
         # setup actor-critic module
@@ -104,22 +128,66 @@ class DDPG:
         ).to(self.device)
         # set up experience buffer
         # obs_dim, act_dim, size, batch_size
-        self.buf = VectorOffPolicyBuffer(
-            obs_space=self.env.observation_space,
-            act_space=self.env.action_space,
-            size=cfgs.replay_buffer_cfgs.size,
-            batch_size=cfgs.replay_buffer_cfgs.batch_size,
-            num_envs=cfgs.env_cfgs.num_envs,
+        buffer_kwargs = {
+            'obs_space': self.env.observation_space,
+            'act_space': self.env.action_space,
+            'size': cfgs.replay_buffer_cfgs.size,
+            'batch_size': cfgs.replay_buffer_cfgs.batch_size,
+            'num_envs': cfgs.env_cfgs.num_envs,
+            # with prefetching, the batches are sent to the device on a background thread
+            'device': torch.device('cpu') if cfgs.replay_buffer_cfgs.prefetch else self.device,
+            'dtypes': {
+                key: getattr(torch, value) for key, value in cfgs.replay_buffer_cfgs.dtypes.items()
+            },
+        }
+        if cfgs.replay_buffer_cfgs.prioritized:
+            self.buf = PrioritizedVectorOffPolicyBuffer(
+                alpha=cfgs.replay_buffer_cfgs.alpha,
+                beta=cfgs.replay_buffer_cfgs.beta,
+                cost_priority_scale=cfgs.replay_buffer_cfgs.cost_priority_scale,
+                **buffer_kwargs,
+            )
+        elif cfgs.replay_buffer_cfgs.directory is not None:
+            directory = cfgs.replay_buffer_cfgs.directory
+            if distributed_utils.num_procs() > 1:
+                # each process keeps its own shard of the replay buffer
+                directory = os.path.join(directory, f'proc-{distributed_utils.proc_id()}')
+            self.buf = MemmapVectorOffPolicyBuffer(
+                directory=directory,
+                cache_size=cfgs.replay_buffer_cfgs.cache_size,
+                **buffer_kwargs,
+            )
+        elif cfgs.replay_buffer_cfgs.deduplicate_obs:
+            self.buf = DeduplicatedVectorOffPolicyBuffer(**buffer_kwargs)
+        else:
+            self.buf = VectorOffPolicyBuffer(**buffer_kwargs)
+        # the number of gradient updates after each roll out of ``update_every`` steps
+        self.num_updates = cfgs.update_every * cfgs.utd_ratio
+        # the fused loop gathers all the batches of an update phase at once
+        self.prefetcher = BatchPrefetcher(
+            self.buf,
             device=self.device,
+            group_size=self.num_updates if cfgs.fused_update else 8,
         )
+        # the importance sampling weights of the batch, and the TD errors of its critics
+        self._importance_weights: Optional[torch.Tensor] = None
+        self._td_errors: Optional[Dict[str, List[torch.Tensor]]] = None
         # set up optimizer for policy and q-function
         self.actor_optimizer = core.set_optimizer(
             'Adam', module=self.actor_critic.actor, learning_rate=cfgs.actor_lr
         )
-        self.critic_optimizer = core.set_optimizer(
-            'Adam', module=self.actor_critic.critic, learning_rate=cfgs.critic_lr
-        )
-        if cfgs.use_cost:
+        if cfgs.use_cost and cfgs.fused_update:
+            # the critics share one optimizer, whose step updates both of them at once
+            self.critic_optimizer = core.set_optimizer(
+                'Adam',
+                module=nn.ModuleList([self.actor_critic.critic, self.actor_critic.cost_critic]),
+                learning_rate=cfgs.critic_lr,
+            )
+        else:
+            self.critic_optimizer = core.set_optimizer(
+                'Adam', module=self.actor_critic.critic, learning_rate=cfgs.critic_lr
+            )
+        if cfgs.use_cost and not cfgs.fused_update:
             self.cost_critic_optimizer = core.set_optimizer(
                 'Adam', module=self.actor_critic.cost_critic, learning_rate=cfgs.critic_lr
             )
@@ -127,7 +195,10 @@ class DDPG:
         self.scheduler = self.set_learning_rate_scheduler()
         # set up target network for off_policy training
         self._ac_training_setup()
+        if cfgs.compile_update:
+            self._compile_networks()
         torch.set_num_threads(10)
+        self.set_mpi()
         # set up model saving
         what_to_save = {
             'pi': self.actor_critic.actor,
@@ -141,9 +212,39 @@ class DDPG:
         self.logger.log('Start with training.')
         self.loss_record = RecordQueue('loss_pi', 'loss_q', 'loss_c', maxlen=100)
         self.cost_limit = None
+        # the step to start from, set by :meth:`load_training_state`
+        self.resume_step = 0
 
         self._init_log()
 
+    def set_mpi(self) -> None:
+        """Initialize MPI specifics.
+
+        Sync parameters of the online and target networks across processes,
+        only once necessary, as the gradients are averaged and the targets follow
+        the online networks by polyak averaging.
+        """
+        if distributed_utils.num_procs() > 1:
+            # avoid slowdowns from PyTorch + MPI combo
+            distributed_utils.setup_torch_for_mpi()
+            start = time.time()
+            self.logger.log('INFO: Sync actor critic parameters')
+            distributed_utils.sync_params(self.actor_critic)
+            distributed_utils.sync_params(self.ac_targ)
+            self.logger.log(f'Done! (took {time.time()-start:0.3f} sec.)')
+
+    def check_distributed_parameters(self) -> None:
+        """Check if parameters are synchronized across all processes."""
+        if distributed_utils.num_procs() > 1:
+            self.logger.log('Check if distributed parameters are synchronous..')
+            modules = {'ActorCritic': self.actor_critic, 'TargetActorCritic': self.ac_targ}
+            for key, module in modules.items():
+                # the target networks are frozen, so all the parameters are gathered
+                flat_params = nn.utils.parameters_to_vector(module.parameters())
+                global_min = distributed_utils.mpi_min(torch.sum(flat_params))
+                global_max = distributed_utils.mpi_max(torch.sum(flat_params))
+                assert torch.allclose(global_min, global_max), f'{key} not synced.'
+
     def _init_log(self):
         self.logger.register_key('Train/Epoch')
         self.logger.register_key('Metrics/EpRet')
@@ -248,6 +349,28 @@ class DDPG:
             param.requires_grad = False
         for param in self.ac_targ.cost_critic.parameters():
             param.requires_grad = False
+        self.target_averager = PolyakAverager(self.actor_critic, self.ac_targ, self.cfgs.polyak)
+        # the actor step only differentiates these, so the critics need not be frozen for it
+        self._actor_params = [
+            param for param in self.actor_critic.actor.parameters() if param.requires_grad
+        ]
+
+    def _compile_networks(self) -> None:
+        """Compile the MLPs of the online and target networks with ``torch.compile``.
+
+        The MLPs are compiled in place, so the parameters, optimizers and saved state dicts
+        are unchanged, and each one is compiled on its first call.
+        """
+
+        def compile_mlps(module: nn.Module) -> None:
+            for child in module.children():
+                if isinstance(child, nn.Sequential):
+                    child.compile()
+                else:
+                    compile_mlps(child)
+
+        compile_mlps(self.actor_critic)
+        compile_mlps(self.ac_targ)
 
     def compute_loss_pi(self, obs: torch.Tensor) -> Tuple[torch.Tensor, Dict[str, torch.Tensor]]:
         r"""Computing ``pi/actor`` loss.
@@ -297,7 +420,7 @@ class DDPG:
         q_value = self.actor_critic.critic(obs, act)[0]
         self.logger.store(
             **{
-                'Train/RewardQValues': q_value.mean().item(),
+                'Train/RewardQValues': q_value,
             }
         )
         # Bellman backup for Q function
@@ -308,7 +431,7 @@ class DDPG:
             q_targ = self.ac_targ.critic(next_obs, act_targ)[0]
             backup = rew + self.cfgs.gamma * (1 - done) * q_targ
         # MSE loss against Bellman backup
-        loss_q = ((q_value - backup) ** 2).mean()
+        loss_q = self.compute_critic_loss(q_value, backup)
         # useful info for logging
         q_info = {'QVals': q_value.detach().mean().item()}
         return loss_q, q_info
@@ -341,7 +464,7 @@ class DDPG:
         cost_q_value = self.actor_critic.cost_critic(obs, act)[0]
         self.logger.store(
             **{
-                'Train/CostQValues': cost_q_value.mean().item(),
+                'Train/CostQValues': cost_q_value,
             }
         )
         # Bellman backup for Q function
@@ -352,12 +475,36 @@ class DDPG:
             qc_targ = self.ac_targ.cost_critic(next_obs, act_targ)[0]
             backup = cost + self.cfgs.gamma * qc_targ
         # MSE loss against Bellman backup
-        loss_qc = ((cost_q_value - backup) ** 2).mean()
+        loss_qc = self.compute_critic_loss(cost_q_value, backup, critic='cost')
         # useful info for logging
         qc_info = {'QCosts': cost_q_value.detach().mean().item()}
 
         return loss_qc, qc_info
 
+    def compute_critic_loss(
+        self,
+        value: torch.Tensor,
+        backup: torch.Tensor,
+        critic: str = 'reward',
+    ) -> torch.Tensor:
+        """Computing the MSE loss of a critic against its Bellman backup.
+
+        With prioritized experience replay, the squared TD errors are weighted by the
+        importance sampling weights of the batch, and the absolute TD errors are recorded
+        to update the priorities in :meth:`update`.
+
+        Args:
+            value (:class:`torch.Tensor`): The value predicted by the critic.
+            backup (:class:`torch.Tensor`): The Bellman backup.
+            critic (str): The critic, ``reward`` or ``cost``.
+        """
+        td_error = value - backup
+        if self._td_errors is not None:
+            self._td_errors.setdefault(critic, []).append(td_error.detach().abs())
+        if self._importance_weights is None:
+            return td_error.pow(2).mean()
+        return (self._importance_weights * td_error.pow(2)).mean()
+
     def learn(self) -> ConstraintActorQCritic:
         r"""This is main function for algorithm update, divided into the following steps:
 
@@ -372,15 +519,20 @@ class DDPG:
             For details, sees in :class:`DDPGLag`.
 
         - :meth:`log`: epoch/update information for visualization and terminal log print.
+
+        With ``num_actors`` in ``async_cfgs``, the collection runs in actor processes,
+        concurrently with the updates, see :meth:`learn_async`.
         """
+        if self.cfgs.async_cfgs.num_actors > 0:
+            return self.learn_async()
         for steps in range(
-            0, self.local_steps_per_epoch * self.cfgs.epochs, self.cfgs.update_every
+            self.resume_step, self.local_steps_per_epoch * self.cfgs.epochs, self.cfgs.update_every
         ):
             # until start_steps have elapsed, randomly sample actions
             # from a uniform distribution for better exploration. Afterwards,
             # use the learned policy (with some noise, via act_noise).
             use_rand_action = steps < self.cfgs.start_steps
-            roll_out_steps = steps % self.cfgs.steps_per_epoch
+            roll_out_steps = steps % self.proc_steps_per_epoch
             self.env.off_policy_roll_out(
                 self.actor_critic,
                 self.buf,
@@ -392,26 +544,101 @@ class DDPG:
 
             # update handling
             if steps >= self.cfgs.update_after:
-                for _ in range(self.cfgs.update_every):
-                    batch = self.buf.sample_batch()
+                for batch in self.prefetcher.batches(self.num_updates):
                     self.update(data=batch)
 
             # end of epoch handling
-            if (roll_out_steps + self.cfgs.update_every) >= self.cfgs.steps_per_epoch:
-                epoch = steps // self.cfgs.steps_per_epoch + 1
-                if self.cfgs.cost_limit_decay:
-                    self.cost_limit_decay(epoch, self.cfgs.end_epoch)
-                if self.cfgs.exploration_noise_anneal:
-                    self.actor_critic.anneal_exploration(frac=epoch / self.cfgs.epochs)
-
-                # save model to disk
-                if (epoch + 1) % self.cfgs.save_freq == 0:
-                    self.logger.torch_save()
-                # log info about epoch
-                self.test_agent()
-                self.log(epoch, steps)
+            if (roll_out_steps + self.cfgs.update_every) >= self.proc_steps_per_epoch:
+                self.end_epoch(steps)
+
+        # close opened files to avoid number of open files overflow
+        self.logger.close()
         return self.actor_critic
 
+    def learn_async(self) -> ConstraintActorQCritic:
+        """The main function of the decoupled actor/learner mode, see :meth:`learn`.
+
+        The transitions are collected by the actor processes of :class:`AsyncCollector`,
+        in chunks of ``update_every`` steps, while the learner updates.
+        The learner stores the chunks as they arrive, and updates in groups of
+        ``update_every`` updates in between, as long as the number of updates does not exceed
+        ``utd_ratio`` times the number of steps collected after ``update_after``.
+        Beyond that bound, the learner waits for the actors.
+        The policy snapshot of the actors is refreshed every ``sync_every`` updates,
+        with the observation statistics of the learner, which are updated with the raw
+        observations of the chunks.
+        """
+        collector = AsyncCollector(
+            self.env_id,
+            self.cfgs,
+            self.actor_critic,
+            obs_normalizer=self.env.obs_normalizer,
+            start_step=self.resume_step,
+        )
+        sync_every = self.cfgs.async_cfgs.sync_every
+        steps = self.resume_step
+        # a resumed run has already made the updates of the steps it resumes from
+        num_updates = max(0, (steps - self.cfgs.update_after) * self.cfgs.utd_ratio)
+        try:
+            while steps < self.local_steps_per_epoch * self.cfgs.epochs:
+                max_updates = (steps - self.cfgs.update_after) * self.cfgs.utd_ratio
+                chunk = collector.get(block=num_updates >= max_updates)
+                if chunk is not None:
+                    transitions, records, raw_obs = chunk
+                    for step in range(len(transitions['obs'])):
+                        self.buf.store(**{key: value[step] for key, value in transitions.items()})
+                    for record in records:
+                        self.logger.store(**record)
+                    if raw_obs is not None:
+                        # the learner owns the statistics the actors normalize with
+                        for obs in raw_obs.to(self.cfgs.device):
+                            self.env.obs_normalizer.push(obs)
+                        if steps < self.cfgs.update_after:
+                            # there is no update to sync the statistics with yet
+                            collector.sync(self.actor_critic, self.env.obs_normalizer)
+                    roll_out_steps = steps % self.proc_steps_per_epoch
+                    if (roll_out_steps + self.cfgs.update_every) >= self.proc_steps_per_epoch:
+                        self.end_epoch(steps)
+                    steps += self.cfgs.update_every
+                num_batches = min(self.cfgs.update_every, max_updates - num_updates)
+                if num_batches > 0:
+                    for batch in self.prefetcher.batches(num_batches):
+                        self.update(data=batch)
+                    if num_updates // sync_every != (num_updates + num_batches) // sync_every:
+                        collector.sync(self.actor_critic, self.env.obs_normalizer)
+                    num_updates += num_batches
+        finally:
+            collector.close()
+
+        # close opened files to avoid number of open files overflow
+        self.logger.close()
+        return self.actor_critic
+
+    def end_epoch(self, steps: int) -> None:
+        """End the epoch of the roll out at ``steps``: anneal, test, log and save.
+
+        Args:
+            steps (int): The step the last roll out of the epoch started at.
+        """
+        epoch = steps // self.proc_steps_per_epoch + 1
+        if self.cfgs.cost_limit_decay:
+            self.cost_limit_decay(epoch, self.cfgs.end_epoch)
+        if self.cfgs.exploration_noise_anneal:
+            self.actor_critic.anneal_exploration(frac=epoch / self.cfgs.epochs)
+
+        # save model to disk
+        if (epoch + 1) % self.cfgs.save_freq == 0:
+            self.logger.torch_save()
+        if epoch % self.cfgs.check_freq == 0:
+            self.check_distributed_parameters()
+        # log info about epoch
+        self.test_agent()
+        self.log(epoch, steps)
+        if isinstance(self.buf, MemmapVectorOffPolicyBuffer):
+            self.buf.flush()
+        if self.cfgs.checkpoint_training_state and (epoch + 1) % self.cfgs.save_freq == 0:
+            self.save_training_state(steps + self.cfgs.update_every)
+
     def update(self, data: dict) -> None:
         r"""Update actor, critic, running statistics, following next steps:
 
@@ -435,7 +662,8 @@ class DDPG:
                     -   ``terminated`` stored in buffer.
 
         -  Update value net by :meth:`update_value_net`.
-        -  Update cost net by :meth:`update_cost_net`.
+        -  Update cost net by :meth:`update_cost_net`,
+           or both of them by :meth:`update_critics` with ``fused_update``.
         -  Update policy net by :meth:`update_policy_net`.
 
         The basic process of each update is as follows:
@@ -450,6 +678,10 @@ class DDPG:
         if self.cfgs.use_cost:
             loss_c_before = self.loss_record.get_mean('loss_c')
         self.loss_record.reset('loss_pi', 'loss_q', 'loss_c')
+        # with prioritized experience replay, the critic losses are importance weighted
+        if 'indices' in data:
+            self._importance_weights = data['weights']
+            self._td_errors = {}
         # first run one gradient descent step for Q.
         obs, act, rew, cost, next_obs, done = (
             data['obs'],
@@ -459,38 +691,47 @@ class DDPG:
             data['next_obs'],
             data['done'],
         )
-        self.update_value_net(
-            obs=obs,
-            act=act,
-            rew=rew,
-            next_obs=next_obs,
-            done=done,
-        )
-        if self.cfgs.use_cost:
-            self.update_cost_net(
+        if self.cfgs.use_cost and self.cfgs.fused_update:
+            self.update_critics(
                 obs=obs,
                 act=act,
+                rew=rew,
                 cost=cost,
                 next_obs=next_obs,
+                done=done,
             )
-            for param in self.actor_critic.cost_critic.parameters():
-                param.requires_grad = False
-
-        # freeze Q-network so you don't waste computational effort
-        # computing gradients for it during the policy learning step.
-        for param in self.actor_critic.critic.parameters():
-            param.requires_grad = False
-
-        # next run one gradient descent step for actor.
-        self.update_policy_net(obs=obs)
-
-        # unfreeze Q-network so you can optimize it at next DDPG step.
-        for param in self.actor_critic.critic.parameters():
-            param.requires_grad = True
+        else:
+            self.update_value_net(
+                obs=obs,
+                act=act,
+                rew=rew,
+                next_obs=next_obs,
+                done=done,
+            )
+            if self.cfgs.use_cost:
+                self.update_cost_net(
+                    obs=obs,
+                    act=act,
+                    cost=cost,
+                    next_obs=next_obs,
+                )
+
+        if self._td_errors is not None:
+            # the priority is the TD error of the reward critics plus that of the cost critics
+            priorities = sum(
+                torch.stack(td_errors).mean(dim=0) for td_errors in self._td_errors.values()
+            )
+            self.buf.update_priorities(data['indices'], priorities)
+            self._importance_weights = self._td_errors = None
 
-        if self.cfgs.use_cost:
-            for param in self.actor_critic.cost_critic.parameters():
-                param.requires_grad = True
+        if self.cfgs.fused_update:
+            # the actor step of :meth:`update_policy_net` only differentiates the actor
+            self.update_policy_net(obs=obs)
+        else:
+            self._freeze_critics(True)
+            # next run one gradient descent step for actor.
+            self.update_policy_net(obs=obs)
+            self._freeze_critics(False)
 
         # finally, update target networks by polyak averaging.
         self.polyak_update_target()
@@ -525,12 +766,19 @@ class DDPG:
             and :math:`\theta` are the parameters of the Q-network.
             This is called a `polyak averaging <https://en.wikipedia.org/wiki/>`_
         """
-        with torch.no_grad():
-            for param, param_targ in zip(self.actor_critic.parameters(), self.ac_targ.parameters()):
-                # notes: We use an in-place operations "mul_", "add_" to update target
-                # params, as opposed to "mul" and "add", which would make new tensors.
-                param_targ.data.mul_(self.cfgs.polyak)
-                param_targ.data.add_((1 - self.cfgs.polyak) * param.data)
+        self.target_averager.update()
+
+    def _freeze_critics(self, freeze: bool) -> None:
+        """Freeze or unfreeze the critics, so that an actor step computes no gradients for them.
+
+        Args:
+            freeze (bool): Whether to freeze the critics.
+        """
+        for param in self.actor_critic.critic.parameters():
+            param.requires_grad = not freeze
+        if self.cfgs.use_cost:
+            for param in self.actor_critic.cost_critic.parameters():
+                param.requires_grad = not freeze
 
     def update_policy_net(self, obs: torch.Tensor) -> None:
         """Update policy network.
@@ -547,7 +795,9 @@ class DDPG:
         loss_pi, _ = self.compute_loss_pi(obs)
         # log the loss of policy net.
         self.loss_record.append(loss_pi=loss_pi.mean().item())
-        loss_pi.backward()
+        loss_pi.backward(inputs=self._actor_params)
+        # average the gradient of policy net over the processes.
+        distributed_utils.mpi_avg_grads(self.actor_critic.actor)
         # clip the gradient of policy net.
         if self.cfgs.use_max_grad_norm:
             torch.nn.utils.clip_grad_norm_(
@@ -593,6 +843,7 @@ class DDPG:
         # log the loss of value net.
         self.loss_record.append(loss_q=loss_q.mean().item())
         loss_q.backward()
+        distributed_utils.mpi_avg_grads(self.actor_critic.critic)
         if self.cfgs.use_max_grad_norm:
             torch.nn.utils.clip_grad_norm_(
                 self.actor_critic.critic.parameters(), self.cfgs.max_grad_norm
@@ -635,6 +886,7 @@ class DDPG:
         # log the loss of value net.
         self.loss_record.append(loss_c=loss_qc.mean().item())
         loss_qc.backward()
+        distributed_utils.mpi_avg_grads(self.actor_critic.cost_critic)
         # clip the gradient.
         if self.cfgs.use_max_grad_norm:
             torch.nn.utils.clip_grad_norm_(
@@ -642,6 +894,89 @@ class DDPG:
             )
         self.cost_critic_optimizer.step()
 
+    # pylint: disable-next=too-many-arguments
+    def update_critics(
+        self,
+        obs: torch.Tensor,
+        act: torch.Tensor,
+        rew: torch.Tensor,
+        cost: torch.Tensor,
+        next_obs: torch.Tensor,
+        done: torch.Tensor,
+    ) -> None:
+        """Update value network and cost network with one fused step.
+
+        With ``fused_update``, the losses of both critics are back-propagated together,
+        and their shared optimizer updates them with a single step. As Adam is element-wise,
+        this is the same update as the separate steps of :meth:`update_value_net` and
+        :meth:`update_cost_net`.
+
+        Args:
+            obs (:class:`torch.Tensor`): ``observation`` saved in data.
+            act (:class:`torch.Tensor`): ``action`` saved in data.
+            rew (:class:`torch.Tensor`): ``reward`` saved in data.
+            cost (:class:`torch.Tensor`): ``cost`` saved in data.
+            next_obs (:class:`torch.Tensor`): ``next observation`` saved in data.
+            done (:class:`torch.Tensor`): ``terminated`` saved in data.
+        """
+        self.critic_optimizer.zero_grad()
+        loss_q, _ = self.compute_loss_v(
+            obs=obs,
+            act=act,
+            rew=rew,
+            next_obs=next_obs,
+            done=done,
+        )
+        loss_qc, _ = self.compute_loss_c(
+            obs=obs,
+            act=act,
+            cost=cost,
+            next_obs=next_obs,
+        )
+        # add the norm of critic network parameters to the loss function.
+        if self.cfgs.use_critic_norm:
+            for param in self.actor_critic.critic.parameters():
+                loss_q += param.pow(2).sum() * self.cfgs.critic_norm_coeff
+            for param in self.actor_critic.cost_critic.parameters():
+                loss_qc += param.pow(2).sum() * self.cfgs.critic_norm_coeff
+        # log the loss of value net and cost net.
+        self.loss_record.append(loss_q=loss_q.mean().item(), loss_c=loss_qc.mean().item())
+        (loss_q + loss_qc).backward()
+        distributed_utils.mpi_avg_grads(self.actor_critic.critic)
+        distributed_utils.mpi_avg_grads(self.actor_critic.cost_critic)
+        # clip the gradient of each critic.
+        if self.cfgs.use_max_grad_norm:
+            torch.nn.utils.clip_grad_norm_(
+                self.actor_critic.critic.parameters(), self.cfgs.max_grad_norm
+            )
+            torch.nn.utils.clip_grad_norm_(
+                self.actor_critic.cost_critic.parameters(), self.cfgs.max_grad_norm
+            )
+        self.critic_optimizer.step()
+
+    def save_training_state(self, steps: int) -> None:
+        """Save the full training state and the replay buffer, to resume training from.
+
+        Args:
+            steps (int): The step to resume from.
+        """
+        training_state.save_training_state(
+            self, self.logger.log_dir, progress={'steps': steps}, buffer=self.buf
+        )
+
+    def load_training_state(self, log_dir: str) -> None:
+        """Load the training state saved by :meth:`save_training_state` of an interrupted run.
+
+        .. note::
+            The episodes in progress when the state was saved are restarted.
+
+        Args:
+            log_dir (str): The log directory of the interrupted run.
+        """
+        progress = training_state.load_training_state(self, log_dir, buffer=self.buf)
+        self.resume_step = progress['steps']
+        self.logger.log(f'Resume training from step {self.resume_step}.')
+
     def log(self, epoch: int, total_steps: int) -> None:
         """Log info about epoch.
 
@@ -22,6 +22,7 @@ import torch.nn.functional as F
 from omnisafe.algorithms import registry
 from omnisafe.algorithms.off_policy.ddpg import DDPG
 from omnisafe.common.lagrange import Lagrange
+from omnisafe.utils import distributed_utils
 
 
 @registry.register
@@ -90,7 +91,8 @@ class DDPGLag(DDPG, Lagrange):
         loss_pi = self.actor_critic.critic(obs, action)[0]
         loss_pi_c = self.actor_critic.cost_critic(obs, action)[0]
         loss_pi_c = F.relu(loss_pi_c - self.cost_limit)
-        self.update_lagrange_multiplier(loss_pi_c.mean().item())
+        # the cost is averaged over the processes, so that the multiplier stays in sync
+        self.update_lagrange_multiplier(float(distributed_utils.mpi_avg(loss_pi_c.mean().item())))
         penalty = self.lambda_range_projection(self.lagrangian_multiplier).item()
         loss_pi -= penalty * loss_pi_c
         loss_pi /= 1 + penalty
@@ -21,6 +21,7 @@ import torch
 
 from omnisafe.algorithms import registry
 from omnisafe.algorithms.off_policy.ddpg import DDPG
+from omnisafe.utils import distributed_utils
 
 
 @registry.register
@@ -91,13 +92,13 @@ class SAC(DDPG):
             _, act_targ, logp_a_next = self.ac_targ.actor.predict(
                 next_obs, deterministic=False, need_log_prob=True
             )
-            q_targ = torch.min(torch.vstack(self.ac_targ.critic(next_obs, act_targ)), dim=0).values
+            q_targ = self.ac_targ.critic(next_obs, act_targ).min(dim=0).values
             backup = rew + self.cfgs.gamma * (1 - done) * (q_targ - self.alpha * logp_a_next)
         # MSE loss against Bellman backup
         loss_q = []
         q_values = []
         for q_value in q_value_list:
-            loss_q.append(torch.mean((q_value - backup) ** 2))
+            loss_q.append(self.compute_critic_loss(q_value, backup))
             q_values.append(torch.mean(q_value))
             self.logger.store(
                 **{
@@ -123,12 +124,7 @@ class SAC(DDPG):
         )
         self.alpha_update(logp_a)
 
-        loss_pi = (
-            torch.min(
-                self.actor_critic.critic(obs, action)[0], self.actor_critic.critic(obs, action)[1]
-            )
-            - self.alpha * logp_a
-        )
+        loss_pi = self.actor_critic.critic(obs, action).min(dim=0).values - self.alpha * logp_a
         alpha_value = self.alpha.detach().mean().item() if self.cfgs.auto_alpha else self.alpha
         self.logger.store(
             **{
@@ -155,6 +151,7 @@ class SAC(DDPG):
             alpha_loss = -(self.log_alpha * log_prob).mean()
             self.alpha_optim.zero_grad()
             alpha_loss.backward()
+            distributed_utils.mpi_avg_torch_tensor(self.log_alpha.grad)
             self.alpha_optim.step()
             self.alpha = self.log_alpha.detach().exp()
         else:
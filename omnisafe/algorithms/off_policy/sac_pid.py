@@ -22,6 +22,7 @@ import torch.nn.functional as F
 from omnisafe.algorithms import registry
 from omnisafe.algorithms.off_policy.sac import SAC
 from omnisafe.common.pid_lagrange import PIDLagrangian
+from omnisafe.utils import distributed_utils
 
 
 @registry.register
@@ -108,15 +109,11 @@ class SACPid(SAC, PIDLagrangian):  # pylint: disable-next=too-many-instance-attr
             obs, deterministic=False, need_log_prob=True
         )
         self.alpha_update(logp_a)
-        loss_pi = (
-            torch.min(
-                self.actor_critic.critic(obs, action)[0], self.actor_critic.critic(obs, action)[1]
-            )
-            - self.alpha * logp_a
-        )
+        loss_pi = self.actor_critic.critic(obs, action).min(dim=0).values - self.alpha * logp_a
         loss_pi_c = self.actor_critic.cost_critic(obs, action)[0]
         loss_pi_c = F.relu(loss_pi_c - self.cost_limit)
-        self.pid_update(loss_pi_c.mean().item())
+        # the cost is averaged over the processes, so that the multiplier stays in sync
+        self.pid_update(float(distributed_utils.mpi_avg(loss_pi_c.mean().item())))
         loss_pi -= self.cost_penalty * loss_pi_c
         loss_pi /= 1 + self.cost_penalty
         pi_info = {}
@@ -170,7 +167,7 @@ class SACPid(SAC, PIDLagrangian):  # pylint: disable-next=too-many-instance-attr
             qc_targ = self.ac_targ.cost_critic(next_obs, act_targ)[0]
             backup = cost + self.cfgs.gamma * (qc_targ - self.alpha * logp_a_next)
         # MSE loss against Bellman backup
-        loss_qc = ((cost_q_value - backup) ** 2).mean()
+        loss_qc = self.compute_critic_loss(cost_q_value, backup, critic='cost')
         # useful info for logging
         qc_info = {'QCosts': cost_q_value.detach().numpy()}
 
@@ -20,7 +20,7 @@ import torch
 
 from omnisafe.algorithms import registry
 from omnisafe.algorithms.off_policy.ddpg import DDPG
-from omnisafe.utils import distributed_utils
+from omnisafe.common.fisher_vector_product import FisherVectorProduct
 from omnisafe.utils.tools import (
     conjugate_gradients,
     get_flat_gradients_from,
@@ -53,6 +53,12 @@ class SDDPG(DDPG):
             cfgs=cfgs,
         )
         self.fvp_obs = None
+        self.fvp = FisherVectorProduct(
+            actor=self.actor_critic.actor,
+            damping=self.cfgs.cg_damping,
+            analytic=self.cfgs.analytic_fisher,
+            module=self.actor_critic.actor.net,
+        )
 
     def Fvp(self, params: torch.Tensor) -> torch.Tensor:
         """Build the `Hessian-vector product <https://en.wikipedia.org/wiki/Hessian_matrix>`_
@@ -62,26 +68,13 @@ class SDDPG(DDPG):
         which is the second-order derivative of the KL-divergence.
         For details see John Schulman's PhD thesis (pp. 40) http://joschu.net/docs/thesis.pdf
 
+        The gradient of the KL-divergence is built once per policy update by
+        :meth:`FisherVectorProduct.build` and reused by every call.
+
         Args:
             params (torch.Tensor): The parameters of the actor network.
         """
-        self.actor_critic.actor.net.zero_grad()
-        q_dist = self.actor_critic.actor.get_distribution(self.fvp_obs)
-        with torch.no_grad():
-            p_dist = self.actor_critic.actor.get_distribution(self.fvp_obs)
-        kl = torch.distributions.kl.kl_divergence(p_dist, q_dist).mean()
-
-        grads = torch.autograd.grad(kl, self.actor_critic.actor.net.parameters(), create_graph=True)
-        flat_grad_kl = torch.cat([grad.view(-1) for grad in grads])
-
-        kl_p = (flat_grad_kl * params).sum()
-        grads = torch.autograd.grad(
-            kl_p, self.actor_critic.actor.net.parameters(), retain_graph=False
-        )
-        # contiguous indicating, if the memory is contiguously stored or not
-        flat_grad_grad_kl = torch.cat([grad.contiguous().view(-1) for grad in grads])
-        distributed_utils.mpi_avg_torch_tensor(flat_grad_grad_kl)
-        return flat_grad_grad_kl + params * self.cfgs.cg_damping
+        return self.fvp(params)
 
     def compute_loss_cost_performance(
         self, obs: torch.Tensor
@@ -129,6 +122,7 @@ class SDDPG(DDPG):
         """
         # Train policy with one steps of gradient descent
         self.fvp_obs = obs[::1]
+        self.fvp.build(self.fvp_obs)
         theta_old = get_flat_params_from(self.actor_critic.actor.net)
 
         self.actor_optimizer.zero_grad()
@@ -165,3 +159,4 @@ class SDDPG(DDPG):
         )
         new_theta = theta_old + final_step_dir
         set_param_values_to_model(self.actor_critic.actor.net, new_theta)
+        self.fvp.release()
@@ -77,13 +77,13 @@ class TD3(DDPG):
             _, act_targ = self.ac_targ.actor.predict(
                 next_obs, deterministic=False, need_log_prob=False
             )
-            q_targ = torch.min(torch.vstack(self.ac_targ.critic(next_obs, act_targ)), dim=0).values
+            q_targ = self.ac_targ.critic(next_obs, act_targ).min(dim=0).values
             backup = rew + self.cfgs.gamma * (1 - done) * q_targ
         # MSE loss against Bellman backup
         loss_q = []
         q_values = []
         for q_value in q_value_list:
-            loss_q.append(torch.mean((q_value - backup) ** 2))
+            loss_q.append(self.compute_critic_loss(q_value, backup))
             q_values.append(torch.mean(q_value))
             self.logger.store(
                 **{
@@ -109,8 +109,6 @@ class TD3(DDPG):
             obs (:class:`torch.Tensor`): ``observation`` saved in data.
         """
         _, action = self.actor_critic.actor.predict(obs, deterministic=False)
-        loss_pi = torch.min(
-            self.actor_critic.critic(obs, action)[0], self.actor_critic.critic(obs, action)[1]
-        )
+        loss_pi = self.actor_critic.critic(obs, action).min(dim=0).values
         pi_info = {}
         return -loss_pi.mean(), pi_info
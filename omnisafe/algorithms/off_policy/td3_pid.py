@@ -22,6 +22,7 @@ import torch.nn.functional as F
 from omnisafe.algorithms import registry
 from omnisafe.algorithms.off_policy.td3 import TD3
 from omnisafe.common.pid_lagrange import PIDLagrangian
+from omnisafe.utils import distributed_utils
 
 
 @registry.register
@@ -98,12 +99,11 @@ class TD3Pid(TD3, PIDLagrangian):
             obs (:class:`torch.Tensor`): ``observation`` saved in data.
         """
         _, action = self.actor_critic.actor.predict(obs, deterministic=False, need_log_prob=False)
-        loss_pi = torch.min(
-            self.actor_critic.critic(obs, action)[0], self.actor_critic.critic(obs, action)[1]
-        )
+        loss_pi = self.actor_critic.critic(obs, action).min(dim=0).values
         loss_pi_c = self.actor_critic.cost_critic(obs, action)[0]
         loss_pi_c = F.relu(loss_pi_c - self.cost_limit)
-        self.pid_update(loss_pi_c.mean().item())
+        # the cost is averaged over the processes, so that the multiplier stays in sync
+        self.pid_update(float(distributed_utils.mpi_avg(loss_pi_c.mean().item())))
         loss_pi -= self.cost_penalty * loss_pi_c
         loss_pi /= 1 + self.cost_penalty
         pi_info = {}
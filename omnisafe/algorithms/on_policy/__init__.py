@@ -14,6 +14,7 @@
 # ==============================================================================
 """On-policy algorithms."""
 
+from omnisafe.algorithms import registry
 from omnisafe.algorithms.on_policy import (
     base,
     early_terminated,
@@ -25,20 +26,6 @@ from omnisafe.algorithms.on_policy import (
     second_order,
     simmer,
 )
-from omnisafe.algorithms.on_policy.base import PPO, TRPO, NaturalPG, PolicyGradient
-from omnisafe.algorithms.on_policy.early_terminated import PPOEarlyTerminated, PPOLagEarlyTerminated
-from omnisafe.algorithms.on_policy.first_order import CUP, FOCOPS
-from omnisafe.algorithms.on_policy.naive_lagrange import PDO, RCPO, OnCRPO, PPOLag, TRPOLag
-from omnisafe.algorithms.on_policy.penalty_function import IPO, P3O
-from omnisafe.algorithms.on_policy.pid_lagrange import CPPOPid, TRPOPid
-from omnisafe.algorithms.on_policy.saute import PPOLagSaute, PPOSaute
-from omnisafe.algorithms.on_policy.second_order import CPO, PCPO
-from omnisafe.algorithms.on_policy.simmer import (
-    PPOLagSimmerPid,
-    PPOLagSimmerQ,
-    PPOSimmerPid,
-    PPOSimmerQ,
-)
 
 
 __all__ = [
@@ -52,3 +39,22 @@ __all__ = [
     *second_order.__all__,
     *simmer.__all__,
 ]
+
+__getattr__ = registry.lazy_import(
+    __name__,
+    {
+        name: subpackage.__name__
+        for subpackage in (
+            base,
+            early_terminated,
+            first_order,
+            naive_lagrange,
+            penalty_function,
+            pid_lagrange,
+            saute,
+            second_order,
+            simmer,
+        )
+        for name in subpackage.__all__
+    },
+)
@@ -14,10 +14,16 @@
 # ==============================================================================
 """Basic Reinforcement Learning algorithms."""
 
-from omnisafe.algorithms.on_policy.base.natural_pg import NaturalPG
-from omnisafe.algorithms.on_policy.base.policy_gradient import PolicyGradient
-from omnisafe.algorithms.on_policy.base.ppo import PPO
-from omnisafe.algorithms.on_policy.base.trpo import TRPO
+from typing import TYPE_CHECKING
+
+from omnisafe.algorithms import registry
+
+
+if TYPE_CHECKING:
+    from omnisafe.algorithms.on_policy.base.natural_pg import NaturalPG
+    from omnisafe.algorithms.on_policy.base.policy_gradient import PolicyGradient
+    from omnisafe.algorithms.on_policy.base.ppo import PPO
+    from omnisafe.algorithms.on_policy.base.trpo import TRPO
 
 
 __all__ = [
@@ -26,3 +32,13 @@ __all__ = [
     'PPO',
     'TRPO',
 ]
+
+__getattr__ = registry.lazy_import(
+    __name__,
+    {
+        'NaturalPG': '.natural_pg',
+        'PolicyGradient': '.policy_gradient',
+        'PPO': '.ppo',
+        'TRPO': '.trpo',
+    },
+)
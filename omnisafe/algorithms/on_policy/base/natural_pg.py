@@ -20,6 +20,7 @@ import torch
 
 from omnisafe.algorithms import registry
 from omnisafe.algorithms.on_policy.base.policy_gradient import PolicyGradient
+from omnisafe.common.fisher_vector_product import FisherVectorProduct
 from omnisafe.utils import distributed_utils
 from omnisafe.utils.tools import (
     conjugate_gradients,
@@ -55,6 +56,11 @@ class NaturalPG(PolicyGradient):
         self.cg_iters = cfgs.cg_iters
         self.target_kl = cfgs.target_kl
         self.fvp_obs = cfgs.fvp_obs
+        self.fvp = FisherVectorProduct(
+            actor=self.actor_critic.actor,
+            damping=self.cg_damping,
+            analytic=cfgs.analytic_fisher,
+        )
 
     def _specific_init_logs(self):
         super()._specific_init_logs()
@@ -105,24 +111,13 @@ class NaturalPG(PolicyGradient):
         which is the second-order derivative of the KL-divergence.
         For details see John Schulman's PhD thesis (pp. 40) http://joschu.net/docs/thesis.pdf
 
+        The gradient of the KL-divergence is built once per policy update by
+        :meth:`FisherVectorProduct.build` and reused by every call.
+
         Args:
             params (torch.Tensor): The parameters of the actor network.
         """
-        self.actor_critic.actor.zero_grad()
-        q_dist = self.actor_critic.actor(self.fvp_obs)
-        with torch.no_grad():
-            p_dist = self.actor_critic.actor(self.fvp_obs)
-        kl = torch.distributions.kl.kl_divergence(p_dist, q_dist).mean()
-
-        grads = torch.autograd.grad(kl, self.actor_critic.actor.parameters(), create_graph=True)
-        flat_grad_kl = torch.cat([grad.view(-1) for grad in grads])
-
-        kl_p = (flat_grad_kl * params).sum()
-        grads = torch.autograd.grad(kl_p, self.actor_critic.actor.parameters(), retain_graph=False)
-        # contiguous indicating, if the memory is contiguously stored or not
-        flat_grad_grad_kl = torch.cat([grad.contiguous().view(-1) for grad in grads])
-        distributed_utils.mpi_avg_torch_tensor(flat_grad_grad_kl)
-        return flat_grad_grad_kl + params * self.cg_damping
+        return self.fvp(params)
 
     # pylint: disable-next=too-many-locals,too-many-arguments
     def update_policy_net(
@@ -151,6 +146,7 @@ class NaturalPG(PolicyGradient):
         """
         # get loss and info values before update
         self.fvp_obs = obs[::4]
+        self.fvp.build(self.fvp_obs)
         theta_old = get_flat_params_from(self.actor_critic.actor)
         self.actor_critic.actor.zero_grad()
         processed_adv = self.compute_surrogate(adv=adv, cost_adv=cost_adv)
@@ -186,6 +182,7 @@ class NaturalPG(PolicyGradient):
         # update actor network parameters
         new_theta = theta_old + final_step_dir
         set_param_values_to_model(self.actor_critic.actor, new_theta)
+        self.fvp.release()
 
         with torch.no_grad():
             loss_pi, pi_info = self.compute_loss_pi(obs=obs, act=act, log_p=log_p, adv=adv)
@@ -26,9 +26,9 @@ from omnisafe.common.buffer import VectorOnPolicyBuffer
 from omnisafe.common.logger import Logger
 from omnisafe.common.record_queue import RecordQueue
 from omnisafe.models.constraint_actor_critic import ConstraintActorCritic
-from omnisafe.utils import core, distributed_utils
+from omnisafe.utils import core, distributed_utils, training_state
 from omnisafe.utils.config import Config
-from omnisafe.utils.tools import get_flat_params_from
+from omnisafe.utils.tools import get_flat_params_from, iterate_minibatches
 from omnisafe.wrappers import wrapper_registry
 
 
@@ -96,6 +96,10 @@ class PolicyGradient:
             seed=cfgs.seed,
             use_tensorboard=cfgs.use_tensorboard,
             use_wandb=cfgs.use_wandb,
+            async_logging=cfgs.async_logging,
+            async_checkpoint=cfgs.async_checkpoint,
+            keep_checkpoint_last=cfgs.keep_checkpoint_last,
+            keep_checkpoint_every=cfgs.keep_checkpoint_every,
             config=cfgs,
             models=[self.actor_critic],
         )
@@ -142,6 +146,8 @@ class PolicyGradient:
         self.penalty_param = None
         self.critic_loss_fn = nn.MSELoss()
         self.loss_record = RecordQueue('loss_pi', 'loss_v', 'loss_c', maxlen=100)
+        # the epoch to start from, set by :meth:`load_training_state`
+        self.start_epoch = 0
 
         self._init_log()
 
@@ -237,6 +243,12 @@ class PolicyGradient:
             # sync parameters across cores: only once necessary, grads are averaged!
             distributed_utils.sync_params(self.actor_critic)
             self.logger.log(f'Done! (took {time.time()-start:0.3f} sec.)')
+            if self.cfgs.overlap_grad_allreduce:
+                # start averaging gradients during backward
+                distributed_utils.overlap_grad_allreduce(self.actor_critic.actor)
+                distributed_utils.overlap_grad_allreduce(self.actor_critic.reward_critic)
+                if self.cfgs.use_cost:
+                    distributed_utils.overlap_grad_allreduce(self.actor_critic.cost_critic)
 
     def algorithm_specific_logs(self) -> None:
         """Use this method to collect log information.
@@ -329,7 +341,7 @@ class PolicyGradient:
         - :meth:`log`: epoch/update information for visualization and terminal log print.
         """
         # main loop: collect experience in env and update/log each epoch
-        for epoch in range(self.cfgs.epochs):
+        for epoch in range(self.start_epoch, self.cfgs.epochs):
             self.epoch_time = time.time()
             # update internals of AC
             if self.cfgs.exploration_noise_anneal:
@@ -354,11 +366,35 @@ class PolicyGradient:
             # save model to disk
             if (epoch + 1) % self.cfgs.save_freq == 0:
                 self.logger.torch_save()
+                if self.cfgs.checkpoint_training_state:
+                    self.save_training_state(epoch + 1)
 
         # close opened files to avoid number of open files overflow
         self.logger.close()
+        self.env.close()
         return self.actor_critic
 
+    def save_training_state(self, epoch: int) -> None:
+        """Save the full training state into the log directory, to resume training from.
+
+        Args:
+            epoch (int): The epoch to resume from.
+        """
+        training_state.save_training_state(self, self.logger.log_dir, progress={'epoch': epoch})
+
+    def load_training_state(self, log_dir: str) -> None:
+        """Load the training state saved by :meth:`save_training_state` of an interrupted run.
+
+        .. note::
+            The episodes in progress when the state was saved are restarted.
+
+        Args:
+            log_dir (str): The log directory of the interrupted run.
+        """
+        progress = training_state.load_training_state(self, log_dir)
+        self.start_epoch = progress['epoch']
+        self.logger.log(f'Resume training from epoch {self.start_epoch}.')
+
     def log(self, epoch: int) -> None:
         """Log info about epoch.
 
@@ -529,16 +565,19 @@ class PolicyGradient:
         # compute the old distribution of policy net.
         old_dist = self.actor_critic.actor(obs)
 
-        # load the data into the data loader.
-        dataset = torch.utils.data.TensorDataset(obs, act, target_v, target_c, log_p, adv, cost_adv)
-        loader = torch.utils.data.DataLoader(
-            dataset, batch_size=self.cfgs.num_mini_batches, shuffle=True
-        )
-
         # update the value net, cost net and policy net for several times.
         for i in range(self.cfgs.actor_iters):
-            for _, (obs_b, act_b, target_v_b, target_c_b, log_p_b, adv_b, cost_adv_b) in enumerate(
-                loader
+            for obs_b, act_b, target_v_b, target_c_b, log_p_b, adv_b, cost_adv_b in (
+                iterate_minibatches(
+                    obs,
+                    act,
+                    target_v,
+                    target_c,
+                    log_p,
+                    adv,
+                    cost_adv,
+                    batch_size=self.cfgs.num_mini_batches,
+                )
             ):
                 # update the value net.
                 self.update_value_net(obs_b, target_v_b)
@@ -628,13 +667,13 @@ class PolicyGradient:
         self.actor_optimizer.zero_grad()
         # backward the loss of policy net.
         loss_pi.backward()
+        # average the gradient of policy net.
+        distributed_utils.mpi_avg_grads(self.actor_critic.actor)
         # clip the gradient of policy net.
         if self.cfgs.use_max_grad_norm:
             torch.nn.utils.clip_grad_norm_(
                 self.actor_critic.actor.parameters(), self.cfgs.max_grad_norm
             )
-        # average the gradient of policy net.
-        distributed_utils.mpi_avg_grads(self.actor_critic.actor)
         self.actor_optimizer.step()
         self.logger.store(
             **{
@@ -685,12 +724,13 @@ class PolicyGradient:
         self.loss_record.append(loss_v=loss_v.mean().item())
         # backward
         loss_v.backward()
+        # average the gradient across processes.
+        distributed_utils.mpi_avg_grads(self.actor_critic.reward_critic)
         # clip the gradient
         if self.cfgs.use_max_grad_norm:
             torch.nn.utils.clip_grad_norm_(
                 self.actor_critic.reward_critic.parameters(), self.cfgs.max_grad_norm
             )
-        distributed_utils.mpi_avg_grads(self.actor_critic.reward_critic)
         self.reward_critic_optimizer.step()
 
     def update_cost_net(self, obs: torch.Tensor, target_c: torch.Tensor) -> None:
@@ -731,10 +771,11 @@ class PolicyGradient:
         self.loss_record.append(loss_c=loss_c.mean().item())
         # backward.
         loss_c.backward()
+        # average the gradient across processes.
+        distributed_utils.mpi_avg_grads(self.actor_critic.cost_critic)
         # clip the gradient.
         if self.cfgs.use_max_grad_norm:
             torch.nn.utils.clip_grad_norm_(
                 self.actor_critic.cost_critic.parameters(), self.cfgs.max_grad_norm
             )
-        distributed_utils.mpi_avg_grads(self.actor_critic.cost_critic)
         self.cost_critic_optimizer.step()
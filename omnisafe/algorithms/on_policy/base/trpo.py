@@ -14,7 +14,7 @@
 # ==============================================================================
 """Implementation of the TRPO algorithm."""
 
-from typing import NamedTuple, Tuple
+from typing import NamedTuple, Optional, Tuple
 
 import torch
 
@@ -47,6 +47,79 @@ class TRPO(NaturalPG):
             cfgs (NamedTuple): The configuration of the algorithm.
         """
         super().__init__(env_id=env_id, cfgs=cfgs)
+        self.batched_line_search = cfgs.batched_line_search
+
+    # pylint: disable-next=unused-argument
+    def compute_candidate_loss_pi(
+        self,
+        dist: torch.distributions.Distribution,
+        ratio: torch.Tensor,
+        adv: torch.Tensor,
+    ) -> torch.Tensor:
+        """Compute the loss of one line-search candidate from its distribution and ratio.
+
+        It is traced by ``torch.func.vmap`` in :meth:`evaluate_step_candidates`,
+        so it must match :meth:`compute_loss_pi` without calling ``.item()``.
+
+        Args:
+            dist (torch.distributions.Distribution): The candidate policy distribution.
+            ratio (torch.Tensor): The candidate importance sampling ratio.
+            adv (torch.Tensor): The advantage.
+        """
+        return -(ratio * adv).mean()
+
+    # pylint: disable-next=too-many-arguments
+    def evaluate_step_candidates(
+        self,
+        thetas: torch.Tensor,
+        p_dist: torch.distributions.Distribution,
+        obs: torch.Tensor,
+        act: torch.Tensor,
+        log_p: torch.Tensor,
+        adv: torch.Tensor,
+        cost_adv: Optional[torch.Tensor] = None,
+    ) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+        """Evaluate stacked candidate parameters of the actor in one batched forward pass.
+
+        Each row of ``thetas`` is a flat parameter vector, in the layout of
+        :func:`get_flat_params_from`. The actor is called with
+        ``torch.func.functional_call`` and vectorized over the rows with ``torch.func.vmap``,
+        instead of writing every candidate into the model and running it one by one.
+
+        Args:
+            thetas (torch.Tensor): The candidate parameters, shape (K, num_params).
+            p_dist (torch.distributions.Distribution): The old policy distribution.
+            obs (torch.Tensor): The observation.
+            act (torch.Tensor): The action.
+            log_p (torch.Tensor): The log probability of the action.
+            adv (torch.Tensor): The advantage.
+            cost_adv (torch.Tensor, optional): The cost advantage. If given,
+                the cost loss of :meth:`CPO.compute_loss_cost_performance` is evaluated too.
+
+        Returns:
+            The policy loss, the cost loss (zeros without ``cost_adv``) and the KL-divergence
+            of every candidate, each of shape (K,).
+        """
+        actor = self.actor_critic.actor
+        params = [(name, param) for name, param in actor.named_parameters() if param.requires_grad]
+
+        def evaluate(theta: torch.Tensor) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+            candidate, offset = {}, 0
+            for name, param in params:
+                candidate[name] = theta[offset : offset + param.numel()].view_as(param)
+                offset += param.numel()
+            dist, _log_p = torch.func.functional_call(actor, candidate, (obs, act))
+            ratio = torch.exp(_log_p - log_p)
+            loss_pi = self.compute_candidate_loss_pi(dist=dist, ratio=ratio, adv=adv)
+            if cost_adv is None:
+                loss_cost = torch.zeros_like(loss_pi)
+            else:
+                loss_cost = (ratio * cost_adv).mean()
+            kl = torch.distributions.kl.kl_divergence(p_dist, dist).mean()
+            return loss_pi, loss_cost, kl
+
+        with torch.no_grad():
+            return torch.func.vmap(evaluate)(thetas)
 
     # pylint: disable-next=too-many-arguments,too-many-locals,arguments-differ
     def search_step_size(
@@ -70,6 +143,9 @@ class TRPO(NaturalPG):
             The search is done by line-search, which is a way to find a step size that satisfies the constraint.
             The constraint is the KL-divergence between the old policy and the new policy.
 
+        If ``batched_line_search`` is enabled, all ``total_steps`` candidates are evaluated
+        at once by :meth:`evaluate_step_candidates` and the first satisfied one is accepted.
+
         Args:
             step_dir (torch.Tensor): The step direction.
             g_flat (torch.Tensor): The gradient of the policy.
@@ -90,26 +166,43 @@ class TRPO(NaturalPG):
         # Change expected objective function gradient = expected_imrpove best this moment
         expected_improve = g_flat.dot(step_dir)
 
+        if self.batched_line_search:
+            step_fracs = torch.tensor([decay**j for j in range(total_steps)]).to(step_dir)
+            loss_pis, _, kls = self.evaluate_step_candidates(
+                thetas=_theta_old + step_fracs.unsqueeze(-1) * step_dir,
+                p_dist=p_dist,
+                obs=obs,
+                act=act,
+                log_p=log_p,
+                adv=adv,
+            )
+            # average processes once for all candidates
+            kls = distributed_utils.mpi_avg(kls).tolist()
+            loss_improves = distributed_utils.mpi_avg(loss_pi_before - loss_pis).tolist()
+
         # While not within_trust_region and not out of total_steps:
         for j in range(total_steps):
-            # update theta params
-            new_theta = _theta_old + step_frac * step_dir
-            # set new params as params of net
-            set_param_values_to_model(self.actor_critic.actor, new_theta)
             # the stepNo this update accept
             acceptance_step = j + 1
+            if self.batched_line_search:
+                loss_pi, torch_kl, loss_improve = loss_pis[j], kls[j], loss_improves[j]
+            else:
+                # update theta params
+                new_theta = _theta_old + step_frac * step_dir
+                # set new params as params of net
+                set_param_values_to_model(self.actor_critic.actor, new_theta)
 
-            with torch.no_grad():
-                loss_pi, _ = self.compute_loss_pi(obs=obs, act=act, log_p=log_p, adv=adv)
-                # compute KL distance between new and old policy
-                q_dist = self.actor_critic.actor(obs)
-                # KL-distance of old p-dist and new q-dist, applied in KLEarlyStopping
-                torch_kl = torch.distributions.kl.kl_divergence(p_dist, q_dist).mean().item()
-            # real loss improve: old policy loss - new policy loss
-            loss_improve = loss_pi_before - loss_pi.item()
-            # average processes.... multi-processing style like: mpi_tools.mpi_avg(xxx)
-            torch_kl = distributed_utils.mpi_avg(torch_kl)
-            loss_improve = distributed_utils.mpi_avg(loss_improve)
+                with torch.no_grad():
+                    loss_pi, _ = self.compute_loss_pi(obs=obs, act=act, log_p=log_p, adv=adv)
+                    # compute KL distance between new and old policy
+                    q_dist = self.actor_critic.actor(obs)
+                    # KL-distance of old p-dist and new q-dist, applied in KLEarlyStopping
+                    torch_kl = torch.distributions.kl.kl_divergence(p_dist, q_dist).mean().item()
+                # real loss improve: old policy loss - new policy loss
+                loss_improve = loss_pi_before - loss_pi.item()
+                # average processes.... multi-processing style like: mpi_tools.mpi_avg(xxx)
+                torch_kl = distributed_utils.mpi_avg(torch_kl)
+                loss_improve = distributed_utils.mpi_avg(loss_improve)
             menu = (expected_improve, loss_improve)
             self.logger.log(f'Expected Improvement: {menu[0]} Actual: {menu[1]}')
             if not torch.isfinite(loss_pi):
@@ -161,6 +254,7 @@ class TRPO(NaturalPG):
         """
         # get loss and info values before update
         self.fvp_obs = obs[::4]
+        self.fvp.build(self.fvp_obs)
         theta_old = get_flat_params_from(self.actor_critic.actor)
         self.actor_critic.actor.zero_grad()
         # process the advantage function.
@@ -204,6 +298,7 @@ class TRPO(NaturalPG):
         # update actor network parameters
         new_theta = theta_old + final_step_dir
         set_param_values_to_model(self.actor_critic.actor, new_theta)
+        self.fvp.release()
 
         with torch.no_grad():
             q_dist = self.actor_critic.actor(obs)
@@ -14,13 +14,29 @@
 # ==============================================================================
 """Early terminated algorithms."""
 
-from omnisafe.algorithms.on_policy.early_terminated.ppo_early_terminated import PPOEarlyTerminated
-from omnisafe.algorithms.on_policy.early_terminated.ppo_lag_early_terminated import (
-    PPOLagEarlyTerminated,
-)
+from typing import TYPE_CHECKING
+
+from omnisafe.algorithms import registry
+
+
+if TYPE_CHECKING:
+    from omnisafe.algorithms.on_policy.early_terminated.ppo_early_terminated import (
+        PPOEarlyTerminated,
+    )
+    from omnisafe.algorithms.on_policy.early_terminated.ppo_lag_early_terminated import (
+        PPOLagEarlyTerminated,
+    )
 
 
 __all__ = [
     'PPOEarlyTerminated',
     'PPOLagEarlyTerminated',
 ]
+
+__getattr__ = registry.lazy_import(
+    __name__,
+    {
+        'PPOEarlyTerminated': '.ppo_early_terminated',
+        'PPOLagEarlyTerminated': '.ppo_lag_early_terminated',
+    },
+)
@@ -14,11 +14,25 @@
 # ==============================================================================
 """First-order algorithms."""
 
-from omnisafe.algorithms.on_policy.first_order.cup import CUP
-from omnisafe.algorithms.on_policy.first_order.focops import FOCOPS
+from typing import TYPE_CHECKING
+
+from omnisafe.algorithms import registry
+
+
+if TYPE_CHECKING:
+    from omnisafe.algorithms.on_policy.first_order.cup import CUP
+    from omnisafe.algorithms.on_policy.first_order.focops import FOCOPS
 
 
 __all__ = [
     'CUP',
     'FOCOPS',
 ]
+
+__getattr__ = registry.lazy_import(
+    __name__,
+    {
+        'CUP': '.cup',
+        'FOCOPS': '.focops',
+    },
+)
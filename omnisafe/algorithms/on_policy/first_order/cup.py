@@ -23,6 +23,7 @@ from omnisafe.algorithms.on_policy.base.ppo import PPO
 from omnisafe.common.lagrange import Lagrange
 from omnisafe.common.record_queue import RecordQueue
 from omnisafe.utils import distributed_utils
+from omnisafe.utils.tools import iterate_minibatches
 
 
 @registry.register
@@ -184,15 +185,11 @@ class CUP(PPO, Lagrange):
         with torch.no_grad():
             old_dist = self.actor_critic.actor(obs)
             old_mean, old_std = old_dist.mean, old_dist.stddev
-        # load the data into the data loader.
-        dataset = torch.utils.data.TensorDataset(obs, act, log_p, cost_adv, old_mean, old_std)
-        loader = torch.utils.data.DataLoader(
-            dataset, batch_size=self.cfgs.num_mini_batches, shuffle=True
-        )
-
         # update the policy net several times
         for i in range(self.cfgs.actor_iters):
-            for _, (obs_b, act_b, log_p_b, cost_adv_b, old_mean_b, old_std_b) in enumerate(loader):
+            for obs_b, act_b, log_p_b, cost_adv_b, old_mean_b, old_std_b in iterate_minibatches(
+                obs, act, log_p, cost_adv, old_mean, old_std, batch_size=self.cfgs.num_mini_batches
+            ):
                 # compute the old distribution of policy net.
                 self.p_dist = torch.distributions.Normal(old_mean_b, old_std_b)
                 # compute the loss of cost performance.
@@ -203,13 +200,13 @@ class CUP(PPO, Lagrange):
                 self.actor_optimizer.zero_grad()
                 # backward
                 loss_pi_c.backward()
+                # average the gradient of policy net.
+                distributed_utils.mpi_avg_grads(self.actor_critic.actor)
                 # clip the gradient of policy net.
                 if self.cfgs.use_max_grad_norm:
                     torch.nn.utils.clip_grad_norm_(
                         self.actor_critic.actor.parameters(), self.cfgs.max_grad_norm
                     )
-                # average the gradient of policy net.
-                distributed_utils.mpi_avg_grads(self.actor_critic.actor)
                 self.actor_optimizer.step()
             # compute the new distribution of policy net.
             new_dist = self.actor_critic.actor(obs)
@@ -21,6 +21,7 @@ import torch
 from omnisafe.algorithms import registry
 from omnisafe.algorithms.on_policy.base.policy_gradient import PolicyGradient
 from omnisafe.common.lagrange import Lagrange
+from omnisafe.utils.tools import iterate_minibatches
 
 
 @registry.register
@@ -170,17 +171,9 @@ class FOCOPS(PolicyGradient, Lagrange):
             old_dist = self.actor_critic.actor(obs)
             old_mean, old_std = old_dist.mean, old_dist.stddev
 
-        # load the data into the data loader.
-        dataset = torch.utils.data.TensorDataset(
-            obs, act, target_v, target_c, log_p, adv, cost_adv, old_mean, old_std
-        )
-        loader = torch.utils.data.DataLoader(
-            dataset, batch_size=self.cfgs.num_mini_batches, shuffle=True
-        )
-
         # update the value net, cost net and policy net for several times.
         for i in range(self.cfgs.actor_iters):
-            for _, (
+            for (
                 obs_b,
                 act_b,
                 target_v_b,
@@ -190,7 +183,18 @@ class FOCOPS(PolicyGradient, Lagrange):
                 cost_adv_b,
                 old_mean_b,
                 old_std_b,
-            ) in enumerate(loader):
+            ) in iterate_minibatches(
+                obs,
+                act,
+                target_v,
+                target_c,
+                log_p,
+                adv,
+                cost_adv,
+                old_mean,
+                old_std,
+                batch_size=self.cfgs.num_mini_batches,
+            ):
                 # update the value net.
                 self.update_value_net(obs_b, target_v_b)
                 # update the cost net, if use cost.
@@ -14,11 +14,17 @@
 # ==============================================================================
 """Naive Lagrange algorithms."""
 
-from omnisafe.algorithms.on_policy.naive_lagrange.crpo import OnCRPO
-from omnisafe.algorithms.on_policy.naive_lagrange.pdo import PDO
-from omnisafe.algorithms.on_policy.naive_lagrange.ppo_lag import PPOLag
-from omnisafe.algorithms.on_policy.naive_lagrange.rcpo import RCPO
-from omnisafe.algorithms.on_policy.naive_lagrange.trpo_lag import TRPOLag
+from typing import TYPE_CHECKING
+
+from omnisafe.algorithms import registry
+
+
+if TYPE_CHECKING:
+    from omnisafe.algorithms.on_policy.naive_lagrange.crpo import OnCRPO
+    from omnisafe.algorithms.on_policy.naive_lagrange.pdo import PDO
+    from omnisafe.algorithms.on_policy.naive_lagrange.ppo_lag import PPOLag
+    from omnisafe.algorithms.on_policy.naive_lagrange.rcpo import RCPO
+    from omnisafe.algorithms.on_policy.naive_lagrange.trpo_lag import TRPOLag
 
 
 __all__ = [
@@ -28,3 +34,14 @@ __all__ = [
     'PPOLag',
     'TRPOLag',
 ]
+
+__getattr__ = registry.lazy_import(
+    __name__,
+    {
+        'OnCRPO': '.crpo',
+        'PDO': '.pdo',
+        'PPOLag': '.ppo_lag',
+        'RCPO': '.rcpo',
+        'TRPOLag': '.trpo_lag',
+    },
+)
@@ -32,6 +32,9 @@ class OnCRPO(PPO):
         - URL: `CRPO <https://arxiv.org/pdf/2011.05869.pdf>`_.
     """
 
+    #: The update counters restored when resuming training.
+    state_attributes = ('rew_update', 'cost_update')
+
     def __init__(self, env_id: str, cfgs: NamedTuple) -> None:
         """Initialize CRPO.
 
@@ -14,11 +14,25 @@
 # ==============================================================================
 """Naive Lagrange algorithms."""
 
-from omnisafe.algorithms.on_policy.penalty_function.ipo import IPO
-from omnisafe.algorithms.on_policy.penalty_function.p3o import P3O
+from typing import TYPE_CHECKING
+
+from omnisafe.algorithms import registry
+
+
+if TYPE_CHECKING:
+    from omnisafe.algorithms.on_policy.penalty_function.ipo import IPO
+    from omnisafe.algorithms.on_policy.penalty_function.p3o import P3O
 
 
 __all__ = [
     'P3O',
     'IPO',
 ]
+
+__getattr__ = registry.lazy_import(
+    __name__,
+    {
+        'IPO': '.ipo',
+        'P3O': '.p3o',
+    },
+)
@@ -114,13 +114,13 @@ class P3O(PPO):
         self.actor_optimizer.zero_grad()
         # backward the loss of policy net.
         (loss_pi + loss_pi_c).backward()
+        # average the gradient of policy net.
+        distributed_utils.mpi_avg_grads(self.actor_critic.actor)
         # clip the gradient of policy net.
         if self.cfgs.use_max_grad_norm:
             torch.nn.utils.clip_grad_norm_(
                 self.actor_critic.actor.parameters(), self.cfgs.max_grad_norm
             )
-        # average the gradient of policy net.
-        distributed_utils.mpi_avg_grads(self.actor_critic.actor)
         self.actor_optimizer.step()
         self.logger.store(
             **{
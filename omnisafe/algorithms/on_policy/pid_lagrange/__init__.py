@@ -14,11 +14,25 @@
 # ==============================================================================
 """PID Lagrange algorithms."""
 
-from omnisafe.algorithms.on_policy.pid_lagrange.cppo_pid import CPPOPid
-from omnisafe.algorithms.on_policy.pid_lagrange.trpo_pid import TRPOPid
+from typing import TYPE_CHECKING
+
+from omnisafe.algorithms import registry
+
+
+if TYPE_CHECKING:
+    from omnisafe.algorithms.on_policy.pid_lagrange.cppo_pid import CPPOPid
+    from omnisafe.algorithms.on_policy.pid_lagrange.trpo_pid import TRPOPid
 
 
 __all__ = [
     'CPPOPid',
     'TRPOPid',
 ]
+
+__getattr__ = registry.lazy_import(
+    __name__,
+    {
+        'CPPOPid': '.cppo_pid',
+        'TRPOPid': '.trpo_pid',
+    },
+)
@@ -123,6 +123,21 @@ class TRPOPid(TRPO, PIDLagrangian):
 
         return loss_pi, pi_info
 
+    def compute_candidate_loss_pi(
+        self,
+        dist: torch.distributions.Distribution,
+        ratio: torch.Tensor,
+        adv: torch.Tensor,
+    ) -> torch.Tensor:
+        """Compute the loss of one line-search candidate, with the entropy bonus of TRPOPid.
+
+        Args:
+            dist (torch.distributions.Distribution): The candidate policy distribution.
+            ratio (torch.Tensor): The candidate importance sampling ratio.
+            adv (torch.Tensor): The advantage.
+        """
+        return -(ratio * adv).mean() - self.cfgs.entropy_coef * dist.entropy().mean()
+
     def compute_surrogate(
         self,
         adv: torch.Tensor,
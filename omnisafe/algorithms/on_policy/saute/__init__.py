@@ -14,11 +14,25 @@
 # ==============================================================================
 """Saute algorithms."""
 
-from omnisafe.algorithms.on_policy.saute.ppo_lag_saute import PPOLagSaute
-from omnisafe.algorithms.on_policy.saute.ppo_saute import PPOSaute
+from typing import TYPE_CHECKING
+
+from omnisafe.algorithms import registry
+
+
+if TYPE_CHECKING:
+    from omnisafe.algorithms.on_policy.saute.ppo_lag_saute import PPOLagSaute
+    from omnisafe.algorithms.on_policy.saute.ppo_saute import PPOSaute
 
 
 __all__ = [
     'PPOLagSaute',
     'PPOSaute',
 ]
+
+__getattr__ = registry.lazy_import(
+    __name__,
+    {
+        'PPOLagSaute': '.ppo_lag_saute',
+        'PPOSaute': '.ppo_saute',
+    },
+)
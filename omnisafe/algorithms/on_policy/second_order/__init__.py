@@ -14,11 +14,25 @@
 # ==============================================================================
 """Second-order algorithms."""
 
-from omnisafe.algorithms.on_policy.second_order.cpo import CPO
-from omnisafe.algorithms.on_policy.second_order.pcpo import PCPO
+from typing import TYPE_CHECKING
+
+from omnisafe.algorithms import registry
+
+
+if TYPE_CHECKING:
+    from omnisafe.algorithms.on_policy.second_order.cpo import CPO
+    from omnisafe.algorithms.on_policy.second_order.pcpo import PCPO
 
 
 __all__ = [
     'CPO',
     'PCPO',
 ]
+
+__getattr__ = registry.lazy_import(
+    __name__,
+    {
+        'CPO': '.cpo',
+        'PCPO': '.pcpo',
+    },
+)
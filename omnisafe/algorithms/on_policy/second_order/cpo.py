@@ -116,35 +116,59 @@ class CPO(TRPO):
         # reward improvement, g-flat as gradient of reward
         expected_rew_improve = g_flat.dot(step_dir)
 
+        if self.batched_line_search:
+            step_fracs = torch.tensor([decay**j for j in range(total_steps)]).to(step_dir)
+            loss_pi_rews, loss_pi_costs, kls = self.evaluate_step_candidates(
+                thetas=_theta_old + step_fracs.unsqueeze(-1) * step_dir,
+                p_dist=p_dist,
+                obs=obs,
+                act=act,
+                log_p=log_p,
+                adv=adv,
+                cost_adv=cost_adv,
+            )
+            # average across MPI processes once for all candidates
+            kls = distributed_utils.mpi_avg(kls).tolist()
+            loss_rew_improves = distributed_utils.mpi_avg(loss_pi_before - loss_pi_rews).tolist()
+            cost_diffs = loss_pi_costs - self.loss_pi_cost_before
+            cost_diffs = distributed_utils.mpi_avg(cost_diffs).tolist()
+
         # while not within_trust_region and not finish all steps:
         for j in range(total_steps):
-            # get new theta
-            new_theta = _theta_old + step_frac * step_dir
-            # set new theta as new actor parameters
-            set_param_values_to_model(self.actor_critic.actor, new_theta)
             # the last acceptance steps to next step
             acceptance_step = j + 1
-
-            with torch.no_grad():
-                # loss of policy reward from target/expected reward
-                loss_pi_rew, _ = self.compute_loss_pi(obs=obs, act=act, log_p=log_p, adv=adv)
-                # loss of cost of policy cost from real/expected reward
-                loss_pi_cost, _ = self.compute_loss_cost_performance(
-                    obs=obs, act=act, log_p=log_p, cost_adv=cost_adv
-                )
-                self.loss_record.append(loss_pi=(loss_pi_rew.mean() + loss_pi_cost.mean()).item())
-                # compute KL distance between new and old policy
-                q_dist = self.actor_critic.actor(obs)
-                torch_kl = torch.distributions.kl.kl_divergence(p_dist, q_dist).mean().item()
-            # compute improvement of reward
-            loss_rew_improve = loss_pi_before - loss_pi_rew.item()
-            cost_diff = loss_pi_cost.item() - self.loss_pi_cost_before
-
-            # average across MPI processes...
-            torch_kl = distributed_utils.mpi_avg(torch_kl)
-            # pi_average of torch_kl above
-            loss_rew_improve = distributed_utils.mpi_avg(loss_rew_improve)
-            cost_diff = distributed_utils.mpi_avg(cost_diff)
+            if self.batched_line_search:
+                loss_pi_rew, loss_pi_cost = loss_pi_rews[j], loss_pi_costs[j]
+                self.loss_record.append(loss_pi=(loss_pi_rew + loss_pi_cost).item())
+                torch_kl, loss_rew_improve, cost_diff = kls[j], loss_rew_improves[j], cost_diffs[j]
+            else:
+                # get new theta
+                new_theta = _theta_old + step_frac * step_dir
+                # set new theta as new actor parameters
+                set_param_values_to_model(self.actor_critic.actor, new_theta)
+
+                with torch.no_grad():
+                    # loss of policy reward from target/expected reward
+                    loss_pi_rew, _ = self.compute_loss_pi(obs=obs, act=act, log_p=log_p, adv=adv)
+                    # loss of cost of policy cost from real/expected reward
+                    loss_pi_cost, _ = self.compute_loss_cost_performance(
+                        obs=obs, act=act, log_p=log_p, cost_adv=cost_adv
+                    )
+                    self.loss_record.append(
+                        loss_pi=(loss_pi_rew.mean() + loss_pi_cost.mean()).item()
+                    )
+                    # compute KL distance between new and old policy
+                    q_dist = self.actor_critic.actor(obs)
+                    torch_kl = torch.distributions.kl.kl_divergence(p_dist, q_dist).mean().item()
+                # compute improvement of reward
+                loss_rew_improve = loss_pi_before - loss_pi_rew.item()
+                cost_diff = loss_pi_cost.item() - self.loss_pi_cost_before
+
+                # average across MPI processes...
+                torch_kl = distributed_utils.mpi_avg(torch_kl)
+                # pi_average of torch_kl above
+                loss_rew_improve = distributed_utils.mpi_avg(loss_rew_improve)
+                cost_diff = distributed_utils.mpi_avg(cost_diff)
             menu = (expected_rew_improve, loss_rew_improve)
             self.logger.log(f'Expected Improvement: {menu[0]} Actual: {menu[1]}')
             # check whether there are nan.
@@ -261,6 +285,7 @@ class CPO(TRPO):
         """
         # get loss and info values before update
         self.fvp_obs = obs[::4]
+        self.fvp.build(self.fvp_obs)
         theta_old = get_flat_params_from(self.actor_critic.actor)
         self.actor_optimizer.zero_grad()
         # process the advantage function.
@@ -416,6 +441,7 @@ class CPO(TRPO):
         # update actor network parameters
         new_theta = theta_old + final_step_dir
         set_param_values_to_model(self.actor_critic.actor, new_theta)
+        self.fvp.release()
         self.logger.store(
             **{
                 'Train/Entropy': pi_info['ent'],
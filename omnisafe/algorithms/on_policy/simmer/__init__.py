@@ -14,10 +14,16 @@
 # ==============================================================================
 """Simmer algorithms."""
 
-from omnisafe.algorithms.on_policy.simmer.ppo_lag_simmer_pid import PPOLagSimmerPid
-from omnisafe.algorithms.on_policy.simmer.ppo_lag_simmer_q import PPOLagSimmerQ
-from omnisafe.algorithms.on_policy.simmer.ppo_simmer_pid import PPOSimmerPid
-from omnisafe.algorithms.on_policy.simmer.ppo_simmer_q import PPOSimmerQ
+from typing import TYPE_CHECKING
+
+from omnisafe.algorithms import registry
+
+
+if TYPE_CHECKING:
+    from omnisafe.algorithms.on_policy.simmer.ppo_lag_simmer_pid import PPOLagSimmerPid
+    from omnisafe.algorithms.on_policy.simmer.ppo_lag_simmer_q import PPOLagSimmerQ
+    from omnisafe.algorithms.on_policy.simmer.ppo_simmer_pid import PPOSimmerPid
+    from omnisafe.algorithms.on_policy.simmer.ppo_simmer_q import PPOSimmerQ
 
 
 __all__ = [
@@ -26,3 +32,13 @@ __all__ = [
     'PPOSimmerPid',
     'PPOSimmerQ',
 ]
+
+__getattr__ = registry.lazy_import(
+    __name__,
+    {
+        'PPOLagSimmerPid': '.ppo_lag_simmer_pid',
+        'PPOLagSimmerQ': '.ppo_lag_simmer_q',
+        'PPOSimmerPid': '.ppo_simmer_pid',
+        'PPOSimmerQ': '.ppo_simmer_q',
+    },
+)
@@ -14,7 +14,10 @@
 # ==============================================================================
 """Registry for algorithms."""
 
+import importlib
+import importlib.util
 import inspect
+import sys
 
 
 class Registry:
@@ -27,6 +30,7 @@ class Registry:
     def __init__(self, name):
         self._name = name
         self._module_dict = {}
+        self._lazy_dict = {}
 
     def __repr__(self):
         return (
@@ -44,9 +48,23 @@ class Registry:
         return self._module_dict
 
     def get(self, key):
-        """Get the class that has been registered under the given key."""
+        """Get the class that has been registered under the given key.
+
+        If the class has only been registered lazily, its module is imported first.
+        """
+        if key not in self._module_dict and key in self._lazy_dict:
+            getattr(importlib.import_module(self._lazy_dict[key]), key)
         return self._module_dict.get(key, None)
 
+    def register_lazy(self, key, module):
+        """Register the module that defines the class ``key``, without importing it.
+
+        Args:
+            key (str): The class name.
+            module (str): The absolute name of the module which defines (or exports) the class.
+        """
+        self._lazy_dict.setdefault(key, module)
+
     def _register_module(self, module_class):
         """Register a module.
         Args:
@@ -70,3 +88,31 @@ REGISTRY = Registry('OmniSafe')
 
 register = REGISTRY.register
 get = REGISTRY.get
+
+
+def lazy_import(package, modules):
+    """Register the classes of ``package`` lazily, and build its module ``__getattr__``.
+
+    The algorithm modules import ``torch`` models, wrappers and their dependencies,
+    so they are only imported when one of their classes is first accessed.
+
+    Args:
+        package (str): The name of the package, i.e. ``__name__``.
+        modules (dict): A dict mapping class names to the names of the modules, relative to
+            ``package``, which define (or export) them.
+
+    Returns:
+        The ``__getattr__`` function of the package.
+    """
+    modules = {key: importlib.util.resolve_name(name, package) for key, name in modules.items()}
+    for key, module in modules.items():
+        REGISTRY.register_lazy(key, module)
+
+    def __getattr__(name):
+        if name not in modules:
+            raise AttributeError(f'module {package!r} has no attribute {name!r}')
+        value = getattr(importlib.import_module(modules[name]), name)
+        setattr(sys.modules[package], name, value)
+        return value
+
+    return __getattr__
@@ -14,7 +14,10 @@
 # ==============================================================================
 """Common Common utilities for OmniSafe."""
 
+from omnisafe.common.async_collector import AsyncCollector
+from omnisafe.common.fisher_vector_product import FisherVectorProduct
 from omnisafe.common.lagrange import Lagrange
 from omnisafe.common.logger import Logger
 from omnisafe.common.normalizer import Normalizer
 from omnisafe.common.pid_lagrange import PIDLagrangian
+from omnisafe.common.polyak_averager import PolyakAverager
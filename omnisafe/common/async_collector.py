@@ -0,0 +1,275 @@
+# Copyright 2022-2023 OmniSafe Team. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Implementation of AsyncCollector."""
+
+import queue
+import traceback
+from copy import deepcopy
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, Union
+
+import numpy as np
+import torch
+import torch.multiprocessing as mp
+from torch import nn
+
+from omnisafe.common.normalizer import Normalizer
+
+
+class _ChunkBuffer:
+    """Keep the transitions stored by the roll out of an actor process, in place of a buffer."""
+
+    def __init__(self) -> None:
+        self.transitions: List[Dict[str, torch.Tensor]] = []
+
+    def store(self, **data: torch.Tensor) -> None:
+        """Keep a transition of the roll out."""
+        self.transitions.append({key: value.cpu() for key, value in data.items()})
+
+
+class _ChunkLogger:
+    """Keep the statistics stored by the roll out of an actor process, in place of a logger."""
+
+    def __init__(self) -> None:
+        self.records: List[Dict[str, float]] = []
+
+    def store(self, **kwargs: Union[int, float, np.ndarray, torch.Tensor]) -> None:
+        """Keep the statistics of a step, as the means :meth:`Logger.store` would store."""
+        self.records.append(
+            {
+                key: float(val.detach().mean() if isinstance(val, torch.Tensor) else np.mean(val))
+                for key, val in kwargs.items()
+            }
+        )
+
+
+class _ChunkNormalizer:
+    """Normalize the observations of an actor process with the statistics of the learner.
+
+    The statistics are not updated by the actor, the raw observations are kept instead,
+    for the learner to update its statistics with.
+    """
+
+    def __init__(self, normalizer: Normalizer) -> None:
+        self.normalizer = normalizer
+        self.raw_obs: List[torch.Tensor] = []
+
+    def normalize(self, raw_data: torch.Tensor) -> torch.Tensor:
+        """Normalize the observations, and keep the raw ones."""
+        self.raw_obs.append(raw_data.cpu())
+        return self.normalizer.normalize(raw_data, update=False)
+
+
+# pylint: disable-next=too-many-arguments,too-many-locals
+def _collect(
+    worker_id: int,
+    env_id: str,
+    cfgs: NamedTuple,
+    snapshot: nn.Module,
+    normalizer_snapshot: Optional[Normalizer],
+    version: Any,
+    lock: Any,
+    chunks: Any,
+    stop: Any,
+    start_step: int,
+) -> None:
+    """Roll out the policy snapshot in an actor process, and send the transitions in chunks."""
+    # pylint: disable-next=import-outside-toplevel
+    from omnisafe.wrappers import wrapper_registry
+
+    try:
+        env_cfgs = deepcopy(cfgs.env_cfgs)
+        env_cfgs.recurisve_update({'seed': int(env_cfgs.seed) + 1000 * (worker_id + 1)})
+        env_cfgs.recurisve_update({'device': 'cpu'})
+        env = wrapper_registry.get(cfgs.wrapper_type)(env_id, cfgs=env_cfgs)
+        env.set_rollout_cfgs(determinstic=False, use_cost=cfgs.use_cost)
+        agent = deepcopy(snapshot)
+        if normalizer_snapshot is not None:
+            env.obs_normalizer = _ChunkNormalizer(deepcopy(normalizer_snapshot))
+        agent_version = -1
+        # each actor explores with random actions for its share of the start steps
+        random_steps = cfgs.start_steps // cfgs.async_cfgs.num_actors
+        steps = start_step // cfgs.async_cfgs.num_actors
+        while not stop.is_set():
+            if version.value != agent_version:
+                with lock:
+                    agent.load_state_dict(snapshot.state_dict())
+                    if normalizer_snapshot is not None:
+                        env.obs_normalizer.normalizer.load_state_dict(
+                            normalizer_snapshot.state_dict()
+                        )
+                    agent_version = version.value
+            buf, logger = _ChunkBuffer(), _ChunkLogger()
+            env.off_policy_roll_out(
+                agent,
+                buf,
+                logger,
+                deterministic=False,
+                use_rand_action=steps < random_steps,
+                ep_steps=cfgs.update_every,
+            )
+            steps += cfgs.update_every
+            # the chunks are sent as arrays, which do not depend on the actor once received
+            transitions = {
+                key: torch.stack([transition[key] for transition in buf.transitions]).numpy()
+                for key in buf.transitions[0]
+            }
+            raw_obs = None
+            if normalizer_snapshot is not None:
+                raw_obs = torch.stack(env.obs_normalizer.raw_obs).numpy()
+                env.obs_normalizer.raw_obs.clear()
+            message = ('chunk', transitions, logger.records, raw_obs)
+            while not stop.is_set():
+                try:
+                    chunks.put(message, timeout=0.1)
+                    break
+                except queue.Full:
+                    continue
+        env.close()
+    except Exception:  # pylint: disable=broad-except
+        chunks.put(('error', traceback.format_exc(), None, None))
+
+
+class AsyncCollector:
+    """Collect transitions in actor processes, concurrently with the updates of the learner.
+
+    Each of the ``num_actors`` processes steps its own environment with
+    :meth:`CMDPWrapper.off_policy_roll_out`, and sends the transitions and statistics
+    of every ``update_every`` steps to the learner through a queue of ``queue_size`` chunks.
+    As the actors wait while the queue is full, they can not run ahead of the learner
+    by more than ``queue_size`` chunks.
+
+    The actors roll out a snapshot of the policy in shared memory,
+    which is refreshed by :meth:`sync`.
+
+    .. note::
+        The running statistics of the observations are owned by the learner.
+        The actors normalize their observations with a snapshot of them, refreshed by
+        :meth:`sync` with the policy, and send the raw observations with their chunks,
+        for the learner to update the statistics with.
+    """
+
+    def __init__(
+        self,
+        env_id: str,
+        cfgs: NamedTuple,
+        actor_critic: nn.Module,
+        obs_normalizer: Optional[Normalizer] = None,
+        start_step: int = 0,
+    ) -> None:
+        """Initialize AsyncCollector.
+
+        Args:
+            env_id (str): Environment ID.
+            cfgs (NamedTuple): Configuration dictionary of the algorithm.
+            actor_critic (nn.Module): The actor-critic whose policy is rolled out.
+            obs_normalizer (Normalizer, optional): The observation normalizer of the learner.
+            start_step (int): The number of steps already collected, when training is resumed.
+        """
+        assert cfgs.async_cfgs.num_actors > 0, 'num_actors must be positive'
+        ctx = mp.get_context('spawn')
+        self._snapshot = deepcopy(actor_critic).cpu().share_memory()
+        self._normalizer_snapshot = (
+            deepcopy(obs_normalizer).cpu().share_memory() if obs_normalizer is not None else None
+        )
+        self._version = ctx.Value('i', 0, lock=False)
+        self._lock = ctx.Lock()
+        self._chunks = ctx.Queue(maxsize=cfgs.async_cfgs.queue_size)
+        self._stop = ctx.Event()
+        self._workers = [
+            ctx.Process(
+                target=_collect,
+                args=(
+                    worker_id,
+                    env_id,
+                    cfgs,
+                    self._snapshot,
+                    self._normalizer_snapshot,
+                    self._version,
+                    self._lock,
+                    self._chunks,
+                    self._stop,
+                    start_step,
+                ),
+                name=f'omnisafe-actor-{worker_id}',
+                daemon=True,
+            )
+            for worker_id in range(cfgs.async_cfgs.num_actors)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    @torch.no_grad()
+    def sync(self, actor_critic: nn.Module, obs_normalizer: Optional[Normalizer] = None) -> None:
+        """Copy the parameters of ``actor_critic`` into the policy snapshot of the actors.
+
+        Args:
+            actor_critic (nn.Module): The actor-critic being trained.
+            obs_normalizer (Normalizer, optional): The observation normalizer of the learner,
+                copied into the snapshot of the actors with the policy.
+        """
+        with self._lock:
+            for param, snapshot_param in zip(
+                actor_critic.state_dict().values(), self._snapshot.state_dict().values()
+            ):
+                snapshot_param.copy_(param)
+            if obs_normalizer is not None:
+                for param, snapshot_param in zip(
+                    obs_normalizer.state_dict().values(),
+                    self._normalizer_snapshot.state_dict().values(),
+                ):
+                    snapshot_param.copy_(param)
+            self._version.value += 1
+
+    def get(
+        self, block: bool = True
+    ) -> Optional[Tuple[Dict[str, torch.Tensor], List[Dict[str, float]], Optional[torch.Tensor]]]:
+        """Get the next chunk of transitions, statistics and raw observations of the actors.
+
+        The transitions and the raw observations of the chunk are stacked along a leading
+        step dimension, the raw observations are ``None`` without an observation normalizer.
+
+        Args:
+            block (bool): Whether to wait for a chunk, otherwise ``None`` is returned if
+                there is none.
+        """
+        while True:
+            try:
+                kind, *chunk = self._chunks.get(timeout=1.0) if block else self._chunks.get_nowait()
+                break
+            except queue.Empty:
+                if not block:
+                    return None
+                if not all(worker.is_alive() for worker in self._workers):
+                    # pylint: disable-next=raise-missing-from
+                    raise RuntimeError('An actor process exited unexpectedly.')
+        if kind == 'error':
+            raise RuntimeError(f'An actor process failed to collect:\n{chunk[0]}')
+        transitions, records, raw_obs = chunk
+        transitions = {key: torch.as_tensor(value) for key, value in transitions.items()}
+        if raw_obs is not None:
+            raw_obs = torch.as_tensor(raw_obs)
+        return transitions, records, raw_obs
+
+    def close(self) -> None:
+        """Stop the actor processes."""
+        self._stop.set()
+        for worker in self._workers:
+            # drain the queue, so that the actors are not blocked on sending their chunks
+            while worker.is_alive():
+                try:
+                    self._chunks.get_nowait()
+                except queue.Empty:
+                    worker.join(timeout=0.01)
+        self._chunks.close()
@@ -15,16 +15,37 @@
 """Implementation of Buffer."""
 
 from omnisafe.common.buffer.base import BaseBuffer
+from omnisafe.common.buffer.batch_prefetcher import BatchPrefetcher
+from omnisafe.common.buffer.deduplicated_offpolicy_buffer import DeduplicatedOffPolicyBuffer
+from omnisafe.common.buffer.deduplicated_vector_offpolicy_buffer import (
+    DeduplicatedVectorOffPolicyBuffer,
+)
+from omnisafe.common.buffer.memmap_offpolicy_buffer import MemmapOffPolicyBuffer
+from omnisafe.common.buffer.memmap_vector_offpolicy_buffer import MemmapVectorOffPolicyBuffer
 from omnisafe.common.buffer.offpolicy_buffer import OffPolicyBuffer
 from omnisafe.common.buffer.onpolicy_buffer import OnPolicyBuffer
+from omnisafe.common.buffer.prioritized_offpolicy_buffer import PrioritizedOffPolicyBuffer
+from omnisafe.common.buffer.prioritized_vector_offpolicy_buffer import (
+    PrioritizedVectorOffPolicyBuffer,
+)
+from omnisafe.common.buffer.segment_tree import MinSegmentTree, SumSegmentTree
 from omnisafe.common.buffer.vector_offpolicy_buffer import VectorOffPolicyBuffer
 from omnisafe.common.buffer.vector_onpolicy_buffer import VectorOnPolicyBuffer
 
 
 __all__ = [
     'BaseBuffer',
+    'BatchPrefetcher',
+    'DeduplicatedOffPolicyBuffer',
+    'DeduplicatedVectorOffPolicyBuffer',
+    'MemmapOffPolicyBuffer',
+    'MemmapVectorOffPolicyBuffer',
     'OffPolicyBuffer',
     'OnPolicyBuffer',
+    'PrioritizedOffPolicyBuffer',
+    'PrioritizedVectorOffPolicyBuffer',
+    'MinSegmentTree',
+    'SumSegmentTree',
     'VectorOffPolicyBuffer',
     'VectorOnPolicyBuffer',
 ]
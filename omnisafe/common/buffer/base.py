@@ -15,7 +15,7 @@
 """Abstract base class for buffer."""
 
 from abc import ABC, abstractmethod
-from typing import Dict
+from typing import Dict, Optional
 
 import torch
 from gymnasium.spaces import Box
@@ -24,7 +24,18 @@ from omnisafe.typing import OmnisafeSpace
 
 
 class BaseBuffer(ABC):
-    """Abstract base class for buffer."""
+    r"""Abstract base class for buffer.
+
+    The fields are ``float32`` by default. ``dtypes`` maps field names to a compact storage dtype,
+    e.g. ``float16`` or ``bfloat16`` for ``obs`` and ``act``, and ``bool`` or ``uint8`` for ``done``.
+    The fields are converted when stored, and upcast to ``float32`` when read back.
+    If ``obs`` has a dtype and ``next_obs`` does not, ``next_obs`` uses the same one.
+
+    ``int8`` observations are quantized with a running per-feature scale :math:`s`,
+    stored as :math:`\mathrm{round}(x / s)`. :math:`s` is a power of two, doubled as needed
+    so that every stored value fits in :math:`[-127, 127]`, and the stored values
+    are requantized in place when it grows.
+    """
 
     def __init__(
         self,
@@ -32,26 +43,28 @@ class BaseBuffer(ABC):
         act_space: OmnisafeSpace,
         size: int,
         device: torch.device = torch.device('cpu'),
+        dtypes: Optional[Dict[str, torch.dtype]] = None,
     ):
         """Initialize the buffer."""
+        self._size = size
+        self._device = device
+        self._init_dtypes(dtypes)
         if isinstance(obs_space, Box):
-            obs_buf = torch.zeros((size, *obs_space.shape), dtype=torch.float32, device=device)
+            obs_buf = self._allocate_field('obs', (size, *obs_space.shape), torch.float32)
         else:
             raise NotImplementedError
         if isinstance(act_space, Box):
-            act_buf = torch.zeros((size, *act_space.shape), dtype=torch.float32, device=device)
+            act_buf = self._allocate_field('act', (size, *act_space.shape), torch.float32)
         else:
             raise NotImplementedError
 
         self.data: Dict[str, torch.Tensor] = {
             'obs': obs_buf,
             'act': act_buf,
-            'reward': torch.zeros(size, dtype=torch.float32, device=device),
-            'cost': torch.zeros(size, dtype=torch.float32, device=device),
-            'done': torch.zeros(size, dtype=torch.float32, device=device),
+            'reward': self._allocate_field('reward', (size,), torch.float32),
+            'cost': self._allocate_field('cost', (size,), torch.float32),
+            'done': self._allocate_field('done', (size,), torch.float32),
         }
-        self._size = size
-        self._device = device
 
     @property
     def device(self) -> torch.device:
@@ -67,9 +80,61 @@ class BaseBuffer(ABC):
         """Return the length of the buffer."""
         return self._size
 
+    def _init_dtypes(self, dtypes: Optional[Dict[str, torch.dtype]]) -> None:
+        """Set the storage dtypes of the fields, and the scales of the quantized ones."""
+        self._dtypes: Dict[str, torch.dtype] = dict(dtypes or {})
+        if 'obs' in self._dtypes:
+            self._dtypes.setdefault('next_obs', self._dtypes['obs'])
+        self._scales: Dict[str, torch.Tensor] = {}
+
+    def _allocate_field(self, name: str, shape: tuple, dtype: torch.dtype) -> torch.Tensor:
+        """Allocate the field ``name``, with its storage dtype if it has one."""
+        dtype = self._dtypes.get(name, dtype)
+        if dtype == torch.int8:
+            assert name in ('obs', 'next_obs'), 'Only the observations can be quantized.'
+            self._scales[name] = torch.full(shape[-1:], 2.0**-16, device=self._device)
+        return self._allocate_storage(name, shape, dtype)
+
+    def _allocate_storage(self, name: str, shape: tuple, dtype: torch.dtype) -> torch.Tensor:
+        """Allocate the zero-initialized storage of the field ``name``.
+
+        Subclasses override this to change where the fields are stored.
+        """
+        del name
+        return torch.zeros(shape, dtype=dtype, device=self._device)
+
+    def _encode(self, name: str, value: torch.Tensor) -> torch.Tensor:
+        """Convert ``value`` to be stored in the field ``name``, growing its scale if needed."""
+        scale = self._scales.get(name)
+        if scale is None:
+            return value
+        value = torch.as_tensor(value, dtype=torch.float32, device=self._device)
+        needed = value.abs().reshape(-1, *scale.shape).amax(0) / 127.0
+        if bool((needed > scale).any()):
+            grown = torch.where(needed > scale, torch.exp2(torch.ceil(torch.log2(needed))), scale)
+            self._rescale_field(name, scale / grown)
+            self._scales[name] = scale = grown
+        return torch.round(value / scale).clamp_(-127, 127)
+
+    def _decode(self, name: str, value: torch.Tensor) -> torch.Tensor:
+        """Upcast ``value`` read from the field ``name`` to ``float32``."""
+        scale = self._scales.get(name)
+        if scale is not None:
+            return value.float() * scale.to(value.device)
+        if name in self._dtypes:
+            return value.float()
+        return value
+
+    def _rescale_field(self, name: str, ratio: torch.Tensor) -> None:
+        """Requantize the quantized field ``name`` in place, when its scale grows."""
+        field = self.data[name]
+        for start in range(0, field.shape[0], 4096):
+            chunk = field[start : start + 4096]
+            chunk.copy_(torch.round(chunk.float() * ratio))
+
     def add_field(self, name: str, shape: tuple, dtype: torch.dtype):
         """Add a field to the buffer."""
-        self.data[name] = torch.zeros((self._size, *shape), dtype=dtype, device=self._device)
+        self.data[name] = self._allocate_field(name, (self._size, *shape), dtype)
 
     @abstractmethod
     def store(self, **data: torch.Tensor):
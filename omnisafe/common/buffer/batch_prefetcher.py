@@ -0,0 +1,140 @@
+# Copyright 2022-2023 OmniSafe Team. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Implementation of BatchPrefetcher."""
+
+import queue
+import threading
+from typing import Dict, Iterator, List
+
+import torch
+
+from omnisafe.common.buffer.offpolicy_buffer import OffPolicyBuffer
+from omnisafe.common.buffer.prioritized_offpolicy_buffer import PrioritizedOffPolicyBuffer
+
+
+class BatchPrefetcher:
+    """Sample the batches of an update phase ahead of the gradient steps.
+
+    :meth:`batches` yields the ``num_batches`` batches of one update phase,
+    which are gathered with :meth:`OffPolicyBuffer.sample_batches` in groups of ``group_size``.
+
+    If the buffer is in host memory and ``device`` is a CUDA device, the groups are gathered
+    on a background thread, copied into pinned memory and sent to ``device`` with non-blocking
+    transfers on a side stream, while the previous groups are being trained on.
+    Otherwise, all the batches are gathered at once on the calling thread.
+
+    The batches of a :class:`PrioritizedOffPolicyBuffer` are sampled one at a time instead,
+    so that each one uses the priorities updated by the previous ones.
+
+    .. warning::
+        The buffer must not be stored into until all the batches of a phase have been consumed.
+    """
+
+    def __init__(
+        self,
+        buffer: OffPolicyBuffer,
+        device: torch.device = torch.device('cpu'),
+        group_size: int = 8,
+        max_prefetch: int = 2,
+    ) -> None:
+        """Initialize BatchPrefetcher.
+
+        Args:
+            buffer (OffPolicyBuffer): The buffer to sample from.
+            device (torch.device): The device of the yielded batches.
+            group_size (int): The number of batches gathered at once on the background thread.
+            max_prefetch (int): The maximum number of groups gathered ahead.
+        """
+        assert group_size > 0 and max_prefetch > 0, 'group_size and max_prefetch must be positive'
+        self._buffer = buffer
+        self._device = torch.device(device)
+        self._group_size = group_size
+        self._max_prefetch = max_prefetch
+        self._async = self._device.type == 'cuda' and buffer.device.type == 'cpu'
+
+    def batches(self, num_batches: int) -> Iterator[Dict[str, torch.Tensor]]:
+        """Yield the ``num_batches`` batches of one update phase.
+
+        Args:
+            num_batches (int): The number of batches.
+        """
+        if isinstance(self._buffer, PrioritizedOffPolicyBuffer):
+            return (self._to_device(self._buffer.sample_batch()) for _ in range(num_batches))
+        if not self._async:
+            return iter(
+                [self._to_device(batch) for batch in self._buffer.sample_batches(num_batches)]
+            )
+        return self._prefetch(num_batches)
+
+    def _to_device(self, batch: Dict[str, torch.Tensor]) -> Dict[str, torch.Tensor]:
+        return {key: value.to(self._device) for key, value in batch.items()}
+
+    def _prefetch(self, num_batches: int) -> Iterator[Dict[str, torch.Tensor]]:
+        """Yield the batches gathered and transferred on a background thread."""
+        groups: queue.Queue = queue.Queue(maxsize=self._max_prefetch)
+        stop = threading.Event()
+        error: List[BaseException] = []
+        stream = torch.cuda.Stream(self._device)
+
+        def run() -> None:
+            try:
+                remaining = num_batches
+                while remaining > 0 and not stop.is_set():
+                    size = min(self._group_size, remaining)
+                    group = self._buffer.sample_batches(size)
+                    with torch.cuda.stream(stream):
+                        group = [
+                            {
+                                key: (
+                                    value.pin_memory().to(self._device, non_blocking=True)
+                                    if value.is_cpu
+                                    else value
+                                )
+                                for key, value in batch.items()
+                            }
+                            for batch in group
+                        ]
+                        event = torch.cuda.Event()
+                        event.record(stream)
+                    groups.put((group, event))
+                    remaining -= size
+            except BaseException as exc:  # pylint: disable=broad-except
+                error.append(exc)
+            finally:
+                groups.put((None, None))
+
+        thread = threading.Thread(target=run, name='omnisafe-prefetcher', daemon=True)
+        thread.start()
+        try:
+            while True:
+                group, event = groups.get()
+                if group is None:
+                    break
+                current = torch.cuda.current_stream(self._device)
+                current.wait_event(event)
+                for batch in group:
+                    for value in batch.values():
+                        # the memory was allocated on the side stream
+                        value.record_stream(current)
+                    yield batch
+        finally:
+            stop.set()
+            while thread.is_alive():
+                try:
+                    groups.get_nowait()
+                except queue.Empty:
+                    thread.join(timeout=0.01)
+        if error:
+            raise RuntimeError('The omnisafe-prefetcher thread failed to sample.') from error[0]
@@ -0,0 +1,177 @@
+# Copyright 2022-2023 OmniSafe Team. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Implementation of DeduplicatedOffPolicyBuffer."""
+
+from typing import Dict, Mapping
+
+import numpy as np
+import torch
+
+from omnisafe.common.buffer.offpolicy_buffer import OffPolicyBuffer
+from omnisafe.typing import OmnisafeSpace
+
+
+class DeduplicatedOffPolicyBuffer(OffPolicyBuffer):
+    """A ReplayBuffer for off_policy Algorithms, which stores every observation only once.
+
+    The ``next_obs`` of a transition is almost always the ``obs`` of the next transition of
+    the same environment, so it is not stored. Instead, it is rebuilt at sampling time from
+    the ``obs`` of the next row. Only the ``next_obs`` which differ from the next ``obs``, e.g.
+    the last observation of an episode truncated without resetting, are kept in a small
+    boundary table, and the ``next_obs`` of the latest row is kept until the next row arrives.
+    This roughly doubles the number of transitions stored in the same memory.
+
+    Whether a ``next_obs`` is a boundary is decided by comparing it with the next ``obs``
+    exactly, so sampled transitions are always identical to the stored ones.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        obs_space: OmnisafeSpace,
+        act_space: OmnisafeSpace,
+        size: int,
+        batch_size: int,
+        boundary_capacity: int = 64,
+        device: torch.device = torch.device('cpu'),
+        **kwargs,
+    ):
+        """Initialize the buffer.
+
+        Args:
+            obs_space (OmnisafeSpace): The observation space.
+            act_space (OmnisafeSpace): The action space.
+            size (int): The number of rows of the buffer.
+            batch_size (int): The batch size.
+            boundary_capacity (int): The initial capacity of the boundary table,
+                which grows when it is full.
+            device (torch.device): The device of the buffer.
+            dtypes (dict, optional): The storage dtypes of the fields, see :class:`BaseBuffer`.
+        """
+        super().__init__(obs_space, act_space, size, batch_size, device=device, **kwargs)
+        del self.data['next_obs']
+        slots = self._slots_per_row
+        self._slot_shape = obs_space.shape
+        # the boundary entry of the next_obs of each transition, -1 for the next obs
+        self._next_ref = torch.full((size * slots,), -1, dtype=torch.int32, device=device)
+        self._pending_next_obs = torch.zeros(
+            (slots, *self._slot_shape), dtype=torch.float32, device=device
+        )
+        self._boundary_next_obs = torch.zeros(
+            (boundary_capacity, *self._slot_shape), dtype=torch.float32, device=device
+        )
+        self._boundary_owner = torch.full(
+            (boundary_capacity,), -1, dtype=torch.int64, device=device
+        )
+
+    def _allocate_field(self, name: str, shape: tuple, dtype: torch.dtype) -> torch.Tensor:
+        if name == 'next_obs':
+            return torch.empty(0, dtype=dtype, device=self._device)
+        return super()._allocate_field(name, shape, dtype)
+
+    @property
+    def num_boundaries(self) -> int:
+        """Return the number of stored ``next_obs`` which differ from the next ``obs``."""
+        return int((self._next_ref[: self._size * self._slots_per_row] >= 0).sum())
+
+    def _add_boundaries(self, owners: torch.Tensor, next_obs: torch.Tensor) -> None:
+        """Store the ``next_obs`` of the transitions ``owners`` in the boundary table.
+
+        An entry is free once its owner has been overwritten, the table grows if not enough
+        entries are free.
+        """
+        capacity = self._boundary_owner.shape[0]
+        entries = torch.arange(capacity, device=self._device)
+        live = (self._boundary_owner >= 0) & (
+            self._next_ref[self._boundary_owner.clamp(min=0)] == entries
+        )
+        free = torch.nonzero(~live).squeeze(1)
+        if free.numel() < owners.numel():
+            grown = max(2 * capacity, capacity + owners.numel())
+            self._boundary_next_obs = torch.cat(
+                [
+                    self._boundary_next_obs,
+                    self._boundary_next_obs.new_zeros((grown - capacity, *self._slot_shape)),
+                ]
+            )
+            self._boundary_owner = torch.cat(
+                [self._boundary_owner, self._boundary_owner.new_full((grown - capacity,), -1)]
+            )
+            free = torch.cat([free, torch.arange(capacity, grown, device=self._device)])
+        free = free[: owners.numel()]
+        self._boundary_next_obs[free] = next_obs
+        self._boundary_owner[free] = owners
+        self._next_ref[owners] = free.to(torch.int32)
+
+    def store(self, **data: torch.Tensor):
+        """Store data into the buffer."""
+        next_obs = data.pop('next_obs')
+        slots = self._slots_per_row
+        if self._size > 0:
+            # the previous row is followed by this one from now on
+            pending = self._pending_next_obs
+            obs = data['obs'].to(self._device).reshape(pending.shape)
+            differs = (obs != pending).reshape(slots, -1).any(dim=1)
+            if differs.any():
+                owners = ((self._ptr - 1) % self._max_size) * slots + torch.nonzero(differs)
+                self._add_boundaries(owners.squeeze(1), pending[differs])
+        self._next_ref[self._ptr * slots : (self._ptr + 1) * slots] = -1
+        super().store(**data)
+        self._pending_next_obs.copy_(next_obs.reshape(self._pending_next_obs.shape))
+
+    def _next_obs(self, idx: torch.Tensor) -> torch.Tensor:
+        """Rebuild the ``next_obs`` of the transitions ``idx``."""
+        slots = self._slots_per_row
+        row, slot = idx // slots, idx % slots
+        next_idx = (row + 1) % self._max_size * slots + slot
+        next_obs = self._decode('obs', self.data['obs'][self._data_index(next_idx)])
+        ref = self._next_ref[idx].long()
+        boundary = ref >= 0
+        next_obs[boundary] = self._boundary_next_obs[ref[boundary]]
+        latest = row == (self._ptr - 1) % self._max_size
+        next_obs[latest] = self._pending_next_obs[slot[latest]]
+        return next_obs
+
+    def sample_batch(self) -> Dict[str, torch.Tensor]:
+        """Sample a batch of data from the buffer."""
+        slots = self._slots_per_row
+        idx = torch.randint(0, self._size * slots, (self._batch_size * slots,), device=self._device)
+        index = self._data_index(idx)
+        batch = {key: self._decode(key, value[index]) for key, value in self.data.items()}
+        batch['next_obs'] = self._next_obs(idx)
+        return batch
+
+    def _saved_arrays(self) -> Dict[str, torch.Tensor]:
+        """Return the arrays written by :meth:`save`, besides the position of the buffer."""
+        arrays = super()._saved_arrays()
+        arrays['next_ref'] = self._next_ref[: self._size * self._slots_per_row]
+        arrays['pending_next_obs'] = self._pending_next_obs
+        arrays['boundary_next_obs'] = self._boundary_next_obs
+        arrays['boundary_owner'] = self._boundary_owner
+        return arrays
+
+    def _load_arrays(self, archive: Mapping[str, np.ndarray], size: int) -> None:
+        """Load the arrays returned by :meth:`_saved_arrays` from ``archive``."""
+        super()._load_arrays(archive, size)
+        self._next_ref.fill_(-1)
+        self._next_ref[: size * self._slots_per_row] = torch.as_tensor(
+            archive['next_ref'], device=self._device
+        )
+        self._pending_next_obs.copy_(torch.as_tensor(archive['pending_next_obs']))
+        self._boundary_next_obs = torch.as_tensor(
+            archive['boundary_next_obs'], device=self._device
+        ).clone()
+        self._boundary_owner = torch.as_tensor(
+            archive['boundary_owner'], device=self._device
+        ).clone()
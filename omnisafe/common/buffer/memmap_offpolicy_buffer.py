@@ -0,0 +1,188 @@
+# Copyright 2022-2023 OmniSafe Team. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Implementation of MemmapOffPolicyBuffer."""
+
+import json
+import os
+from typing import BinaryIO, Dict
+
+import numpy as np
+import torch
+
+from omnisafe.common.buffer.offpolicy_buffer import OffPolicyBuffer
+from omnisafe.typing import OmnisafeSpace
+
+
+class MemmapOffPolicyBuffer(OffPolicyBuffer):
+    """A ReplayBuffer for off_policy Algorithms, stored in memory-mapped files.
+
+    Each field is a ``.npy`` file in ``directory``, mapped with :func:`numpy.lib.format.open_memmap`
+    and exposed as a CPU tensor sharing its memory, so the buffer is only bounded by the disk,
+    and the operating system pages the fields in and out of RAM as needed.
+
+    :meth:`sample_batch` sorts the sampled indices, so each field is gathered in a single
+    front-to-back pass over its file.
+    The ``cache_size`` most recently stored rows are also kept in RAM, and read from there.
+
+    If ``directory`` already holds a buffer with the same fields,
+    it is reopened without copying, and the position saved by :meth:`flush` is restored,
+    to warm-start a new run from the transitions of a previous one.
+
+    .. note::
+        The transitions are written to the files as they are stored,
+        but the position of the buffer is only written by :meth:`flush`.
+
+    Args:
+        obs_space (OmnisafeSpace): The observation space.
+        act_space (OmnisafeSpace): The action space.
+        size (int): The maximum size of the buffer.
+        batch_size (int): The batch size.
+        directory (str): The directory of the files.
+        cache_size (int): The number of recent rows kept in RAM.
+        device (torch.device): The device of the sampled batches, the fields are stored on the CPU.
+        dtypes (dict, optional): The storage dtypes of the fields, see :class:`BaseBuffer`.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        obs_space: OmnisafeSpace,
+        act_space: OmnisafeSpace,
+        size: int,
+        batch_size: int,
+        directory: str,
+        cache_size: int = 0,
+        device: torch.device = torch.device('cpu'),
+        **kwargs,
+    ):
+        self._directory = directory
+        self._cache_size = min(cache_size, size)
+        self._memmaps: Dict[str, np.memmap] = {}
+        self._cache: Dict[str, torch.Tensor] = {}
+        meta_path = os.path.join(directory, 'meta.json')
+        self._reopened = os.path.isfile(meta_path)
+        os.makedirs(directory, exist_ok=True)
+        super().__init__(
+            obs_space, act_space, size, batch_size, device=torch.device('cpu'), **kwargs
+        )
+        self._sample_device = torch.device(device)
+        # the rows stored since the buffer was opened, and how many of the last ones are cached
+        self._num_stored: int = 0
+        self._num_cached: int = 0
+        if self._reopened:
+            with open(meta_path, encoding='utf-8') as file:
+                meta = json.load(file)
+            self._ptr, self._size = meta['ptr'], meta['size']
+            for key, scale in meta.get('scales', {}).items():
+                self._scales[key] = torch.tensor(scale)
+
+    @property
+    def directory(self) -> str:
+        """Return the directory of the files."""
+        return self._directory
+
+    def _allocate_storage(self, name: str, shape: tuple, dtype: torch.dtype) -> torch.Tensor:
+        """Map the field ``name`` to its file, reopening it if it exists."""
+        path = os.path.join(self._directory, f'{name}.npy')
+        # numpy has no bfloat16, it is mapped as int16
+        file_dtype = torch.int16 if dtype == torch.bfloat16 else dtype
+        np_dtype = torch.empty((), dtype=file_dtype).numpy().dtype
+        if self._reopened and os.path.isfile(path):
+            array = np.lib.format.open_memmap(path, mode='r+')
+            assert (
+                array.shape == shape and array.dtype == np_dtype
+            ), f'The field {name} in {self._directory} does not match this buffer.'
+        else:
+            array = np.lib.format.open_memmap(path, mode='w+', dtype=np_dtype, shape=shape)
+        self._memmaps[name] = array
+        if self._cache_size > 0:
+            self._cache[name] = torch.zeros((self._cache_size, *shape[1:]), dtype=dtype)
+        return torch.from_numpy(array).view(dtype)
+
+    def store(self, **data: torch.Tensor):
+        """Store data into the buffer, and into the cache of recent rows."""
+        row = self._ptr
+        super().store(**data)
+        if self._cache:
+            for key in data:
+                self._cache[key][self._num_stored % self._cache_size] = self.data[key][row]
+            self._num_cached = min(self._num_cached + 1, self._cache_size)
+        self._num_stored += 1
+
+    def _rescale_field(self, name: str, ratio: torch.Tensor) -> None:
+        """Requantize the quantized field ``name`` in place, in the files and in the cache."""
+        super()._rescale_field(name, ratio)
+        if self._cache:
+            cache = self._cache[name]
+            cache.copy_(torch.round(cache.float() * ratio))
+
+    def sample_batch(self) -> Dict[str, torch.Tensor]:
+        """Sample a batch of data from the buffer, gathering each field in one sorted pass.
+
+        The samples are put back in the order they were drawn in, so that any slice of the batch,
+        e.g. a batch of :meth:`sample_batches`, is spread over the whole buffer.
+        """
+        num_samples = self._batch_size * self._slots_per_row
+        idx = torch.randint(0, self._size * self._slots_per_row, (num_samples,))
+        sorted_idx, order = idx.sort()
+        index = self._data_index(sorted_idx)
+        if self._num_cached == 0:
+            batch = {key: value[index] for key, value in self.data.items()}
+        else:
+            # the rows stored in the last ``num_cached`` calls of :meth:`store` are read from RAM
+            age = (self._ptr - 1 - index[0]) % self._max_size
+            hot = age < self._num_cached
+            cold_index = tuple(i[~hot] for i in index)
+            cache_rows = (self._num_stored - 1 - age[hot]) % self._cache_size
+            hot_index = (cache_rows, *(i[hot] for i in index[1:]))
+            batch = {}
+            for key, value in self.data.items():
+                sample = value.new_empty((num_samples, *value.shape[len(index) :]))
+                sample[~hot] = value[cold_index]
+                sample[hot] = self._cache[key][hot_index]
+                batch[key] = sample
+        unsort = order.argsort()
+        return {
+            key: self._decode(key, value[unsort].to(self._sample_device))
+            for key, value in batch.items()
+        }
+
+    def flush(self) -> None:
+        """Write the stored transitions and the position of the buffer to ``directory``."""
+        for array in self._memmaps.values():
+            array.flush()
+        meta_path = os.path.join(self._directory, 'meta.json')
+        with open(f'{meta_path}.tmp', 'w', encoding='utf-8') as file:
+            scales = {key: value.tolist() for key, value in self._scales.items()}
+            json.dump({'ptr': self._ptr, 'size': self._size, 'scales': scales}, file)
+        os.replace(f'{meta_path}.tmp', meta_path)
+
+    def save(self, file: BinaryIO) -> None:
+        """Flush the fields to ``directory``, and write only the position of the buffer to ``file``.
+
+        Args:
+            file (BinaryIO): The file to write to.
+        """
+        self.flush()
+        np.savez(file, _ptr=np.array(self._ptr), _size=np.array(self._size))
+
+    def load(self, file: BinaryIO) -> None:
+        """Restore the position written by :meth:`save`, the fields being read from ``directory``.
+
+        Args:
+            file (BinaryIO): The file to read from.
+        """
+        with np.load(file) as archive:
+            self._ptr, self._size = int(archive['_ptr']), int(archive['_size'])
+        self._num_cached = 0
@@ -0,0 +1,54 @@
+# Copyright 2022-2023 OmniSafe Team. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Implementation of MemmapVectorOffPolicyBuffer."""
+
+from typing import Dict, Optional
+
+import torch
+
+from omnisafe.common.buffer.memmap_offpolicy_buffer import MemmapOffPolicyBuffer
+from omnisafe.common.buffer.vector_offpolicy_buffer import VectorOffPolicyBuffer
+from omnisafe.typing import OmnisafeSpace
+
+
+class MemmapVectorOffPolicyBuffer(MemmapOffPolicyBuffer, VectorOffPolicyBuffer):
+    """A VectorReplayBuffer for OffPolicy Algorithms, stored in memory-mapped files.
+
+    See :class:`MemmapOffPolicyBuffer` for the details.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        obs_space: OmnisafeSpace,
+        act_space: OmnisafeSpace,
+        size: int,
+        batch_size: int,
+        num_envs: int,
+        directory: str,
+        cache_size: int = 0,
+        device: torch.device = torch.device('cpu'),
+        dtypes: Optional[Dict[str, torch.dtype]] = None,
+    ):
+        super().__init__(
+            obs_space,
+            act_space,
+            size,
+            batch_size,
+            directory=directory,
+            cache_size=cache_size,
+            device=device,
+            dtypes=dtypes,
+            num_envs=num_envs,
+        )
@@ -14,8 +14,10 @@
 # ==============================================================================
 """Implementation of OffPolicyBuffer."""
 
-from typing import Dict
+import zipfile
+from typing import BinaryIO, Dict, List, Mapping, Optional, Tuple
 
+import numpy as np
 import torch
 from gymnasium.spaces import Box
 
@@ -33,11 +35,12 @@ class OffPolicyBuffer(BaseBuffer):
         size: int,
         batch_size: int,
         device: torch.device = torch.device('cpu'),
+        dtypes: Optional[Dict[str, torch.dtype]] = None,
     ):
-        super().__init__(obs_space, act_space, size, device)
+        super().__init__(obs_space, act_space, size, device, dtypes)
         if isinstance(obs_space, Box):
-            self.data['next_obs'] = torch.zeros(
-                (size, *obs_space.shape), dtype=torch.float32, device=device
+            self.data['next_obs'] = self._allocate_field(
+                'next_obs', (size, *obs_space.shape), torch.float32
             )
         else:
             raise NotImplementedError
@@ -57,14 +60,90 @@ class OffPolicyBuffer(BaseBuffer):
         """Return the batch size of the buffer."""
         return self._batch_size
 
+    def add_field(self, name: str, shape: tuple, dtype: torch.dtype):
+        """Add a field to the buffer."""
+        self.data[name] = self._allocate_field(name, (self._max_size, *shape), dtype)
+
+    @property
+    def _slots_per_row(self) -> int:
+        """Return the number of transitions stored by each call of :meth:`store`."""
+        return 1
+
+    def _data_index(self, idx: torch.Tensor) -> Tuple[torch.Tensor, ...]:
+        """Return the index of the transitions ``idx`` into the fields of the buffer."""
+        return (idx,)
+
     def store(self, **data: torch.Tensor):
         """Store data into the buffer."""
         for key, value in data.items():
-            self.data[key][self._ptr] = value
+            self.data[key][self._ptr] = self._encode(key, value)
         self._ptr = (self._ptr + 1) % self._max_size
         self._size = min(self._size + 1, self._max_size)
 
     def sample_batch(self) -> Dict[str, torch.Tensor]:
         """Sample a batch of data from the buffer."""
         idxs = torch.randint(0, self._size, (self._batch_size,))
-        return {key: value[idxs] for key, value in self.data.items()}
+        return {key: self._decode(key, value[idxs]) for key, value in self.data.items()}
+
+    def sample_batches(self, num_batches: int) -> List[Dict[str, torch.Tensor]]:
+        """Sample ``num_batches`` batches with one gather over each field.
+
+        Args:
+            num_batches (int): The number of batches.
+        """
+        batch_size = self._batch_size
+        self._batch_size = batch_size * num_batches
+        try:
+            batch = self.sample_batch()
+        finally:
+            self._batch_size = batch_size
+        chunks = {key: value.chunk(num_batches) for key, value in batch.items()}
+        return [{key: value[i] for key, value in chunks.items()} for i in range(num_batches)]
+
+    def _saved_arrays(self) -> Dict[str, torch.Tensor]:
+        """Return the arrays written by :meth:`save`, besides the position of the buffer."""
+        arrays = {key: value[: self._size] for key, value in self.data.items()}
+        arrays.update({f'{key}_scale': value for key, value in self._scales.items()})
+        return arrays
+
+    def _load_arrays(self, archive: Mapping[str, np.ndarray], size: int) -> None:
+        """Load the arrays returned by :meth:`_saved_arrays` from ``archive``."""
+        for key, value in self.data.items():
+            array = torch.as_tensor(archive[key], device=self._device)
+            # numpy has no bfloat16, it is saved as int16
+            value[:size] = array.view(value.dtype) if value.dtype == torch.bfloat16 else array
+        for key in self._scales:
+            self._scales[key] = torch.as_tensor(archive[f'{key}_scale'], device=self._device)
+
+    def save(self, file: BinaryIO) -> None:
+        """Stream the stored transitions into a compressed ``.npz`` file.
+
+        Only the filled part of the buffer is written, one field at a time,
+        so at most one field is copied to the host at once.
+
+        Args:
+            file (BinaryIO): The file to write to.
+        """
+        with zipfile.ZipFile(file, mode='w', compression=zipfile.ZIP_DEFLATED) as archive:
+            fields = {'_ptr': np.array(self._ptr), '_size': np.array(self._size)}
+            for key, value in fields.items():
+                with archive.open(f'{key}.npy', mode='w') as member:
+                    np.lib.format.write_array(member, value)
+            for key, value in self._saved_arrays().items():
+                with archive.open(f'{key}.npy', mode='w', force_zip64=True) as member:
+                    value = value.cpu()
+                    if value.dtype == torch.bfloat16:
+                        value = value.view(torch.int16)
+                    np.lib.format.write_array(member, value.numpy())
+
+    def load(self, file: BinaryIO) -> None:
+        """Load the transitions written by :meth:`save`.
+
+        Args:
+            file (BinaryIO): The file to read from.
+        """
+        with np.load(file) as archive:
+            size = int(archive['_size'])
+            assert size <= self._max_size, 'The saved buffer does not fit in this buffer.'
+            self._load_arrays(archive, size)
+            self._ptr, self._size = int(archive['_ptr']), size
@@ -14,7 +14,7 @@
 # ==============================================================================
 """Implementation of OnPolicyBuffer."""
 
-from typing import Dict, Tuple
+from typing import Dict, Optional, Tuple
 
 import torch
 
@@ -45,8 +45,9 @@ class OnPolicyBuffer(BaseBuffer):  # pylint: disable=too-many-instance-attribute
         standardized_adv_r: bool = False,
         standardized_adv_c: bool = False,
         device: torch.device = torch.device('cpu'),
+        dtypes: Optional[Dict[str, torch.dtype]] = None,
     ):
-        super().__init__(obs_space, act_space, size, device)
+        super().__init__(obs_space, act_space, size, device, dtypes)
         self._standardized_adv_r = standardized_adv_r
         self._standardized_adv_c = standardized_adv_c
         self.data['adv_r'] = torch.zeros((size,), dtype=torch.float32, device=device)
@@ -85,7 +86,7 @@ class OnPolicyBuffer(BaseBuffer):  # pylint: disable=too-many-instance-attribute
         """Store data into the buffer."""
         assert self.ptr < self.max_size, 'No more space in the buffer!'
         for key, value in data.items():
-            self.data[key][self.ptr] = value
+            self.data[key][self.ptr] = self._encode(key, value)
         self.ptr += 1
 
     def finish_path(
@@ -95,30 +96,56 @@ class OnPolicyBuffer(BaseBuffer):  # pylint: disable=too-many-instance-attribute
     ) -> None:
         """Finish the current path and calculate the advantages of state-action pairs."""
         path_slice = slice(self.path_start_idx, self.ptr)
-        last_value_r = last_value_r.to(self.device)
-        last_value_c = last_value_c.to(self.device)
-        rewards = torch.cat([self.data['reward'][path_slice], last_value_r])
-        values_r = torch.cat([self.data['value_r'][path_slice], last_value_r])
-        costs = torch.cat([self.data['cost'][path_slice], last_value_c])
-        values_c = torch.cat([self.data['value_c'][path_slice], last_value_c])
+        path_data = {key: value[path_slice] for key, value in self.data.items()}
+        for key, value in self._calculate_path_targets(
+            path_data, last_value_r, last_value_c
+        ).items():
+            self.data[key][path_slice] = value
+
+        self.path_start_idx = self.ptr
+
+    def _calculate_path_targets(
+        self,
+        path_data: Dict[str, torch.Tensor],
+        last_value_r: torch.Tensor,
+        last_value_c: torch.Tensor,
+    ) -> Dict[str, torch.Tensor]:
+        """Calculate the advantages and value targets of finished paths.
+
+        The fields in ``path_data`` are either of shape ``(T,)`` for a single path,
+        or of shape ``(T, B)`` for ``B`` paths that end at the same step.
+
+        Args:
+            path_data (Dict[str, torch.Tensor]): The buffer fields of the paths.
+            last_value_r (torch.Tensor): The bootstrap value of the reward critic.
+            last_value_c (torch.Tensor): The bootstrap value of the cost critic.
+        """
+        bootstrap_shape = (1, *path_data['reward'].shape[1:])
+        last_value_r = last_value_r.to(self.device).reshape(bootstrap_shape)
+        last_value_c = last_value_c.to(self.device).reshape(bootstrap_shape)
+        rewards = torch.cat([path_data['reward'], last_value_r])
+        values_r = torch.cat([path_data['value_r'], last_value_r])
+        costs = torch.cat([path_data['cost'], last_value_c])
+        values_c = torch.cat([path_data['value_c'], last_value_c])
+        logp = path_data['logp']
 
         discountred_ret = discount_cumsum_torch(rewards, self._gamma)[:-1]
-        self.data['discounted_ret'][path_slice] = discountred_ret
         rewards -= self._penalty_coefficient * costs
 
         adv_r, target_value_r = self._calculate_adv_and_value_targets(
-            values_r, rewards, lam=self._lam
+            values_r, rewards, lam=self._lam, logp=logp
         )
         adv_c, target_value_c = self._calculate_adv_and_value_targets(
-            values_c, costs, lam=self._lam_c
+            values_c, costs, lam=self._lam_c, logp=logp
         )
 
-        self.data['adv_r'][path_slice] = adv_r
-        self.data['target_value_r'][path_slice] = target_value_r
-        self.data['adv_c'][path_slice] = adv_c
-        self.data['target_value_c'][path_slice] = target_value_c
-
-        self.path_start_idx = self.ptr
+        return {
+            'discounted_ret': discountred_ret,
+            'adv_r': adv_r,
+            'target_value_r': target_value_r,
+            'adv_c': adv_c,
+            'target_value_c': target_value_c,
+        }
 
     def get(self) -> Dict[str, torch.Tensor]:
         """Get the data in the buffer."""
@@ -126,8 +153,8 @@ class OnPolicyBuffer(BaseBuffer):  # pylint: disable=too-many-instance-attribute
         self.ptr, self.path_start_idx = 0, 0
 
         data = {
-            'obs': self.data['obs'],
-            'act': self.data['act'],
+            'obs': self._decode('obs', self.data['obs']),
+            'act': self._decode('act', self.data['act']),
             'target_value_r': self.data['target_value_r'],
             'adv_r': self.data['adv_r'],
             'logp': self.data['logp'],
@@ -153,6 +180,7 @@ class OnPolicyBuffer(BaseBuffer):  # pylint: disable=too-many-instance-attribute
         values: torch.Tensor,
         rewards: torch.Tensor,
         lam: float,
+        logp: torch.Tensor,
     ) -> Tuple[torch.Tensor, torch.Tensor]:
         r"""Compute the estimated advantage.
 
@@ -201,6 +229,7 @@ class OnPolicyBuffer(BaseBuffer):  # pylint: disable=too-many-instance-attribute
             vals (np.array): The value of states.
             rews (np.array): The reward of states.
             lam (float, optional): The lambda factor for GAE. Defaults to 0.95.
+            logp (torch.Tensor): The log probability of the actions, used by V-trace.
         """
 
         if self._advantage_estimator == 'gae':
@@ -220,8 +249,7 @@ class OnPolicyBuffer(BaseBuffer):  # pylint: disable=too-many-instance-attribute
             #  v_s = V(x_s) + \sum^{T-1}_{t=s} \gamma^{t-s}
             #                * \prod_{i=s}^{t-1} c_i
             #                 * \rho_t (r_t + \gamma V(x_{t+1}) - V(x_t))
-            path_slice = slice(self.path_start_idx, self.ptr)
-            action_probs = self.data['logp'][path_slice].exp()
+            action_probs = logp.exp()
             target_value, adv, _ = calculate_v_trace(
                 policy_action_probs=action_probs,
                 values=values,
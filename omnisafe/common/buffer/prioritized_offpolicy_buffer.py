@@ -0,0 +1,157 @@
+# Copyright 2022-2023 OmniSafe Team. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Implementation of PrioritizedOffPolicyBuffer."""
+
+from typing import BinaryIO, Dict
+
+import torch
+
+from omnisafe.common.buffer.offpolicy_buffer import OffPolicyBuffer
+from omnisafe.common.buffer.segment_tree import MinSegmentTree, SumSegmentTree
+from omnisafe.typing import OmnisafeSpace
+
+
+class PrioritizedOffPolicyBuffer(OffPolicyBuffer):
+    r"""A ReplayBuffer for off_policy Algorithms with prioritized experience replay.
+
+    Each transition :math:`i` is sampled with probability
+
+    .. math::
+        P(i) = \frac{p_i}{\sum_k p_k}, \quad p_i = (|\delta_i| + \epsilon)^{\alpha}
+
+    where :math:`\delta_i` is its last TD error, given by :meth:`update_priorities`.
+    New transitions get the maximum priority seen so far, so each is sampled at least once.
+    The bias is corrected by the importance sampling weights
+
+    .. math::
+        w_i = \left( \frac{P(i)}{\min_k P(k)} \right)^{-\beta}
+
+    returned with each batch under ``weights``, alongside the sampled ``indices``.
+
+    For safe RL, the priority of the transitions with non-zero cost is multiplied by
+    ``cost_priority_scale``, so that the rare unsafe transitions are replayed more often.
+
+    The priorities are kept in a :class:`SumSegmentTree` and a :class:`MinSegmentTree`,
+    so sampling a batch and updating its priorities are batched :math:`O(\log N)` tensor operations.
+
+    Args:
+        obs_space (OmnisafeSpace): The observation space.
+        act_space (OmnisafeSpace): The action space.
+        size (int): The maximum size of the buffer.
+        batch_size (int): The batch size.
+        alpha (float): The prioritization exponent, 0 samples uniformly.
+        beta (float): The importance sampling exponent, 1 fully corrects the bias.
+        cost_priority_scale (float): The priority multiplier of the transitions with non-zero cost.
+        eps (float): The constant added to the TD errors, so that no priority is zero.
+        device (torch.device): The device of the buffer.
+        dtypes (dict, optional): The storage dtypes of the fields, see :class:`BaseBuffer`.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        obs_space: OmnisafeSpace,
+        act_space: OmnisafeSpace,
+        size: int,
+        batch_size: int,
+        alpha: float = 0.6,
+        beta: float = 0.4,
+        cost_priority_scale: float = 1.0,
+        eps: float = 1e-6,
+        device: torch.device = torch.device('cpu'),
+        **kwargs,
+    ):
+        super().__init__(obs_space, act_space, size, batch_size, device=device, **kwargs)
+        assert alpha >= 0.0 and beta >= 0.0, 'alpha and beta must be non-negative.'
+        assert cost_priority_scale > 0.0, 'cost_priority_scale must be positive.'
+        self._alpha = alpha
+        self.beta = beta
+        self._cost_priority_scale = cost_priority_scale
+        self._eps = eps
+        num_slots = self._max_size * self._slots_per_row
+        self._sum_tree = SumSegmentTree(num_slots, device=device)
+        self._min_tree = MinSegmentTree(num_slots, device=device)
+        self._max_priority = torch.ones((), dtype=torch.float64, device=device)
+        # the rows stored since the last sampling, which get the maximum priority then
+        self._num_pending_rows: int = 0
+
+    def store(self, **data: torch.Tensor):
+        """Store data into the buffer, with the maximum priority."""
+        super().store(**data)
+        self._num_pending_rows = min(self._num_pending_rows + 1, self._max_size)
+
+    def _flush_pending_rows(self) -> None:
+        """Give the rows stored since the last sampling the maximum priority, in one batch."""
+        if self._num_pending_rows == 0:
+            return
+        rows = torch.arange(1, self._num_pending_rows + 1, device=self._device)
+        rows = (self._ptr - rows) % self._max_size
+        slots = torch.arange(self._slots_per_row, device=self._device)
+        idx = (rows.unsqueeze(-1) * self._slots_per_row + slots).flatten()
+        self._set_priorities(idx, self._max_priority.expand(idx.shape))
+        self._num_pending_rows = 0
+
+    def _set_priorities(self, idx: torch.Tensor, priorities: torch.Tensor) -> None:
+        """Set the priorities of the transitions ``idx``, scaling those with non-zero cost."""
+        if self._cost_priority_scale != 1.0:
+            cost = self.data['cost'][self._data_index(idx)]
+            priorities = torch.where(cost != 0, priorities * self._cost_priority_scale, priorities)
+        self._sum_tree[idx] = priorities
+        self._min_tree[idx] = priorities
+
+    def sample_batch(self) -> Dict[str, torch.Tensor]:
+        """Sample a batch of data from the buffer, proportionally to the priorities.
+
+        The sampling is stratified: one transition is sampled from each of
+        ``batch_size`` segments of equal total priority.
+        """
+        self._flush_pending_rows()
+        num_samples = self._batch_size * self._slots_per_row
+        total = self._sum_tree.reduce()
+        prefixsum = torch.arange(num_samples, dtype=torch.float64, device=self._device)
+        prefixsum += torch.rand(num_samples, dtype=torch.float64, device=self._device)
+        prefixsum *= total / num_samples
+        # rounding may step past the last stored transition
+        idx = self._sum_tree.find_prefixsum_idx(prefixsum)
+        idx.clamp_(max=self._size * self._slots_per_row - 1)
+        weights = (self._sum_tree[idx] / self._min_tree.reduce()).pow(-self.beta)
+
+        index = self._data_index(idx)
+        batch = {key: self._decode(key, value[index]) for key, value in self.data.items()}
+        batch['weights'] = weights.float()
+        batch['indices'] = idx
+        return batch
+
+    def update_priorities(self, indices: torch.Tensor, td_errors: torch.Tensor) -> None:
+        """Update the priorities of the sampled transitions from their TD errors.
+
+        Args:
+            indices (torch.Tensor): The ``indices`` of the sampled batch.
+            td_errors (torch.Tensor): The absolute TD errors of the batch.
+        """
+        priorities = (td_errors.detach().to(torch.float64) + self._eps).pow(self._alpha)
+        torch.maximum(self._max_priority, priorities.max(), out=self._max_priority)
+        self._set_priorities(indices, priorities)
+
+    def load(self, file: BinaryIO) -> None:
+        """Load the transitions written by :meth:`save`, all with the maximum priority.
+
+        Args:
+            file (BinaryIO): The file to read from.
+        """
+        super().load(file)
+        self._sum_tree = SumSegmentTree(self._sum_tree.capacity, device=self._device)
+        self._min_tree = MinSegmentTree(self._min_tree.capacity, device=self._device)
+        self._max_priority.fill_(1.0)
+        self._num_pending_rows = self._size
@@ -0,0 +1,60 @@
+# Copyright 2022-2023 OmniSafe Team. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Implementation of PrioritizedVectorOffPolicyBuffer."""
+
+from typing import Dict, Optional
+
+import torch
+
+from omnisafe.common.buffer.prioritized_offpolicy_buffer import PrioritizedOffPolicyBuffer
+from omnisafe.common.buffer.vector_offpolicy_buffer import VectorOffPolicyBuffer
+from omnisafe.typing import OmnisafeSpace
+
+
+class PrioritizedVectorOffPolicyBuffer(PrioritizedOffPolicyBuffer, VectorOffPolicyBuffer):
+    r"""A VectorReplayBuffer for OffPolicy Algorithms with prioritized experience replay.
+
+    The transitions of all the environments share one priority tree,
+    the transition of environment :math:`j` in row :math:`i` being its leaf :math:`i \times n + j`.
+    See :class:`PrioritizedOffPolicyBuffer` for the details.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        obs_space: OmnisafeSpace,
+        act_space: OmnisafeSpace,
+        size: int,
+        batch_size: int,
+        num_envs: int,
+        alpha: float = 0.6,
+        beta: float = 0.4,
+        cost_priority_scale: float = 1.0,
+        eps: float = 1e-6,
+        device: torch.device = torch.device('cpu'),
+        dtypes: Optional[Dict[str, torch.dtype]] = None,
+    ):
+        super().__init__(
+            obs_space,
+            act_space,
+            size,
+            batch_size,
+            alpha=alpha,
+            beta=beta,
+            cost_priority_scale=cost_priority_scale,
+            eps=eps,
+            device=device,
+            dtypes=dtypes,
+            num_envs=num_envs,
+        )
@@ -0,0 +1,109 @@
+# Copyright 2022-2023 OmniSafe Team. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Implementation of batched segment trees for prioritized experience replay."""
+
+from typing import Callable
+
+import torch
+
+
+class SegmentTree:
+    r"""A binary segment tree, which is updated and queried in batches.
+
+    The nodes are stored in one flat tensor: the root is at index 1,
+    the children of node :math:`i` are at :math:`2i` and :math:`2i + 1`,
+    and the leaves are at :math:`[C, 2C)`, where :math:`C` is the capacity rounded up to a power of two.
+    Every operation walks the :math:`\log_2 C` levels of the tree once for the whole batch,
+    so there is no per-element Python loop.
+
+    Args:
+        capacity (int): The number of leaves.
+        operation (Callable): The associative operation reducing two children into their parent.
+        neutral_element (float): The value of the empty leaves.
+        device (torch.device): The device of the tree.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        operation: Callable[[torch.Tensor, torch.Tensor], torch.Tensor],
+        neutral_element: float,
+        device: torch.device = torch.device('cpu'),
+    ) -> None:
+        assert capacity > 0, 'The capacity of the segment tree must be positive.'
+        self._capacity = 1 << (capacity - 1).bit_length()
+        self._depth = self._capacity.bit_length() - 1
+        self._operation = operation
+        # float64, so that the sums of a million priorities keep their precision
+        self._value = torch.full(
+            (2 * self._capacity,), neutral_element, dtype=torch.float64, device=device
+        )
+
+    @property
+    def capacity(self) -> int:
+        """Return the number of leaves, rounded up to a power of two."""
+        return self._capacity
+
+    def reduce(self) -> torch.Tensor:
+        """Return the reduction of all the leaves, as a 0-d tensor."""
+        return self._value[1]
+
+    def __getitem__(self, idx: torch.Tensor) -> torch.Tensor:
+        """Return the values of the leaves ``idx``."""
+        return self._value[idx + self._capacity]
+
+    def __setitem__(self, idx: torch.Tensor, value: torch.Tensor) -> None:
+        """Set the values of the leaves ``idx`` and update their ancestors.
+
+        If ``idx`` holds duplicates, one of their values is kept.
+        """
+        nodes = idx + self._capacity
+        self._value[nodes] = value.to(self._value.dtype)
+        for _ in range(self._depth):
+            # duplicated parents are recomputed from the same children, so they agree
+            nodes = nodes // 2
+            self._value[nodes] = self._operation(self._value[2 * nodes], self._value[2 * nodes + 1])
+
+
+class SumSegmentTree(SegmentTree):
+    """A segment tree of sums, to sample leaves proportionally to their values."""
+
+    def __init__(self, capacity: int, device: torch.device = torch.device('cpu')) -> None:
+        super().__init__(capacity, torch.add, 0.0, device)
+
+    def find_prefixsum_idx(self, prefixsum: torch.Tensor) -> torch.Tensor:
+        r"""Find, for each ``prefixsum``, the highest leaf whose prefix sum does not exceed it.
+
+        Sampling ``prefixsum`` uniformly in :math:`[0, \text{total})` samples the leaves
+        proportionally to their values.
+
+        Args:
+            prefixsum (torch.Tensor): The prefix sums to search for.
+        """
+        prefixsum = prefixsum.to(self._value.dtype)
+        idx = torch.ones_like(prefixsum, dtype=torch.long)
+        for _ in range(self._depth):
+            left = self._value[2 * idx]
+            go_right = prefixsum >= left
+            prefixsum = torch.where(go_right, prefixsum - left, prefixsum)
+            idx = 2 * idx + go_right.long()
+        return idx - self._capacity
+
+
+class MinSegmentTree(SegmentTree):
+    """A segment tree of minimums, to normalize the importance sampling weights."""
+
+    def __init__(self, capacity: int, device: torch.device = torch.device('cpu')) -> None:
+        super().__init__(capacity, torch.minimum, float('inf'), device)
@@ -14,7 +14,7 @@
 # ==============================================================================
 """Implementation of VectorOffPolicyBuffer."""
 
-from typing import Dict
+from typing import Dict, Optional, Tuple
 
 import torch
 from gymnasium.spaces import Box
@@ -34,31 +34,30 @@ class VectorOffPolicyBuffer(OffPolicyBuffer):
         batch_size: int,
         num_envs: int,
         device: torch.device = torch.device('cpu'),
+        dtypes: Optional[Dict[str, torch.dtype]] = None,
     ):
         self._num_envs = num_envs
+        self._device = device
+        self._init_dtypes(dtypes)
         if isinstance(obs_space, Box):
-            obs_buf = torch.zeros(
-                (size, num_envs, *obs_space.shape), dtype=torch.float32, device=device
-            )
-            next_obs_buf = torch.zeros(
-                (size, num_envs, *obs_space.shape), dtype=torch.float32, device=device
+            obs_buf = self._allocate_field('obs', (size, num_envs, *obs_space.shape), torch.float32)
+            next_obs_buf = self._allocate_field(
+                'next_obs', (size, num_envs, *obs_space.shape), torch.float32
             )
         else:
             raise NotImplementedError
 
         if isinstance(act_space, Box):
-            act_buf = torch.zeros(
-                (size, num_envs, *act_space.shape), dtype=torch.float32, device=device
-            )
+            act_buf = self._allocate_field('act', (size, num_envs, *act_space.shape), torch.float32)
         else:
             raise NotImplementedError
 
         self.data = {
             'obs': obs_buf,
             'act': act_buf,
-            'reward': torch.zeros((size, num_envs), dtype=torch.float32, device=device),
-            'cost': torch.zeros((size, num_envs), dtype=torch.float32, device=device),
-            'done': torch.zeros((size, num_envs), dtype=torch.float32, device=device),
+            'reward': self._allocate_field('reward', (size, num_envs), torch.float32),
+            'cost': self._allocate_field('cost', (size, num_envs), torch.float32),
+            'done': self._allocate_field('done', (size, num_envs), torch.float32),
             'next_obs': next_obs_buf,
         }
 
@@ -66,7 +65,6 @@ class VectorOffPolicyBuffer(OffPolicyBuffer):
         self._size: int = 0
         self._max_size: int = size
         self._batch_size: int = batch_size
-        self._device = device
 
     @property
     def num_envs(self) -> int:
@@ -74,15 +72,24 @@ class VectorOffPolicyBuffer(OffPolicyBuffer):
         return self._num_envs
 
     def add_field(self, name: str, shape: tuple, dtype: torch.dtype):
-        self.data[name] = torch.zeros(
-            (self._max_size, self._num_envs, *shape), dtype=dtype, device=self._device
+        self.data[name] = self._allocate_field(
+            name, (self._max_size, self._num_envs, *shape), dtype
         )
 
+    @property
+    def _slots_per_row(self) -> int:
+        """Return the number of transitions stored by each call of :meth:`store`."""
+        return self._num_envs
+
+    def _data_index(self, idx: torch.Tensor) -> Tuple[torch.Tensor, ...]:
+        """Return the index of the transitions ``idx`` into the fields of the buffer."""
+        return idx // self._num_envs, idx % self._num_envs
+
     def sample_batch(self) -> Dict[str, torch.Tensor]:
         """Sample a batch from the buffer."""
         idx = torch.randint(
             0, self._size, (self._batch_size * self._num_envs,), device=self._device
         )
         env_idx = torch.arange(self._num_envs, device=self._device).repeat(self._batch_size)
-        batch = {key: value[idx, env_idx] for key, value in self.data.items()}
+        batch = {key: self._decode(key, value[idx, env_idx]) for key, value in self.data.items()}
         return batch
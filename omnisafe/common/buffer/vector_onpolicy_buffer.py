@@ -14,7 +14,7 @@
 # ==============================================================================
 """Implementation of VectorOnPolicyBuffer."""
 
-from typing import Dict
+from typing import Dict, Optional, Union
 
 import torch
 
@@ -24,9 +24,14 @@ from omnisafe.utils import distributed_utils
 
 
 class VectorOnPolicyBuffer(OnPolicyBuffer):
-    """Vectorized on-policy buffer."""
+    """Vectorized on-policy buffer.
 
-    def __init__(  # pylint: disable=super-init-not-called,too-many-arguments
+    Every field is stored in a single tensor of shape ``(size, num_envs, ...)``,
+    so the data of all environments is written with one indexed write per step,
+    and :meth:`get` returns the flattened ``(size * num_envs, ...)`` views of the fields.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
         self,
         obs_space: OmnisafeSpace,
         act_space: OmnisafeSpace,
@@ -40,53 +45,115 @@ class VectorOnPolicyBuffer(OnPolicyBuffer):
         standardized_adv_c: bool,
         num_envs: int = 1,
         device: torch.device = torch.device('cpu'),
+        dtypes: Optional[Dict[str, torch.dtype]] = None,
     ):
-        self._num_buffers = num_envs
-        self._standardized_adv_r = standardized_adv_r
-        self._standardized_adv_c = standardized_adv_c
         if num_envs < 1:
             raise ValueError('num_envs must be greater than 0.')
-        self.buffers = [
-            OnPolicyBuffer(
-                obs_space=obs_space,
-                act_space=act_space,
-                size=size,
-                gamma=gamma,
-                lam=lam,
-                lam_c=lam_c,
-                advantage_estimator=advantage_estimator,
-                penalty_coefficient=penalty_coefficient,
-                device=device,
-            )
-            for _ in range(num_envs)
-        ]
+        self._num_envs = num_envs
+        super().__init__(
+            obs_space=obs_space,
+            act_space=act_space,
+            size=size,
+            gamma=gamma,
+            lam=lam,
+            lam_c=lam_c,
+            advantage_estimator=advantage_estimator,
+            penalty_coefficient=penalty_coefficient,
+            standardized_adv_r=standardized_adv_r,
+            standardized_adv_c=standardized_adv_c,
+            device=device,
+            dtypes=dtypes,
+        )
+        self.data = {
+            key: torch.zeros((size, num_envs, *value.shape[1:]), dtype=value.dtype, device=device)
+            for key, value in self.data.items()
+        }
+        self.path_start_idx = torch.zeros(num_envs, dtype=torch.long, device=device)
 
     @property
     def num_buffers(self) -> int:
         """Get the number of buffers."""
-        return self._num_buffers
+        return self._num_envs
+
+    @property
+    def num_envs(self) -> int:
+        """Get the number of environments."""
+        return self._num_envs
+
+    def add_field(self, name: str, shape: tuple, dtype: torch.dtype):
+        self.data[name] = torch.zeros(
+            (self.max_size, self._num_envs, *shape), dtype=dtype, device=self._device
+        )
 
     def store(self, **data: torch.Tensor) -> None:
-        """Store data into the buffer."""
-        for i, buffer in enumerate(self.buffers):
-            buffer.store(**{k: v[i] for k, v in data.items()})
+        """Store the data of all environments into the buffer."""
+        assert self.ptr < self.max_size, 'No more space in the buffer!'
+        for key, value in data.items():
+            value = self._encode(key, value)
+            self.data[key][self.ptr] = value.reshape(self.data[key].shape[1:])
+        self.ptr += 1
 
     def finish_path(
         self,
         last_value_r: torch.Tensor = torch.zeros(1),
         last_value_c: torch.Tensor = torch.zeros(1),
-        idx: int = 0,
+        idx: Union[int, torch.Tensor] = 0,
     ) -> None:
-        """Finish the path."""
-        self.buffers[idx].finish_path(last_value_r, last_value_c)
+        """Finish the path.
+
+        ``idx`` is either the index of a single environment,
+        or a vector of the indices of all environments whose paths end at the current step.
+        In the latter case, ``last_value_r`` and ``last_value_c`` hold one bootstrap value per index.
+
+        Args:
+            last_value_r (torch.Tensor): The bootstrap value of the reward critic.
+            last_value_c (torch.Tensor): The bootstrap value of the cost critic.
+            idx (int or torch.Tensor): The index or indices of the finished environments.
+        """
+        env_idx = torch.as_tensor(idx, device=self.device).reshape(-1)
+        path_start_idx = self.path_start_idx[env_idx]
+        # all paths end at ``ptr``, so they are processed as one ``(T, len(env_idx))`` block
+        # starting at the earliest path start, and the steps that belong to earlier paths
+        # of an environment are left untouched when writing the results back.
+        path_slice = slice(int(path_start_idx.min()), self.ptr)
+        in_path = (
+            torch.arange(path_slice.start, path_slice.stop, device=self.device)[:, None]
+            >= path_start_idx[None, :]
+        )
+        path_data = {
+            key: self.data[key][path_slice, env_idx]
+            for key in ('reward', 'value_r', 'cost', 'value_c', 'logp')
+        }
+        for key, value in self._calculate_path_targets(
+            path_data, last_value_r, last_value_c
+        ).items():
+            self.data[key][path_slice, env_idx] = torch.where(
+                in_path, value.to(self.data[key].dtype), self.data[key][path_slice, env_idx]
+            )
+        self.path_start_idx[env_idx] = self.ptr
 
     def get(self) -> Dict[str, torch.Tensor]:
-        """Get the data from the buffer."""
-        data_pre = {k: [v] for k, v in self.buffers[0].get().items()}
-        for buffer in self.buffers[1:]:
-            for k, v in buffer.get().items():
-                data_pre[k].append(v)
-        data = {k: torch.cat(v, dim=0) for k, v in data_pre.items()}
+        """Get the data of all environments from the buffer."""
+        assert self.ptr == self.max_size, 'The buffer is not full!'
+        self.ptr = 0
+        self.path_start_idx.zero_()
+
+        data = {
+            key: self._decode(key, self.data[key].reshape(-1, *self.data[key].shape[2:]))
+            for key in (
+                'obs',
+                'act',
+                'target_value_r',
+                'adv_r',
+                'logp',
+                'discounted_ret',
+                'adv_c',
+                'target_value_c',
+            )
+        }
+
+        self.data['adv_r'] = torch.zeros_like(self.data['adv_r'])
+        self.data['adv_c'] = torch.zeros_like(self.data['adv_c'])
 
         adv_mean, adv_std, *_ = distributed_utils.mpi_statistics_scalar(data['adv_r'])
         cadv_mean, *_ = distributed_utils.mpi_statistics_scalar(data['adv_c'])
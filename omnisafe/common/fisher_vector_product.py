@@ -0,0 +1,168 @@
+# Copyright 2022-2023 OmniSafe Team. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Implementation of FisherVectorProduct."""
+
+from typing import Dict, Optional, Tuple
+
+import torch
+from torch import nn
+from torch.distributions import Normal
+
+from omnisafe.utils import distributed_utils
+
+
+class FisherVectorProduct:
+    r"""Fisher-vector product of a policy, cached per policy update.
+
+    Second-order algorithms solve :math:`F x = g` with conjugate gradients,
+    which needs one product :math:`F v` per iteration.
+    With the KL-divergence approximation,
+
+    .. math::
+        F v = \nabla_{\theta} \left( \nabla_{\theta} D_{KL}(\pi_{\theta_{old}} || \pi_{\theta})^T v \right)
+
+    The inner gradient does not depend on :math:`v`,
+    so :meth:`build` computes it (with ``create_graph=True``) once per policy update,
+    and every call only differentiates through the cached graph.
+
+    If ``analytic`` is ``True``, the closed-form Fisher of a diagonal Gaussian policy is used instead,
+
+    .. math::
+        F v = J^T M J v, \quad M = \mathrm{diag}\left(\frac{1}{\sigma^2}, \frac{2}{\sigma^2}\right)
+
+    where :math:`J` is the Jacobian of :math:`(\mu, \sigma)` w.r.t. the parameters.
+    :math:`J v` is a forward-mode ``jvp`` and :math:`J^T u` reuses a ``vjp`` closure built once,
+    so no second-order graph is created at all. This requires ``torch.func`` (``torch >= 2.0``).
+
+    .. warning::
+        The cached graph refers to the parameters at :meth:`build` time.
+        Call :meth:`release` once the parameters have been updated.
+    """
+
+    def __init__(
+        self,
+        actor: nn.Module,
+        damping: float,
+        analytic: bool = False,
+        module: Optional[nn.Module] = None,
+    ) -> None:
+        """Initialize FisherVectorProduct.
+
+        Args:
+            actor (nn.Module): The actor, whose forward returns the action distribution.
+            damping (float): The damping coefficient added to the product.
+            analytic (bool): Whether to use the analytic Gaussian Fisher.
+            module (nn.Module, optional): The sub-module of ``actor`` to differentiate w.r.t.
+                Defaults to the whole ``actor``.
+        """
+        self.actor = actor
+        self.damping = damping
+        self.analytic = analytic
+        module = actor if module is None else module
+        module_params = {id(param) for param in module.parameters()}
+        self.params: Dict[str, nn.Parameter] = {
+            name: param
+            for name, param in actor.named_parameters()
+            if param.requires_grad and id(param) in module_params
+        }
+        assert self.params, 'No trainable parameters were found in module.'
+        self._flat_grad_kl: Optional[torch.Tensor] = None
+        self._dist_params = None
+        self._vjp_fn = None
+        self._weights: Optional[Tuple[torch.Tensor, torch.Tensor]] = None
+
+    @property
+    def is_built(self) -> bool:
+        """Whether the product has been built for the current policy update."""
+        return self._flat_grad_kl is not None or self._vjp_fn is not None
+
+    def build(self, obs: torch.Tensor) -> None:
+        """Build the cached graph on ``obs`` for the current parameters.
+
+        Args:
+            obs (torch.Tensor): The (subsampled) observations the KL-divergence is averaged over.
+        """
+        self.release()
+        if self.analytic:
+            self._build_analytic(obs)
+            return
+        q_dist = self.actor(obs)
+        with torch.no_grad():
+            p_dist = self.actor(obs)
+        kl = torch.distributions.kl.kl_divergence(p_dist, q_dist).mean()
+        grads = torch.autograd.grad(kl, list(self.params.values()), create_graph=True)
+        self._flat_grad_kl = torch.cat([grad.view(-1) for grad in grads])
+
+    def _build_analytic(self, obs: torch.Tensor) -> None:
+        """Build the ``vjp`` closure and the Fisher weights of a Gaussian policy.
+
+        Args:
+            obs (torch.Tensor): The (subsampled) observations.
+        """
+        assert hasattr(torch, 'func'), 'The analytic Fisher requires torch >= 2.0.'
+
+        def dist_params(params: Dict[str, torch.Tensor]) -> Tuple[torch.Tensor, torch.Tensor]:
+            dist = torch.func.functional_call(self.actor, params, (obs,))
+            assert isinstance(dist, Normal), 'The analytic Fisher requires a Gaussian policy.'
+            return dist.mean, dist.stddev
+
+        params = {name: param.detach() for name, param in self.params.items()}
+        (mean, std), self._vjp_fn = torch.func.vjp(dist_params, params)
+        # the KL-divergence is averaged over every action dimension of every sample
+        precision = 1.0 / (std.pow(2) * mean.numel())
+        self._weights = (precision, 2.0 * precision)
+        self._dist_params = dist_params
+
+    def release(self) -> None:
+        """Release the cached graph."""
+        self._flat_grad_kl = None
+        self._dist_params = None
+        self._vjp_fn = None
+        self._weights = None
+
+    def __call__(self, vector: torch.Tensor) -> torch.Tensor:
+        """Compute the damped Fisher-vector product, averaged over processes.
+
+        Args:
+            vector (torch.Tensor): The flat vector to multiply with.
+        """
+        assert self.is_built, 'Call build() before computing Fisher-vector products.'
+        if self.analytic:
+            flat_grad_grad_kl = self._analytic_product(vector)
+        else:
+            grads = torch.autograd.grad(
+                (self._flat_grad_kl * vector).sum(),
+                list(self.params.values()),
+                retain_graph=True,
+            )
+            # contiguous indicating, if the memory is contiguously stored or not
+            flat_grad_grad_kl = torch.cat([grad.contiguous().view(-1) for grad in grads])
+        distributed_utils.mpi_avg_torch_tensor(flat_grad_grad_kl)
+        return flat_grad_grad_kl + vector * self.damping
+
+    def _analytic_product(self, vector: torch.Tensor) -> torch.Tensor:
+        """Compute :math:`J^T M J v` with forward- and reverse-mode products.
+
+        Args:
+            vector (torch.Tensor): The flat vector to multiply with.
+        """
+        params, tangents, offset = {}, {}, 0
+        for name, param in self.params.items():
+            params[name] = param.detach()
+            tangents[name] = vector[offset : offset + param.numel()].view_as(param)
+            offset += param.numel()
+        _, (jvp_mean, jvp_std) = torch.func.jvp(self._dist_params, (params,), (tangents,))
+        (grads,) = self._vjp_fn((jvp_mean * self._weights[0], jvp_std * self._weights[1]))
+        return torch.cat([grads[name].contiguous().view(-1) for name in self.params])
@@ -15,33 +15,65 @@
 """Implementation of the Logger."""
 
 import atexit
+import copy
 import os
+import queue
+import threading
 import time
 from collections import deque
-from typing import Any, Deque, Dict, List, Literal, Optional, TextIO, Tuple, Union
+from types import MappingProxyType
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    List,
+    Literal,
+    Mapping,
+    Optional,
+    TextIO,
+    Tuple,
+    Union,
+)
 
 import numpy as np
 import torch
-import tqdm
-import wandb
 
 from omnisafe.utils.config import Config
-from omnisafe.utils.distributed_utils import mpi_statistics_scalar, proc_id
+from omnisafe.utils.distributed_utils import broadcast, mpi_statistics_packed, num_procs, proc_id
 
 
-# As of torch v1.9.0, torch.utils.tensorboard has a bug that is exposed by setuptools 59.6.0.  The
-# bug is that it attempts to import distutils then access distutils.version without actually
-# importing distutils.version.  We can workaround this by prepopulating the distutils.version
-# submodule in the distutils module.
+def _import_summary_writer() -> type:
+    """Import the tensorboard ``SummaryWriter`` on first use, it is slow to import."""
+    # As of torch v1.9.0, torch.utils.tensorboard has a bug that is exposed by setuptools 59.6.0.
+    # The bug is that it attempts to import distutils then access distutils.version without
+    # actually importing distutils.version.  We can workaround this by prepopulating the
+    # distutils.version submodule in the distutils module.
+    try:
+        # pylint: disable-next=import-outside-toplevel,unused-import
+        import distutils.version  # noqa: F401
+    except ImportError:
+        pass
 
-try:
-    # pylint: disable-next=wrong-import-order,unused-import
-    import distutils.version  # isort:skip  # noqa: F401
-except ImportError:
-    pass
+    # pylint: disable-next=import-outside-toplevel
+    from torch.utils.tensorboard import SummaryWriter
 
-# pylint: disable-next=wrong-import-order
-from torch.utils.tensorboard import SummaryWriter  # isort:skip
+    return SummaryWriter
+
+
+def _series_stats(vals: torch.Tensor) -> torch.Tensor:
+    """Get ``(sum, count, sum of squares, min, max)`` of a 1-D series, on its device."""
+    vals = vals.to(torch.float64)
+    if len(vals) == 0:
+        return torch.tensor([0.0, 0.0, 0.0, float('inf'), float('-inf')], dtype=torch.float64)
+    count = vals.new_tensor(len(vals))
+    return torch.stack([vals.sum(), count, vals.square().sum(), vals.min(), vals.max()])
+
+
+def _merge_stats(parts: torch.Tensor) -> torch.Tensor:
+    """Merge stacked ``(sum, count, sum of squares, min, max)`` parts of one series."""
+    min_val, max_val = parts[:, 3].min(0, keepdim=True)[0], parts[:, 4].max(0, keepdim=True)[0]
+    return torch.cat([parts[:, :3].sum(0), min_val, max_val])
 
 
 ColorType = Literal['gray', 'red', 'green', 'yellow', 'blue', 'magenta', 'cyan', 'white', 'crimson']
@@ -84,6 +116,92 @@ class WordColor:  # pylint: disable=too-few-public-methods
         return f'\x1b[{";".join(attr)}m{msg}\x1b[0m'
 
 
+class AsyncWriter:
+    """Write logged rows (or checkpoints) to their sinks on a background thread.
+
+    The training thread only puts an immutable snapshot of each row into a bounded queue.
+    When ``max_queue_size`` rows are pending, :meth:`submit` blocks until the writer catches up,
+    so slow sinks apply backpressure instead of growing memory.
+    An exception raised by a sink is re-raised on the training thread at the next call.
+    """
+
+    def __init__(
+        self,
+        write_fn: Callable[[int, Mapping[str, Any]], None],
+        max_queue_size: int,
+        name: str = 'omnisafe-logger',
+    ) -> None:
+        """Initialize AsyncWriter.
+
+        Args:
+            write_fn (Callable): The function that writes one ``(epoch, row)`` to the sinks.
+            max_queue_size (int): The maximum number of pending rows.
+            name (str): The name of the background thread.
+        """
+        self._write_fn = write_fn
+        self._queue: 'queue.Queue[Optional[Tuple[int, Mapping[str, Any]]]]' = queue.Queue(
+            maxsize=max_queue_size
+        )
+        self._error: Optional[BaseException] = None
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                if self._error is None:
+                    self._write_fn(*item)
+            except BaseException as error:  # pylint: disable=broad-except
+                self._error = error
+            finally:
+                self._queue.task_done()
+
+    def _raise_error(self) -> None:
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise RuntimeError(f'The {self._thread.name} thread failed to write.') from error
+
+    def submit(self, epoch: int, row: Mapping[str, Any]) -> None:
+        """Queue a snapshot of the row.
+
+        Args:
+            epoch (int): The epoch of the row.
+            row (dict): The row to be written.
+        """
+        assert not self._closed, 'The writer has been closed'
+        self._raise_error()
+        self._queue.put((epoch, MappingProxyType(dict(row))))
+
+    def flush(self) -> None:
+        """Block until all queued rows have been written."""
+        self._queue.join()
+        self._raise_error()
+
+    def close(self) -> None:
+        """Write all queued rows and stop the thread."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+        self._raise_error()
+
+
+def _cpu_snapshot(obj: Any) -> Any:
+    """Copy the tensors in a (nested) state dict to the CPU, so later updates do not race."""
+    if isinstance(obj, torch.Tensor):
+        return obj.detach().to('cpu', copy=True)
+    if isinstance(obj, dict):
+        return type(obj)((key, _cpu_snapshot(val)) for key, val in obj.items())
+    if isinstance(obj, (list, tuple)):
+        return type(obj)(_cpu_snapshot(val) for val in obj)
+    return copy.deepcopy(obj)
+
+
 class Logger:  # pylint: disable=too-many-instance-attributes
     """Implementation of the Logger.
 
@@ -103,8 +221,17 @@ class Logger:  # pylint: disable=too-many-instance-attributes
         use_wandb: bool = False,
         config: Optional[Config] = None,
         models: Optional[List[torch.nn.Module]] = None,
+        async_logging: bool = False,
+        max_queue_size: int = 16,
+        async_checkpoint: bool = False,
+        keep_checkpoint_last: Optional[int] = None,
+        keep_checkpoint_every: Optional[int] = None,
     ) -> None:
-        hms_time = time.strftime('%Y-%m-%d-%H-%M-%S', time.localtime())
+        # all processes share the log directory of the main process
+        timestamp = torch.tensor(time.time(), dtype=torch.float64)
+        if num_procs() > 1:
+            broadcast(timestamp)
+        hms_time = time.strftime('%Y-%m-%d-%H-%M-%S', time.localtime(timestamp.item()))
         relpath = hms_time
 
         if seed is not None:
@@ -127,10 +254,17 @@ class Logger:  # pylint: disable=too-many-instance-attributes
         self._epoch: int = 0
         self._first_row: bool = True
         self._what_to_save: Optional[Dict[str, Any]] = None
+        assert keep_checkpoint_last is None or keep_checkpoint_last > 0
+        assert keep_checkpoint_every is None or keep_checkpoint_every > 0
+        self._keep_checkpoint_last = keep_checkpoint_last
+        self._keep_checkpoint_every = keep_checkpoint_every
+        self._checkpoints: List[Tuple[int, str]] = []
+        self._num_checkpoints: int = 0
         self._data: Dict[str, Union[Deque[Union[int, float]], List[Union[int, float]]]] = {}
         self._headers_windwos: Dict[str, Optional[int]] = {}
         self._headers_minmax: Dict[str, bool] = {}
         self._current_row: Dict[str, Union[int, float]] = {}
+        self._accumulators: Dict[str, torch.Tensor] = {}
 
         if config is not None:
             self.save_config(config)
@@ -140,9 +274,13 @@ class Logger:  # pylint: disable=too-many-instance-attributes
         self._use_wandb = use_wandb
 
         if self._use_tensorboard and self._main_proc:
-            self._tensorboard_writer = SummaryWriter(log_dir=os.path.join(self._log_dir, 'tb'))
+            summary_writer = _import_summary_writer()
+            self._tensorboard_writer = summary_writer(log_dir=os.path.join(self._log_dir, 'tb'))
 
         if self._use_wandb and self._main_proc:
+            import wandb  # pylint: disable=import-outside-toplevel
+
+            self._wandb = wandb
             project: str = self._config.get('wandb_project', 'omnisafe')
             name: str = self._config.get('wandb_name', f'{exp_name}/{relpath}')
             entity: str = self._config.get('wandb_entity', None)
@@ -153,10 +291,25 @@ class Logger:  # pylint: disable=too-many-instance-attributes
                 for model in models:
                     wandb.watch(model)
 
+        self._async_writer: Optional[AsyncWriter] = None
+        if async_logging and self._main_proc:
+            self._async_writer = AsyncWriter(self._write_row, max_queue_size=max_queue_size)
+            atexit.register(self._async_writer.close)
+
+        self._checkpoint_writer: Optional[AsyncWriter] = None
+        if async_checkpoint and self._main_proc:
+            # at most one snapshot waits while another one is being written
+            self._checkpoint_writer = AsyncWriter(
+                self._write_checkpoint, max_queue_size=1, name='omnisafe-checkpoint'
+            )
+            atexit.register(self._checkpoint_writer.close)
+
         if not self._verbose:
             assert (
                 'epochs' in self._config
             ), 'epochs must be specified in the config file when verbose is False'
+            import tqdm  # pylint: disable=import-outside-toplevel
+
             self._proc_bar = tqdm.tqdm(total=self._config['epochs'], desc='Epochs')
 
     def log(
@@ -182,6 +335,23 @@ class Logger:  # pylint: disable=too-many-instance-attributes
             with open(os.path.join(self._log_dir, 'config.json'), encoding='utf-8', mode='w') as f:
                 f.write(config.tojson())
 
+    @property
+    def log_dir(self) -> str:
+        """The log directory of the run."""
+        return self._log_dir
+
+    def state_dict(self) -> Dict[str, Any]:
+        """Get the state of the logger, to resume training."""
+        return {'epoch': self._epoch}
+
+    def load_state_dict(self, state_dict: Dict[str, Any]) -> None:
+        """Load the state of the logger.
+
+        Args:
+            state_dict (dict): The state returned by :meth:`state_dict`.
+        """
+        self._epoch = state_dict['epoch']
+
     def setup_torch_saver(self, what_to_save: Dict[str, Any]) -> None:
         """Setup the torch saver.
 
@@ -191,17 +361,51 @@ class Logger:  # pylint: disable=too-many-instance-attributes
         self._what_to_save = what_to_save
 
     def torch_save(self) -> None:
-        """Save the torch model."""
+        """Save the torch model.
+
+        .. note::
+            With ``async_checkpoint``, the state dicts are copied to the CPU and serialized
+            on a background thread. Checkpoints are written to a temporary file and renamed,
+            so ``epoch-N.pt`` is either complete or absent.
+        """
         if self._main_proc:
             assert self._what_to_save is not None, 'Please setup torch saver first'
-            path = os.path.join(self._log_dir, 'torch_save', f'epoch-{self._epoch}.pt')
-            os.makedirs(os.path.dirname(path), exist_ok=True)
-
             params = {
                 k: v.state_dict() if hasattr(v, 'state_dict') else v
                 for k, v in self._what_to_save.items()
             }
-            torch.save(params, path)
+            if self._checkpoint_writer is not None:
+                self._checkpoint_writer.submit(self._epoch, _cpu_snapshot(params))
+            else:
+                self._write_checkpoint(self._epoch, params)
+
+    def _write_checkpoint(self, epoch: int, params: Mapping[str, Any]) -> None:
+        """Atomically write one checkpoint, then apply the retention policy.
+
+        Args:
+            epoch (int): The epoch of the checkpoint.
+            params (dict): The things to be saved.
+        """
+        path = os.path.join(self._log_dir, 'torch_save', f'epoch-{epoch}.pt')
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f'{path}.tmp'
+        torch.save(dict(params), tmp_path)
+        os.replace(tmp_path, path)
+
+        # keep the last ``keep_checkpoint_last`` and every ``keep_checkpoint_every``-th checkpoint
+        self._checkpoints = [ckpt for ckpt in self._checkpoints if ckpt[1] != path]
+        self._checkpoints.append((self._num_checkpoints, path))
+        self._num_checkpoints += 1
+        if self._keep_checkpoint_last is None:
+            return
+        stale = self._checkpoints[: -self._keep_checkpoint_last]
+        self._checkpoints = self._checkpoints[-self._keep_checkpoint_last :]
+        every = self._keep_checkpoint_every
+        for ordinal, stale_path in reversed(stale):
+            if every is not None and ordinal % every == 0:
+                self._checkpoints.insert(0, (ordinal, stale_path))
+            else:
+                os.remove(stale_path)
 
     def register_key(
         self, key: str, window_length: Optional[int] = None, min_and_max: bool = False
@@ -234,35 +438,53 @@ class Logger:  # pylint: disable=too-many-instance-attributes
     def store(self, **kwargs: Union[int, float, np.ndarray, torch.Tensor]) -> None:
         """Store the data to the logger.
 
+        .. note::
+            A tensor is stored as its mean, without reading it back to the host.
+            For keys averaged in epoch, the running ``(sum, count, sum of squares, min, max)``
+            is accumulated on the tensor's device, and only read back in :meth:`dump_tabular`.
+
         Args:
             **kwargs: The data to be stored.
         """
         for key, val in kwargs.items():
-            assert key in self._current_row, f'Key {key} has not been registered'
+            assert key in self._data, f'Key {key} has not been registered'
             if isinstance(val, (int, float)):
                 self._data[key].append(val)
             elif isinstance(val, torch.Tensor):
-                self._data[key].append(val.mean().item())
+                sample = val.detach().mean()
+                if self._headers_windwos[key] is None:
+                    self._accumulate(key, sample)
+                else:
+                    self._data[key].append(sample)
             elif isinstance(val, np.ndarray):
                 self._data[key].append(val.mean())
             else:
                 raise ValueError(f'Unsupported type {type(val)}')
 
+    def _accumulate(self, key: str, sample: torch.Tensor) -> None:
+        """Accumulate a sample into the running statistics of the key, on its device."""
+        sample = sample.to(torch.float64)
+        acc = self._accumulators.get(key)
+        if acc is None:
+            acc = self._accumulators[key] = _series_stats(sample.new_empty(0)).to(sample.device)
+        acc[:3] += torch.stack([sample, torch.ones_like(sample), sample.square()])
+        acc[3:] = torch.stack([torch.minimum(acc[3], sample), torch.maximum(acc[4], sample)])
+
     def dump_tabular(self) -> None:
         """Dump the tabular data to the console and the file."""
-        for key in self._data:
+        keys = list(self._data)
+        for key, (mean, min_val, max_val, std) in zip(keys, self._reduce_stats(keys)):
             if self._headers_minmax[key]:
-                mean, min_val, max_val, std = self.get_stats(key, True)
                 self._current_row[f'{key}/Mean'] = mean
                 self._current_row[f'{key}/Min'] = min_val
                 self._current_row[f'{key}/Max'] = max_val
                 self._current_row[f'{key}/Std'] = std
             else:
-                mean = self.get_stats(key, False)[0]
                 self._current_row[key] = mean
 
             if self._headers_windwos[key] is None:
                 self._data[key] = []
+                self._accumulators.pop(key, None)
 
         if self._main_proc:
             self._epoch += 1
@@ -277,39 +499,93 @@ class Logger:  # pylint: disable=too-many-instance-attributes
             else:
                 self._proc_bar.update(1)
 
-            if self._first_row:
-                self._output_file.write(' '.join(self._current_row.keys()) + '\n')
-                self._first_row = False
-            self._output_file.write(' '.join(map(str, self._current_row.values())) + '\n')
-            self._output_file.flush()
+            if self._async_writer is not None:
+                self._async_writer.submit(self._epoch, self._current_row)
+            else:
+                self._write_row(self._epoch, self._current_row)
 
-            if self._use_tensorboard:
-                for key, val in self._current_row.items():
-                    self._tensorboard_writer.add_scalar(key, val, global_step=self._epoch)
-                self._tensorboard_writer.flush()
+    def _write_row(self, epoch: int, row: Mapping[str, Union[int, float]]) -> None:
+        """Write one row to ``progress.txt``, tensorboard and wandb.
 
-            if self._use_wandb:
-                wandb.log(self._current_row, step=self._epoch)
+        Args:
+            epoch (int): The epoch of the row.
+            row (Mapping): The row to be written.
+        """
+        if self._first_row:
+            self._output_file.write(' '.join(row.keys()) + '\n')
+            self._first_row = False
+        self._output_file.write(' '.join(map(str, row.values())) + '\n')
+        self._output_file.flush()
+
+        if self._use_tensorboard:
+            for key, val in row.items():
+                self._tensorboard_writer.add_scalar(key, val, global_step=epoch)
+            self._tensorboard_writer.flush()
+
+        if self._use_wandb:
+            self._wandb.log(dict(row), step=epoch)
 
     def get_stats(self, key, min_and_max: bool = False) -> Tuple[Union[int, float], ...]:
         """Get the statistics of the key."""
-        assert key in self._current_row, f'Key {key} has not been registered'
-        vals = self._data[key]
-        if isinstance(vals, deque):
-            vals = list(vals)
-
+        assert key in self._data, f'Key {key} has not been registered'
+        mean, min_val, max_val, std = self._reduce_stats([key], min_and_max)[0]
         if min_and_max:
-            mean, std, min_val, max_val = mpi_statistics_scalar(
-                torch.tensor(vals), with_min_and_max=True
-            )
-            return mean.item(), min_val.item(), max_val.item(), std.item()
+            return mean, min_val, max_val, std
+        return (mean,)
 
-        mean, std = mpi_statistics_scalar(  # pylint: disable=unbalanced-tuple-unpacking
-            torch.tensor(vals)
-        )
-        return (mean.item(),)
+    def _local_stats(self, key: str) -> List[torch.Tensor]:
+        """Get the local ``(sum, count, sum of squares, min, max)`` parts of the key.
+
+        Numbers are summarized on the host, stored tensors on their own device.
+        """
+        numbers = [val for val in self._data[key] if not isinstance(val, torch.Tensor)]
+        tensors = [val for val in self._data[key] if isinstance(val, torch.Tensor)]
+        parts = [_series_stats(torch.tensor(numbers, dtype=torch.float64))]
+        if tensors:
+            parts.append(_series_stats(torch.stack(tensors)))
+        if key in self._accumulators:
+            parts.append(self._accumulators[key])
+        return parts
+
+    def _reduce_stats(
+        self, keys: List[str], min_and_max: Optional[bool] = None
+    ) -> List[Tuple[float, float, float, float]]:
+        """Get the ``(mean, min, max, std)`` of the keys across processes with fused collectives.
+
+        Args:
+            keys (list of str): The keys to be reduced.
+            min_and_max (bool, optional): Whether to reduce min and max,
+                defaults to whether any key was registered with ``min_and_max``.
+        """
+        if not keys:
+            return []
+        if min_and_max is None:
+            min_and_max = any(self._headers_minmax[key] for key in keys)
+        parts = [self._local_stats(key) for key in keys]
+        # read the parts back to the host with one transfer per device
+        flat_parts = [part for key_parts in parts for part in key_parts]
+        host_parts: List[torch.Tensor] = [torch.empty(0)] * len(flat_parts)
+        for device in {part.device for part in flat_parts}:
+            idx = [i for i, part in enumerate(flat_parts) if part.device == device]
+            for i, part in zip(idx, torch.stack([flat_parts[i] for i in idx]).cpu()):
+                host_parts[i] = part
+        stats, offset = [], 0
+        for key_parts in parts:
+            stats.append(_merge_stats(torch.stack(host_parts[offset : offset + len(key_parts)])))
+            offset += len(key_parts)
+        stats = torch.stack(stats)
+        if min_and_max:
+            mean, std, min_val, max_val = mpi_statistics_packed(stats, with_min_and_max=True)
+        else:
+            mean, std = mpi_statistics_packed(stats)  # pylint: disable=unbalanced-tuple-unpacking
+            min_val, max_val = stats[:, 3], stats[:, 4]
+        return list(zip(mean.tolist(), min_val.tolist(), max_val.tolist(), std.tolist()))
 
     def close(self) -> None:
         """Close the logger."""
         if self._main_proc:
+            if self._async_writer is not None:
+                self._async_writer.close()
+            if self._checkpoint_writer is not None:
+                self._checkpoint_writer.close()
             self._output_file.close()
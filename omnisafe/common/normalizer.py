@@ -66,11 +66,12 @@ class Normalizer(nn.Module):
             raw_data = raw_data.unsqueeze(-1)
         return raw_data
 
-    def normalize(self, raw_data=None):
-        """Normalize the raw_data."""
+    def normalize(self, raw_data=None, update=True):
+        """Normalize the raw_data, and push it into the stream if ``update``."""
         raw_data = self.pre_process(raw_data)
-        self.push(raw_data)
+        if update:
+            self.push(raw_data)
         if self.count <= 1:
-            return self.raw_data.data
-        output = (self.raw_data.data - self.mean.data) / self.std.data
+            return raw_data
+        output = (raw_data - self.mean.data) / self.std.data
         return torch.clamp(output, -self.clip.data, self.clip.data)
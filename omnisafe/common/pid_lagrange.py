@@ -36,6 +36,9 @@ class PIDLagrangian(abc.ABC):
     - URL: `PID Lagrange <https://arxiv.org/abs/2007.03964>`_
     """
 
+    #: The controller state restored when resuming training.
+    state_attributes = ('pid_i', 'cost_ds', '_delta_p', '_cost_d', 'cost_penalty')
+
     # pylint: disable-next=too-many-arguments
     def __init__(
         self,
@@ -0,0 +1,60 @@
+# Copyright 2022-2023 OmniSafe Team. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Implementation of PolyakAverager."""
+
+from typing import List
+
+import torch
+from torch import nn
+
+
+class PolyakAverager:
+    r"""Polyak averaging of the parameters of a target network.
+
+    .. math::
+        \theta_{\text{targ}} \leftarrow \tau \theta + (1 - \tau) \theta_{\text{targ}}
+
+    where :math:`1 - \tau` is ``polyak``.
+
+    The parameters of both networks are gathered into lists once,
+    and each :meth:`update` is a single fused ``torch._foreach_lerp_`` over them,
+    which allocates no temporary tensors.
+
+    .. note::
+        The parameters must not be replaced after construction, e.g. by moving the networks
+        to another device. Loading a state dict copies in place and is fine.
+    """
+
+    def __init__(self, source: nn.Module, target: nn.Module, polyak: float) -> None:
+        """Initialize PolyakAverager.
+
+        Args:
+            source (nn.Module): The online network.
+            target (nn.Module): The target network, with the same parameters as ``source``.
+            polyak (float): The weight of the target parameters in the average.
+        """
+        self._source: List[torch.Tensor] = [param.detach() for param in source.parameters()]
+        self._target: List[torch.Tensor] = [param.detach() for param in target.parameters()]
+        assert len(self._source) == len(self._target), 'The networks have different parameters.'
+        self.polyak = polyak
+
+    @torch.no_grad()
+    def update(self) -> None:
+        """Move the target parameters towards the online ones."""
+        if hasattr(torch, '_foreach_lerp_'):
+            torch._foreach_lerp_(self._target, self._source, 1.0 - self.polyak)
+        else:
+            torch._foreach_mul_(self._target, self.polyak)
+            torch._foreach_add_(self._target, self._source, alpha=1.0 - self.polyak)
@@ -21,7 +21,6 @@ import os
 import numpy as np
 import torch
 from gymnasium.spaces import Box, Discrete
-from gymnasium.utils.save_video import save_video
 
 from omnisafe.models.actor import ActorBuilder
 from omnisafe.utils.config import Config
@@ -256,6 +255,11 @@ class Evaluator:  # pylint: disable=too-many-instance-attributes
             self.env = self._make_env(**env_kwargs)
             self.render_mode = 'rgb_array'
 
+        # moviepy is slow to import, and only needed to save the replay
+        from gymnasium.utils.save_video import (  # pylint: disable=import-outside-toplevel
+            save_video,
+        )
+
         horizon = self.env.rollout_data.max_ep_len
         frames = []
         obs, _ = self.env.reset()
@@ -13,13 +13,13 @@
 # limitations under the License.
 # ==============================================================================
 """Implementation of QCritic."""
-from typing import List, Optional
+from typing import Optional
 
 import torch
 import torch.nn as nn
 
 from omnisafe.models.base import Critic
-from omnisafe.utils.model_utils import Activation, InitFunction, build_mlp_network
+from omnisafe.utils.model_utils import Activation, InitFunction, build_ensemble_mlp_network
 
 
 class QCritic(Critic):
@@ -58,7 +58,7 @@ class QCritic(Critic):
 
         .. note::
             The Q critic network contains multiple critics,
-            and the output of the network :meth`forward` is a list of Q-values.
+            and the output of the network :meth`forward` stacks their Q-values.
             If you want to get the single Q-value of a specific critic,
             you need to use the index to get it.
 
@@ -82,40 +82,40 @@ class QCritic(Critic):
             weight_initialization_mode=weight_initialization_mode,
             shared=shared,
         )
-        self.critic_list = []
+        self.num_critics = num_critics
         expand_dim = act_dim if action_type == 'continuous' else 1
-        for idx in range(num_critics):
-            if self.use_obs_encoder:
-                obs_encoder = build_mlp_network(
-                    [obs_dim, hidden_sizes[0]],
-                    activation=activation,
-                    output_activation=activation,
-                    weight_initialization_mode=weight_initialization_mode,
-                )
-                net = build_mlp_network(
-                    [hidden_sizes[0] + expand_dim] + hidden_sizes[1:] + [1],
-                    activation=activation,
-                    weight_initialization_mode=weight_initialization_mode,
-                )
-                critic = nn.Sequential(obs_encoder, net)
-            else:
-                net = build_mlp_network(
-                    [obs_dim + act_dim] + hidden_sizes[:] + [1],
-                    activation=activation,
-                    weight_initialization_mode=weight_initialization_mode,
-                )
-                critic = nn.Sequential(net)
-            self.critic_list.append(critic)
-            self.add_module(f'critic_{idx}', critic)
+        # the critics are stacked into one ensemble, evaluated with one batched matmul per layer
+        if self.use_obs_encoder:
+            self.obs_encoder = build_ensemble_mlp_network(
+                [obs_dim, hidden_sizes[0]],
+                ensemble_size=num_critics,
+                activation=activation,
+                output_activation=activation,
+                weight_initialization_mode=weight_initialization_mode,
+            )
+            self.net = build_ensemble_mlp_network(
+                [hidden_sizes[0] + expand_dim] + hidden_sizes[1:] + [1],
+                ensemble_size=num_critics,
+                activation=activation,
+                weight_initialization_mode=weight_initialization_mode,
+            )
+        else:
+            self.net = build_ensemble_mlp_network(
+                [obs_dim + act_dim] + hidden_sizes[:] + [1],
+                ensemble_size=num_critics,
+                activation=activation,
+                weight_initialization_mode=weight_initialization_mode,
+            )
 
     def forward(
         self,
         obs: torch.Tensor,
         act: Optional[torch.Tensor] = None,
-    ) -> List:
+    ) -> torch.Tensor:
         """Forward function.
 
-        As a multi-critic network, the output of the network is a list of Q-values.
+        As a multi-critic network, the output of the network is a ``(num_critics, *batch_shape)``
+        tensor of Q-values, where ``batch_shape`` is the shape of ``obs`` without its last dimension.
         If you want to use it as a single-critic network,
         you only need to set the ``num_critics`` parameter to 1 when initializing the network,
         and then use the index 0 to get the Q-value.
@@ -124,11 +124,13 @@ class QCritic(Critic):
             obs (torch.Tensor): Observation.
             act (torch.Tensor): Action.
         """
-        res = []
-        for critic in self.critic_list:
-            if self.use_obs_encoder:
-                encodered_obs = critic[0](obs)
-                res.append(torch.squeeze(critic[1](torch.cat([encodered_obs, act], dim=-1)), -1))
-            else:
-                res.append(torch.squeeze(critic[0](torch.cat([obs, act], dim=-1)), -1))
-        return res
+        batch_shape = obs.shape[:-1]
+        obs = obs.reshape(-1, obs.shape[-1])
+        act = act.reshape(obs.shape[0], -1)
+        if self.use_obs_encoder:
+            encoded_obs = self.obs_encoder(obs)
+            act = act.expand(self.num_critics, *act.shape)
+            q_values = self.net(torch.cat([encoded_obs, act], dim=-1))
+        else:
+            q_values = self.net(torch.cat([obs, act], dim=-1))
+        return q_values.reshape(self.num_critics, *batch_shape)
@@ -18,6 +18,7 @@ from typing import (
     Any,
     Callable,
     Dict,
+    Iterator,
     List,
     Literal,
     NamedTuple,
@@ -49,6 +50,7 @@ __all__ = [
     'TypeVar',
     'Union',
     'Dict',
+    'Iterator',
     'NamedTuple',
     'Any',
     'OmnisafeSpace',
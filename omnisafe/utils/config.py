@@ -18,6 +18,7 @@ import json
 import os
 from typing import Any, Dict, List
 
+import torch
 import yaml
 
 from omnisafe.typing import Activation, AdvatageEstimator, InitFunction
@@ -193,6 +194,14 @@ def check_all_configs(configs: Config, algo_type: str) -> None:
         - actor_lr and critic_lr must be greater than 0.
         - replay_buffer size must be greater than batch_size.
         - update_every must be less than steps_per_epoch.
+        - utd_ratio must be a positive integer.
+        - compile_update requires fused_update and ``nn.Module.compile``.
+        - num_actors must be non-negative, queue_size and sync_every must be positive.
+        - the rewards and costs can not be normalized by more than one actor.
+        - with prioritized replay, alpha and beta must be non-negative.
+        - deduplicate_obs can not be combined with prioritized replay or a directory.
+        - the dtypes of the replay buffer must be supported, and only obs can be int8.
+        - prefetch can not be combined with prioritized replay.
 
     Args:
         configs (dict): configs to be checked.
@@ -221,6 +230,52 @@ def check_all_configs(configs: Config, algo_type: str) -> None:
         assert (
             configs.update_every < configs.steps_per_epoch
         ), 'update_every must be less than steps_per_epoch'
+        assert (
+            isinstance(configs.utd_ratio, int) and configs.utd_ratio > 0
+        ), 'utd_ratio must be a positive integer'
+        if configs.compile_update:
+            assert configs.fused_update, 'compile_update requires fused_update'
+            assert hasattr(torch.nn.Module, 'compile'), 'compile_update requires torch >= 2.2'
+        assert configs.async_cfgs.num_actors >= 0, 'num_actors must be non-negative'
+        assert (
+            configs.async_cfgs.queue_size > 0 and configs.async_cfgs.sync_every > 0
+        ), 'queue_size and sync_every must be greater than 0'
+        if configs.async_cfgs.num_actors > 1:
+            # unlike the observations, the rewards and costs are normalized by each actor alone
+            assert not (
+                configs.env_cfgs.normalized_rew or configs.env_cfgs.normalized_cost
+            ), 'normalized_rew and normalized_cost are not supported with more than one actor'
+        if configs.replay_buffer_cfgs.prioritized:
+            assert (
+                configs.replay_buffer_cfgs.alpha >= 0 and configs.replay_buffer_cfgs.beta >= 0
+            ), 'alpha and beta must be non-negative'
+            assert (
+                configs.replay_buffer_cfgs.cost_priority_scale > 0
+            ), 'cost_priority_scale must be greater than 0'
+            assert (
+                configs.replay_buffer_cfgs.directory is None
+            ), 'prioritized replay is not supported by the memory-mapped buffer'
+        for key, value in configs.replay_buffer_cfgs.dtypes.items():
+            assert value in (
+                'float32',
+                'float16',
+                'bfloat16',
+                'uint8',
+                'bool',
+                'int8',
+            ), f'the dtype of {key} is not supported'
+            assert value != 'int8' or key == 'obs', 'only obs can be quantized'
+            assert (
+                value not in ('uint8', 'bool') or key == 'done'
+            ), f'{value} is only supported for the done flags, not for {key}'
+        assert not (
+            configs.replay_buffer_cfgs.prefetch and configs.replay_buffer_cfgs.prioritized
+        ), 'prefetch is not supported by prioritized replay'
+        if configs.replay_buffer_cfgs.deduplicate_obs:
+            assert (
+                not configs.replay_buffer_cfgs.prioritized
+                and configs.replay_buffer_cfgs.directory is None
+            ), 'deduplicate_obs is not supported by the prioritized and memory-mapped buffers'
 
 
 def __check_env_configs(configs: Config) -> None:
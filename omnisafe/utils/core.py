@@ -14,7 +14,7 @@
 # ==============================================================================
 """Some Core Functions"""
 
-from typing import Union
+from typing import Optional, Union
 
 import torch
 
@@ -52,14 +52,43 @@ def set_optimizer(
     return optimizer(module.parameters(), lr=learning_rate, eps=1e-5)
 
 
-def discount_cumsum_torch(x_vector: torch.Tensor, discount: float) -> torch.Tensor:
-    """Compute the discounted cumulative sum of vectors."""
-    length = x_vector.shape[0]
-    x_vector = x_vector.type(torch.float64)
-    for idx in reversed(range(length)):
-        if idx == length - 1:
-            cumsum = x_vector[idx]
-        else:
-            cumsum = x_vector[idx] + discount * cumsum
-        x_vector[idx] = cumsum
-    return x_vector
+def discount_cumsum_torch(
+    x_vector: torch.Tensor,
+    discount: Union[float, torch.Tensor],
+    done: Optional[torch.Tensor] = None,
+) -> torch.Tensor:
+    r"""Compute the discounted cumulative sum of vectors.
+
+    ``x_vector`` is either a single sequence of shape ``(T,)``,
+    or a block of sequences of shape ``(T, B)`` whose columns are processed at once.
+    ``discount`` is either a constant or a tensor of per-step discounts with the same shape.
+    If ``done`` is given, the sum is cut at the end of each episode:
+
+    .. math::
+        y_t = x_t + \gamma (1 - d_t) y_{t+1}
+
+    Instead of a reversed Python loop over every time step,
+    the recursion is solved by a parallel scan over the affine maps
+    :math:`y \mapsto x_t + \gamma (1 - d_t) y`,
+    which takes :math:`\lceil \log_2 T \rceil` vectorized steps.
+
+    Args:
+        x_vector (torch.Tensor): The sequence(s) to be summed, shape ``(T,)`` or ``(T, B)``.
+        discount (float or torch.Tensor): The discount factor.
+        done (torch.Tensor, optional): The episode ends, with the same shape as ``x_vector``.
+
+    Returns:
+        torch.Tensor: The discounted cumulative sum, in ``float64``.
+    """
+    cumsum = x_vector.to(torch.float64, copy=True)
+    decay = torch.as_tensor(discount, dtype=torch.float64, device=cumsum.device)
+    decay = decay.expand_as(cumsum).clone()
+    if done is not None:
+        decay *= 1.0 - done.to(torch.float64)
+    offset = 1
+    while offset < cumsum.shape[0]:
+        # compose the map of step t with the already composed maps of steps t + 1, ..., t + offset
+        cumsum[:-offset] = cumsum[:-offset] + decay[:-offset] * cumsum[offset:]
+        decay[:-offset] = decay[:-offset] * decay[offset:]
+        offset *= 2
+    return cumsum
@@ -17,7 +17,8 @@
 import os
 import subprocess
 import sys
-from typing import Tuple
+import weakref
+from typing import Dict, List, Tuple
 
 import numpy as np
 import torch
@@ -41,17 +42,150 @@ def setup_torch_for_mpi():
         )
 
 
-def mpi_avg_grads(module: torch.nn.Module) -> None:
+def _bucket_tensors(tensors: List[torch.Tensor], bucket_cap_mb: float) -> List[List[torch.Tensor]]:
+    """Split tensors into consecutive buckets of one dtype and device, capped at ``bucket_cap_mb``.
+
+    Args:
+        tensors (List[torch.Tensor]): tensors to be bucketed.
+        bucket_cap_mb (float): maximum size of one bucket in megabytes.
+    """
+    bucket_cap = bucket_cap_mb * 1024 * 1024
+    buckets: List[List[torch.Tensor]] = []
+    bucket: List[torch.Tensor] = []
+    bucket_size = 0
+    for tensor in tensors:
+        size = tensor.numel() * tensor.element_size()
+        if bucket and (
+            bucket_size + size > bucket_cap
+            or tensor.dtype != bucket[0].dtype
+            or tensor.device != bucket[0].device
+        ):
+            buckets.append(bucket)
+            bucket, bucket_size = [], 0
+        bucket.append(tensor)
+        bucket_size += size
+    if bucket:
+        buckets.append(bucket)
+    return buckets
+
+
+def _flatten(tensors: List[torch.Tensor]) -> torch.Tensor:
+    """Copy tensors into one contiguous flat tensor."""
+    return torch.cat([tensor.reshape(-1) for tensor in tensors])
+
+
+def _unflatten_avg_(flat: torch.Tensor, tensors: List[torch.Tensor]) -> None:
+    """Write the process average of the summed flat tensor back into tensors in place."""
+    flat /= num_procs()
+    offset = 0
+    for tensor in tensors:
+        tensor.copy_(flat[offset : offset + tensor.numel()].view_as(tensor))
+        offset += tensor.numel()
+
+
+class _OverlappedGradReducer:
+    """All-reduce gradient buckets asynchronously as soon as backward has filled them.
+
+    Buckets are laid out in reverse parameter order, which is roughly the order in which
+    backward produces the gradients, and each full bucket is launched from a
+    post-accumulate-grad hook. :meth:`synchronize` waits for the launched buckets and
+    reduces whatever was not launched, e.g. parameters without gradient or
+    gradients accumulated by more than one backward, synchronously.
+    """
+
+    def __init__(self, module: torch.nn.Module, bucket_cap_mb: float) -> None:
+        assert hasattr(
+            torch.Tensor, 'register_post_accumulate_grad_hook'
+        ), 'Overlapping the gradient all-reduce with backward requires torch >= 2.1.'
+        params = [param for param in module.parameters() if param.requires_grad]
+        self.buckets = _bucket_tensors(params[::-1], bucket_cap_mb)
+        self.bucket_of = {
+            id(param): idx for idx, bucket in enumerate(self.buckets) for param in bucket
+        }
+        self.ready: List[set] = [set() for _ in self.buckets]
+        self.works: Dict[int, Tuple[object, torch.Tensor]] = {}
+        self.stale: set = set()
+        self.handles = [param.register_post_accumulate_grad_hook(self._hook) for param in params]
+
+    def _hook(self, param: torch.Tensor) -> None:
+        idx = self.bucket_of[id(param)]
+        if idx in self.works or id(param) in self.ready[idx]:
+            # accumulated more than once before synchronize, reduce it again there
+            self.stale.add(idx)
+            return
+        self.ready[idx].add(id(param))
+        if len(self.ready[idx]) == len(self.buckets[idx]):
+            flat = _flatten([param.grad for param in self.buckets[idx]])
+            self.works[idx] = (dist.all_reduce(flat, async_op=True), flat)
+
+    def synchronize(self) -> None:
+        """Wait for all bucket reductions and write the averaged gradients back."""
+        for idx, bucket in enumerate(self.buckets):
+            grads = [param.grad for param in bucket if param.grad is not None]
+            if idx in self.works:
+                work, flat = self.works[idx]
+                work.wait()
+                if idx not in self.stale:
+                    _unflatten_avg_(flat, grads)
+                    continue
+            if grads:
+                flat = _flatten(grads)
+                allreduce(flat)
+                _unflatten_avg_(flat, grads)
+        self.ready = [set() for _ in self.buckets]
+        self.works.clear()
+        self.stale.clear()
+
+    def remove(self) -> None:
+        """Remove the gradient hooks."""
+        for handle in self.handles:
+            handle.remove()
+
+
+_GRAD_REDUCERS: 'weakref.WeakKeyDictionary[torch.nn.Module, _OverlappedGradReducer]' = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def overlap_grad_allreduce(module: torch.nn.Module, bucket_cap_mb: float = 25.0) -> None:
+    """Overlap the gradient all-reduce of ``module`` with its backward pass.
+
+    After this call, :func:`mpi_avg_grads` on ``module`` only waits for the reductions
+    that the gradient hooks started during backward.
+    Gradients are averaged as they come out of backward, so any clipping has to
+    happen after :func:`mpi_avg_grads`.
+
+    .. note::
+
+        This function only works when the training is multi-processing.
+
+    Args:
+        module (torch.nn.Module): module whose gradients are averaged.
+        bucket_cap_mb (float, optional): maximum size of one bucket in megabytes. Defaults to 25.
+    """
+    if num_procs() > 1 and module not in _GRAD_REDUCERS:
+        _GRAD_REDUCERS[module] = _OverlappedGradReducer(module, bucket_cap_mb)
+
+
+def mpi_avg_grads(module: torch.nn.Module, bucket_cap_mb: float = 25.0) -> None:
     """Average contents of gradient buffers across MPI processes.
 
+    The gradients are flattened into a few contiguous buckets of at most ``bucket_cap_mb``,
+    and each bucket is reduced with a single collective.
+
     Args:
         module (torch.nn.Module): module to be averaged.
+        bucket_cap_mb (float, optional): maximum size of one bucket in megabytes. Defaults to 25.
     """
     if num_procs() > 1:
-        for parameter in module.parameters():
-            p_grad_numpy = parameter.grad
-            avg_p_grad = mpi_avg(parameter.grad)
-            p_grad_numpy[:] = avg_p_grad[:]
+        if module in _GRAD_REDUCERS:
+            _GRAD_REDUCERS[module].synchronize()
+            return
+        grads = [param.grad for param in module.parameters() if param.grad is not None]
+        for bucket in _bucket_tensors(grads, bucket_cap_mb):
+            flat = _flatten(bucket)
+            allreduce(flat)
+            _unflatten_avg_(flat, bucket)
 
 
 def sync_params(module: torch.nn.Module) -> None:
@@ -232,3 +366,35 @@ def mpi_statistics_scalar(
         global_max = mpi_max(value)
         return mean, std, global_min, global_max
     return mean, std
+
+
+def mpi_statistics_packed(
+    stats: torch.Tensor, with_min_and_max: bool = False
+) -> Tuple[torch.Tensor, ...]:
+    """Get mean/std and optional min/max of many scalar series across MPI processes at once.
+
+    .. note::
+
+        The local statistics of all series are packed into one tensor,
+        so the sums are reduced by one collective and the extrema by (at most) another,
+        instead of several collectives per series as in :func:`mpi_statistics_scalar`.
+
+    Args:
+        stats (torch.Tensor): local ``(sum, count, sum of squares, min, max)`` of each series,
+            shape (K, 5). The min and max of an empty series are ``inf`` and ``-inf``.
+        with_min_and_max (bool): whether to return min and max.
+    """
+    stats = stats.to(torch.float64)
+    sums = stats[:, :3].contiguous()
+    extrema = torch.stack([-stats[:, 3], stats[:, 4]], dim=-1)
+    if num_procs() > 1:
+        allreduce(sums, op=ReduceOp.SUM)
+        if with_min_and_max:
+            allreduce(extrema, op=ReduceOp.MAX)
+    global_sum, global_n, global_sum_sq = sums.unbind(-1)
+    mean = global_sum / global_n
+    # compute global std
+    std = torch.sqrt(torch.clamp(global_sum_sq / global_n - mean**2, min=0.0))
+    if with_min_and_max:
+        return mean, std, -extrema[:, 0], extrema[:, 1]
+    return mean, std
@@ -17,6 +17,7 @@
 from typing import List, Literal, Union
 
 import numpy as np
+import torch
 from torch import nn
 
 
@@ -92,3 +93,76 @@ def build_mlp_network(
         initialize_layer(weight_initialization_mode, affine_layer)
         layers += [affine_layer, act()]
     return nn.Sequential(*layers)
+
+
+class EnsembleLinear(nn.Module):
+    """A stack of ``ensemble_size`` independent linear layers, applied with one batched matmul.
+
+    The weights are stored as one ``(ensemble_size, in_features, out_features)`` tensor.
+    The input is either ``(ensemble_size, batch_size, in_features)``, one batch per member,
+    or ``(batch_size, in_features)``, shared by all the members.
+    The output is ``(ensemble_size, batch_size, out_features)``.
+    """
+
+    def __init__(
+        self,
+        in_features: int,
+        out_features: int,
+        ensemble_size: int,
+        weight_initialization_mode: InitFunction = 'kaiming_uniform',
+    ) -> None:
+        """Initialize the members like independent :class:`torch.nn.Linear` layers.
+
+        Args:
+            in_features (int): The size of the input.
+            out_features (int): The size of the output.
+            ensemble_size (int): The number of members.
+            weight_initialization_mode (InitFunction): The initialization function.
+        """
+        super().__init__()
+        self.in_features = in_features
+        self.out_features = out_features
+        self.ensemble_size = ensemble_size
+        layers = [nn.Linear(in_features, out_features) for _ in range(ensemble_size)]
+        for layer in layers:
+            initialize_layer(weight_initialization_mode, layer)
+        self.weight = nn.Parameter(torch.stack([layer.weight.detach().T for layer in layers]))
+        self.bias = nn.Parameter(torch.stack([layer.bias.detach() for layer in layers]))
+
+    def forward(self, input_data: torch.Tensor) -> torch.Tensor:
+        """Apply every member to its batch.
+
+        Args:
+            input_data (torch.Tensor): The input.
+        """
+        if input_data.dim() == 2:
+            input_data = input_data.expand(self.ensemble_size, *input_data.shape)
+        return torch.baddbmm(self.bias.unsqueeze(1), input_data, self.weight)
+
+
+def build_ensemble_mlp_network(
+    sizes: List[int],
+    ensemble_size: int,
+    activation: Activation,
+    output_activation: Activation = 'identity',
+    weight_initialization_mode: InitFunction = 'kaiming_uniform',
+) -> nn.Module:
+    """Build ``ensemble_size`` MLP networks, evaluated together with :class:`EnsembleLinear`.
+
+    Args:
+        sizes (List[int]): The sizes of the layers.
+        ensemble_size (int): The number of networks.
+        activation (Activation): The activation function.
+        output_activation (Activation): The output activation function.
+        weight_initialization_mode (InitFunction): The initialization function.
+    """
+    activation = get_activation(activation)
+    output_activation = get_activation(output_activation)
+    layers = []
+    for j in range(len(sizes) - 1):
+        act = activation if j < len(sizes) - 2 else output_activation
+        layers += [
+            EnsembleLinear(sizes[j], sizes[j + 1], ensemble_size, weight_initialization_mode),
+            act(),
+        ]
+    return nn.Sequential(*layers)
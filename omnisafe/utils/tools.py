@@ -17,7 +17,7 @@
 import numpy as np
 import torch
 
-from omnisafe.typing import Any, Callable, Union
+from omnisafe.typing import Any, Callable, Iterator, Tuple, Union
 
 
 def get_flat_params_from(model: torch.nn.Module) -> torch.Tensor:
@@ -129,6 +129,32 @@ def set_param_values_to_model(model: torch.nn.Module, vals: torch.Tensor) -> Non
     assert i == len(vals), f'Lengths do not match: {i} vs. {len(vals)}'
 
 
+def iterate_minibatches(
+    *tensors: torch.Tensor, batch_size: int, shuffle: bool = True
+) -> Iterator[Tuple[torch.Tensor, ...]]:
+    """This function is used to iterate over mini-batches of tensors for one epoch.
+
+    .. note::
+        It replaces ``DataLoader(TensorDataset(*tensors), batch_size, shuffle)``
+        without per-sample collation.
+        The tensors are shuffled with one ``randperm`` on their own device,
+        and the mini-batches are slices of the shuffled tensors.
+        As with the ``DataLoader``, the last mini-batch may be smaller than ``batch_size``.
+
+    Args:
+        *tensors: tensors with the same first dimension.
+        batch_size (int): size of each mini-batch.
+        shuffle (bool): whether to shuffle the data. Default to True.
+    """
+    size = tensors[0].shape[0]
+    assert all(tensor.shape[0] == size for tensor in tensors), 'Size mismatch between tensors.'
+    if shuffle:
+        perm = torch.randperm(size, device=tensors[0].device)
+        tensors = tuple(tensor[perm] for tensor in tensors)
+    for start in range(0, size, batch_size):
+        yield tuple(tensor[start : start + batch_size] for tensor in tensors)
+
+
 # pylint: disable-next=too-many-branches,too-many-return-statements
 def to_ndarray(item: Any, dtype: np.dtype = None) -> Union[np.ndarray, TypeError, None]:
     """This function is used to convert the data type to ndarray.
@@ -0,0 +1,206 @@
+# Copyright 2022-2023 OmniSafe Team. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Save and restore the full training state of an algorithm, to resume interrupted runs.
+
+The training state of an algorithm is gathered from its attributes:
+
+- anything with ``state_dict`` and ``load_state_dict``, e.g. networks, optimizers,
+  learning rate schedulers, normalizers and the logger,
+- tensors, e.g. the Lagrange multiplier,
+- the plain attributes named in ``state_attributes`` of any class in its MRO,
+  e.g. the PID controller of :class:`PIDLagrangian`.
+
+The same is done for its environment wrapper, and the random number generators of
+Python, ``numpy``, ``torch`` and the environments are saved as well.
+The replay buffer is streamed into a separate compressed file.
+"""
+
+import copy
+import inspect
+import os
+import random
+from typing import Any, Dict, Optional
+
+import numpy as np
+import torch
+
+from omnisafe.common.buffer import OffPolicyBuffer
+from omnisafe.utils.distributed_utils import proc_id
+
+
+def get_rng_state() -> Dict[str, Any]:
+    """Get the state of the global random number generators."""
+    state = {
+        'python': random.getstate(),
+        'numpy': np.random.get_state(),
+        'torch': torch.get_rng_state(),
+    }
+    if torch.cuda.is_available():
+        state['cuda'] = torch.cuda.get_rng_state_all()
+    return state
+
+
+def set_rng_state(state: Dict[str, Any]) -> None:
+    """Set the state of the global random number generators.
+
+    Args:
+        state (dict): The state returned by :func:`get_rng_state`.
+    """
+    random.setstate(state['python'])
+    np.random.set_state(state['numpy'])
+    torch.set_rng_state(state['torch'])
+    if 'cuda' in state and torch.cuda.is_available():
+        torch.cuda.set_rng_state_all(state['cuda'])
+
+
+def get_env_rng_state(env: Any) -> Dict[str, Any]:
+    """Get the state of the random number generators of a (vectorized) environment.
+
+    .. note::
+        The sub-environments of an asynchronous vectorized environment live in worker processes,
+        only the random number generator of its action space is saved.
+
+    Args:
+        env: The environment.
+    """
+    sub_envs = getattr(env, 'envs', [] if hasattr(env, 'num_envs') else [env])
+    return {
+        'envs': [sub_env.unwrapped.np_random.bit_generator.state for sub_env in sub_envs],
+        'action_space': env.action_space.np_random.bit_generator.state,
+    }
+
+
+def set_env_rng_state(env: Any, state: Dict[str, Any]) -> None:
+    """Set the state of the random number generators of a (vectorized) environment.
+
+    Args:
+        env: The environment.
+        state (dict): The state returned by :func:`get_env_rng_state`.
+    """
+    sub_envs = getattr(env, 'envs', [] if hasattr(env, 'num_envs') else [env])
+    assert len(sub_envs) == len(state['envs']), 'The number of environments has changed.'
+    for sub_env, sub_state in zip(sub_envs, state['envs']):
+        sub_env.unwrapped.np_random.bit_generator.state = sub_state
+    env.action_space.np_random.bit_generator.state = state['action_space']
+
+
+def get_attribute_states(obj: Any) -> Dict[str, Any]:
+    """Get the state of the stateful attributes of ``obj``.
+
+    Args:
+        obj: The object, e.g. an algorithm or an environment wrapper.
+    """
+    names = set()
+    for cls in type(obj).__mro__:
+        names.update(cls.__dict__.get('state_attributes', ()))
+    states: Dict[str, Any] = {}
+    for name, value in vars(obj).items():
+        if hasattr(value, 'state_dict') and hasattr(value, 'load_state_dict'):
+            states[name] = value.state_dict()
+        elif isinstance(value, torch.Tensor):
+            states[name] = value.detach().clone()
+        elif name in names:
+            states[name] = copy.deepcopy(value)
+    return states
+
+
+def load_attribute_states(obj: Any, states: Dict[str, Any]) -> None:
+    """Load the state returned by :func:`get_attribute_states` into ``obj``.
+
+    Tensors are copied in place, so that other references to them stay valid.
+    Attributes that do not exist on ``obj`` are skipped.
+
+    Args:
+        obj: The object, e.g. an algorithm or an environment wrapper.
+        states (dict): The state of the attributes.
+    """
+    for name, state in states.items():
+        value = getattr(obj, name, None)
+        if hasattr(value, 'load_state_dict'):
+            value.load_state_dict(state)
+        elif isinstance(value, torch.Tensor):
+            value.data.copy_(state)
+        elif hasattr(obj, name) and not isinstance(state, torch.Tensor):
+            setattr(obj, name, state)
+
+
+def save_training_state(
+    algo: Any,
+    log_dir: str,
+    progress: Dict[str, int],
+    buffer: Optional[OffPolicyBuffer] = None,
+) -> None:
+    """Save the training state of ``algo`` into ``log_dir/training_state``.
+
+    Each process writes its own files, through a temporary file and a rename,
+    so an interrupted save never leaves a truncated state behind.
+
+    Args:
+        algo: The algorithm.
+        log_dir (str): The log directory of the run.
+        progress (dict): The counters to resume the training loop from.
+        buffer (OffPolicyBuffer, optional): The replay buffer.
+    """
+    state = {
+        'progress': progress,
+        'algo': get_attribute_states(algo),
+        'env': get_attribute_states(algo.env),
+        'env_rng': get_env_rng_state(algo.env.env),
+        'rng': get_rng_state(),
+    }
+    save_dir = os.path.join(log_dir, 'training_state')
+    os.makedirs(save_dir, exist_ok=True)
+    path = os.path.join(save_dir, f'proc-{proc_id()}.pt')
+    torch.save(state, f'{path}.tmp')
+    if buffer is not None:
+        buffer_path = os.path.join(save_dir, f'replay_buffer-{proc_id()}.npz')
+        with open(f'{buffer_path}.tmp', 'wb') as file:
+            buffer.save(file)
+        os.replace(f'{buffer_path}.tmp', buffer_path)
+    # the state is renamed last, so its replay buffer is never older than itself
+    os.replace(f'{path}.tmp', path)
+
+
+def load_training_state(
+    algo: Any,
+    log_dir: str,
+    buffer: Optional[OffPolicyBuffer] = None,
+) -> Dict[str, int]:
+    """Load the training state saved by :func:`save_training_state` into ``algo``.
+
+    Args:
+        algo: The algorithm, constructed with the same configuration.
+        log_dir (str): The log directory of the interrupted run.
+        buffer (OffPolicyBuffer, optional): The replay buffer.
+
+    Returns:
+        The counters to resume the training loop from.
+    """
+    save_dir = os.path.join(log_dir, 'training_state')
+    path = os.path.join(save_dir, f'proc-{proc_id()}.pt')
+    assert os.path.isfile(path), f'No training state was found in {log_dir}.'
+    load_kwargs = {'map_location': 'cpu'}
+    if 'weights_only' in inspect.signature(torch.load).parameters:
+        # the state holds numpy and python objects besides tensors
+        load_kwargs['weights_only'] = False
+    state = torch.load(path, **load_kwargs)
+    load_attribute_states(algo, state['algo'])
+    load_attribute_states(algo.env, state['env'])
+    set_env_rng_state(algo.env.env, state['env_rng'])
+    if buffer is not None:
+        with open(os.path.join(save_dir, f'replay_buffer-{proc_id()}.npz'), 'rb') as file:
+            buffer.load(file)
+    set_rng_state(state['rng'])
+    return state['progress']
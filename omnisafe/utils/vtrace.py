@@ -14,10 +14,12 @@
 # ==============================================================================
 """vtrace"""
 
-from typing import Tuple
+from typing import Optional, Tuple
 
 import torch
 
+from omnisafe.utils.core import discount_cumsum_torch
+
 
 # pylint: disable-next=too-many-arguments,too-many-locals
 def calculate_v_trace(
@@ -28,6 +30,7 @@ def calculate_v_trace(
     gamma: float = 0.99,
     rho_bar: float = 1.0,
     c_bar: float = 1.0,
+    done: Optional[torch.Tensor] = None,
 ) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor,]:
     r"""This function is used to calculate V-trace targets.
 
@@ -35,46 +38,49 @@ def calculate_v_trace(
         A_t = \sum_{k=0}^{n-1} (\lambda \gamma)^k \delta_{t+k} +
         (\lambda \gamma)^n * \rho_{t+n} * (1 - d_{t+n}) * (V(x_{t+n}) - b_{t+n})
 
-    Calculate V-trace targets for off-policy actor-critic learning recursively.
+    Calculate V-trace targets for off-policy actor-critic learning.
     For more details,
     please refer to the paper: `Espeholt et al. 2018, IMPALA <https://arxiv.org/abs/1802.01561>`_.
 
+    The inputs are either single sequences, or ``(sequence_length, batch_size)`` blocks
+    of sequences that are processed at once.
+    The recursion :math:`v_s - V(x_s) = \delta_s + \gamma c_s (v_{s+1} - V(x_{s+1}))`
+    is solved for the whole block by the scan in :func:`discount_cumsum_torch`.
+
     Args:
-        policy_action_probs (torch.Tensor): action probabilities of policy network, shape=(sequence_length,)
-        values (torch.Tensor): state values, shape=(sequence_length+1,)
-        rewards (torch.Tensor): rewards, shape=(sequence_length+1,)
-        behavior_action_probs (torch.Tensor): action probabilities of behavior network, shape=(sequence_length,)
+        policy_action_probs (torch.Tensor): action probabilities of policy network,
+            shape=(sequence_length,) or (sequence_length, batch_size)
+        values (torch.Tensor): state values, shape=(sequence_length+1,) or (sequence_length+1, batch_size)
+        rewards (torch.Tensor): rewards, shape=(sequence_length+1,) or (sequence_length+1, batch_size)
+        behavior_action_probs (torch.Tensor): action probabilities of behavior network,
+            shape=(sequence_length,) or (sequence_length, batch_size)
         gamma (float): discount factor
         rho_bar (float): clip rho
         c_bar (float): clip c
+        done (torch.Tensor, optional): episode ends, shape=(sequence_length,) or (sequence_length, batch_size)
 
     Returns:
-        tuple: V-trace targets, shape=(batch_size, sequence_length)
+        tuple: V-trace targets, policy advantages and clipped importance weights,
+            shape=(sequence_length,) or (sequence_length, batch_size)
     """
-    assert values.ndim == 1, 'Please provide 1d-arrays'
-    assert rewards.ndim == 1
-    assert policy_action_probs.ndim == 1
-    assert behavior_action_probs.ndim == 1
+    assert values.shape == rewards.shape
+    assert policy_action_probs.shape == behavior_action_probs.shape
+    assert values.shape[1:] == policy_action_probs.shape[1:]
+    assert values.shape[0] == policy_action_probs.shape[0] + 1
     assert c_bar <= rho_bar
 
-    sequence_length = policy_action_probs.shape[0]
     # pylint: disable-next=assignment-from-no-return
     rhos = torch.div(policy_action_probs, behavior_action_probs)
-    clip_rhos = torch.min(
-        rhos, torch.as_tensor(rho_bar)
-    )  # pylint: disable=assignment-from-no-return
-    clip_cs = torch.min(rhos, torch.as_tensor(c_bar))  # pylint: disable=assignment-from-no-return
-    v_s = values[:-1].clone()  # copy all values except bootstrap value
-    last_v_s = values[-1]  # bootstrap from last state
+    clip_rhos = torch.clamp(rhos, max=rho_bar)
+    clip_cs = torch.clamp(rhos, max=c_bar)
+    not_done = torch.ones_like(rhos) if done is None else 1.0 - done.to(rhos.dtype)
 
     # calculate v_s
-    for index in reversed(range(sequence_length)):
-        delta = clip_rhos[index] * (rewards[index] + gamma * values[index + 1] - values[index])
-        v_s[index] += delta + gamma * clip_cs[index] * (last_v_s - values[index + 1])
-        last_v_s = v_s[index]  # accumulate current v_s for next iteration
+    deltas = clip_rhos * (rewards[:-1] + gamma * not_done * values[1:] - values[:-1])
+    v_s = values[:-1] + discount_cumsum_torch(deltas, gamma * clip_cs, done=done).to(values.dtype)
 
     # calculate q_targets
     v_s_plus_1 = torch.cat((v_s[1:], values[-1:]))
-    policy_advantage = clip_rhos * (rewards[:-1] + gamma * v_s_plus_1 - values[:-1])
+    policy_advantage = clip_rhos * (rewards[:-1] + gamma * not_done * v_s_plus_1 - values[:-1])
 
     return v_s, policy_advantage, clip_rhos
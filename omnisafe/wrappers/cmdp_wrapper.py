@@ -18,7 +18,6 @@ from copy import deepcopy
 from dataclasses import dataclass
 
 import numpy as np
-import safety_gymnasium
 import torch
 
 from omnisafe.common.buffer import OffPolicyBuffer, VectorOnPolicyBuffer
@@ -166,6 +165,8 @@ class CMDPWrapper:  # pylint: disable=too-many-instance-attributes
         )
         self.record_queue = RecordQueue('ep_ret', 'ep_cost', 'ep_len', maxlen=self.cfgs.max_len)
         self.rollout_data.current_obs = CMDPWrapper.reset(self)[0]
+        # the normalized current_obs of off-policy roll-outs, None if it has to be normalized
+        self.normalized_current_obs: Optional[torch.Tensor] = None
         self._init_check()
 
     def _init_check(self) -> None:
@@ -174,14 +175,28 @@ class CMDPWrapper:  # pylint: disable=too-many-instance-attributes
             raise RuntimeError('Environment is not initialized.')
 
     def make(self, env_id, env_kwargs):
-        """Create environments."""
+        """Create environments.
+
+        .. note::
+
+            If ``async_env`` is ``True`` and ``num_envs`` is greater than 1,
+            each environment is stepped in its own worker process,
+            and the observations are written into a shared-memory block,
+            which is read by :meth:`step` without pickling.
+            Otherwise, all environments are stepped serially in the current process.
+        """
+        import safety_gymnasium  # pylint: disable=import-outside-toplevel
+
         if self.cfgs.num_envs == 1:
             self.env = safety_gymnasium.make(env_id, **env_kwargs)
             self.observation_space = self.env.observation_space
             self.action_space = self.env.action_space
         else:
             self.env = safety_gymnasium.vector.make(
-                env_id, num_envs=self.cfgs.num_envs, **env_kwargs
+                env_id,
+                num_envs=self.cfgs.num_envs,
+                asynchronous=self.cfgs.async_env,
+                **env_kwargs,
             )
             self.observation_space = self.env.single_observation_space
             self.action_space = self.env.single_action_space
@@ -215,6 +230,10 @@ class CMDPWrapper:  # pylint: disable=too-many-instance-attributes
         """Render the vectored environment."""
         return self.env.render()
 
+    def close(self) -> None:
+        """Close the environment and terminate the worker processes of async environments."""
+        self.env.close()
+
     def set_rollout_cfgs(self, **kwargs: dict) -> None:
         """Set rollout configs.
 
@@ -320,37 +339,35 @@ class CMDPWrapper:  # pylint: disable=too-many-instance-attributes
 
             # store values for statistic purpose
             if self.rollout_data.use_cost:
-                logger.store(
-                    **{'Values/V': value.mean().item(), 'Values/C': cost_value.mean().item()}
-                )
+                logger.store(**{'Values/V': value, 'Values/C': cost_value})
             else:
-                logger.store(**{'Values/V': value.mean().item()})
+                logger.store(**{'Values/V': value})
 
             # update observation
             obs = next_obs
-            terminals = done | truncated
+            timeouts = self.rollout_data.rollout_log.ep_len == self.rollout_data.max_ep_len
+            terminals = done | truncated | timeouts
             epoch_ended = step_i >= self.rollout_data.local_steps_per_epoch - 1
-            for idx, terminal in enumerate(terminals):
-                timeout = self.rollout_data.rollout_log.ep_len[idx] == self.rollout_data.max_ep_len
-                terminal = terminal or timeout
-                if terminal or epoch_ended:
-                    if epoch_ended:
-                        _, _, terminal_value, terminal_cost_value, _ = agent.step(obs[idx])
-                        terminal_value, terminal_cost_value = torch.unsqueeze(
-                            terminal_value, 0
-                        ), torch.unsqueeze(terminal_cost_value, 0)
-                        self.reset_log(idx)
-                    else:
-                        terminal_value, terminal_cost_value = torch.zeros(
-                            1, dtype=torch.float32, device=self.cfgs.device
-                        ), torch.zeros(1, dtype=torch.float32, device=self.cfgs.device)
-                        self.rollout_log(logger, idx)
-                        self.reset_log(idx)
-                    buf.finish_path(
-                        last_value_r=terminal_value,
-                        last_value_c=terminal_cost_value,
-                        idx=idx,
-                    )
+            if epoch_ended:
+                # bootstrap the values of all environments with one forward pass
+                _, _, terminal_value, terminal_cost_value, _ = agent.step(obs)
+                finished_idx = np.arange(self.cfgs.num_envs)
+            elif terminals.any():
+                finished_idx = np.flatnonzero(terminals)
+                terminal_value = torch.zeros(
+                    len(finished_idx), dtype=torch.float32, device=self.cfgs.device
+                )
+                terminal_cost_value = torch.zeros_like(terminal_value)
+                for idx in finished_idx:
+                    self.rollout_log(logger, idx)
+            else:
+                continue
+            self.reset_log(finished_idx)
+            buf.finish_path(
+                last_value_r=terminal_value,
+                last_value_c=terminal_cost_value,
+                idx=torch.as_tensor(finished_idx),
+            )
 
     # pylint: disable-next=too-many-arguments, too-many-locals
     def off_policy_roll_out(
@@ -385,15 +402,16 @@ class CMDPWrapper:  # pylint: disable=too-many-instance-attributes
         for _ in range(ep_steps):
             obs = self.rollout_data.current_obs
             if self.cfgs.normalized_obs:
-                obs = self.obs_normalizer.normalize(obs)
+                # the next_obs of the last step is stored as this obs, so that they are equal
+                obs = self.normalized_current_obs
+                if obs is None:
+                    obs = self.obs_normalizer.normalize(self.rollout_data.current_obs)
             _, action, value, cost_value, _ = agent.step(obs, deterministic=deterministic)
             # store values for statistic purpose
             if self.rollout_data.use_cost:
-                logger.store(
-                    **{'Values/V': value.mean().item(), 'Values/C': cost_value.mean().item()}
-                )
+                logger.store(**{'Values/V': value, 'Values/C': cost_value})
             else:
-                logger.store(**{'Values/V': value.mean().item()})
+                logger.store(**{'Values/V': value})
             if use_rand_action:
                 action = self.sample_action()
             # step the env
@@ -408,6 +426,7 @@ class CMDPWrapper:  # pylint: disable=too-many-instance-attributes
             self.rollout_data.current_obs = next_obs
             if self.cfgs.normalized_obs:
                 next_obs = self.obs_normalizer.normalize(next_obs)
+                self.normalized_current_obs = next_obs
             terminals = done | truncated
             epoch_ended = self.rollout_data.rollout_log.ep_len >= self.rollout_data.max_ep_len
             terminals = terminals & ~epoch_ended
@@ -425,6 +444,7 @@ class CMDPWrapper:  # pylint: disable=too-many-instance-attributes
                     self.reset_log(idx)
             if epoch_ended:
                 self.rollout_data.current_obs, _ = self.reset()
+                self.normalized_current_obs = None
 
     def reset_log(
         self,
@@ -16,7 +16,6 @@
 
 import gymnasium
 import numpy as np
-import safety_gymnasium
 import torch
 
 from omnisafe.wrappers.wrapper_registry import WRAPPER_REGISTRY
@@ -91,6 +90,8 @@ class ModelBasedEnvWrapper:  # pylint: disable=too-many-instance-attributes
             self.task = self.task.capitalize()  # mujoco  not use this attribute
             assert self.robot in ROBOTS, f'can not recognize the robot type {self.robot}'
             assert self.task in TASKS, f'can not recognize the task type {self.task}'
+            import safety_gymnasium  # pylint: disable=import-outside-toplevel
+
             self.env = safety_gymnasium.make(env_id, render_mode=render_mode)
             self.init_sensor()
             self.observation_space = gymnasium.spaces.Box(
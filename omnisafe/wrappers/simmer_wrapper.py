@@ -429,6 +429,9 @@ class SimmerWrapper(CMDPWrapper):
 
     """
 
+    #: The safety budget controller restored when resuming training.
+    state_attributes = ('controller',)
+
     def __init__(self, env_id, cfgs: Optional[NamedTuple] = None, **env_kwargs) -> None:
         """Initialize environment wrapper.
 
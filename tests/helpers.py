@@ -15,11 +15,15 @@
 """Helpers"""
 
 import itertools
+from typing import Callable, Dict, Iterator, Tuple
 
 import numpy as np
 import pytest
 import torch
 import torch.types
+from gymnasium.spaces import Box
+
+from omnisafe.common.buffer import OffPolicyBuffer, VectorOffPolicyBuffer
 
 
 def dtype_numpy2torch(dtype: np.dtype) -> torch.dtype:
@@ -53,3 +57,37 @@ def parametrize(**argvalues) -> pytest.mark.parametrize:
     )
 
     return pytest.mark.parametrize(arguments, argvalues, ids=ids)
+
+
+def offpolicy_num_envs(buffer_cls: type) -> int:
+    """Number of environments of the off-policy buffers in tests, 2 for the vector buffers"""
+    return 2 if issubclass(buffer_cls, VectorOffPolicyBuffer) else 1
+
+
+def make_offpolicy_buffer(
+    buffer_cls: type, size: int = 10, batch_size: int = 64, **kwargs
+) -> OffPolicyBuffer:
+    """Make an off-policy buffer with 3-dimensional spaces, of 2 environments if it is a vector one"""
+    num_envs = offpolicy_num_envs(buffer_cls)
+    if num_envs > 1:
+        kwargs['num_envs'] = num_envs
+    space = Box(low=-1, high=1, shape=(3,))
+    return buffer_cls(obs_space=space, act_space=space, size=size, batch_size=batch_size, **kwargs)
+
+
+def offpolicy_transitions(
+    buffer: OffPolicyBuffer,
+    num_steps: int,
+    fill: Callable[[torch.Tensor], torch.Tensor] = torch.randn_like,
+) -> Iterator[Tuple[int, Dict[str, torch.Tensor]]]:
+    """Generate the transitions of ``num_steps`` steps to store in ``buffer``
+
+    The reward identifies each transition by its index in the flattened data of the buffer,
+    the other fields are filled by ``fill``.
+    """
+    size, num_envs = buffer.data['reward'].shape[0], buffer.data['reward'][0].numel()
+    for step in range(num_steps):
+        data = {key: fill(value[0]) for key, value in buffer.data.items()}
+        reward = torch.arange(num_envs, dtype=data['reward'].dtype) + step % size * num_envs
+        data['reward'] = reward.reshape(data['reward'].shape)
+        yield step, data
@@ -14,13 +14,25 @@
 # ==============================================================================
 """Test Buffers"""
 
+import io
+import tempfile
+
 import torch
 from gymnasium.spaces import Box
 
 import helpers
 from omnisafe.common.buffer import (
+    BatchPrefetcher,
+    DeduplicatedOffPolicyBuffer,
+    DeduplicatedVectorOffPolicyBuffer,
+    MemmapOffPolicyBuffer,
+    MemmapVectorOffPolicyBuffer,
+    MinSegmentTree,
     OffPolicyBuffer,
     OnPolicyBuffer,
+    PrioritizedOffPolicyBuffer,
+    PrioritizedVectorOffPolicyBuffer,
+    SumSegmentTree,
     VectorOffPolicyBuffer,
     VectorOnPolicyBuffer,
 )
@@ -79,7 +91,6 @@ def test_vector_onpolicy_buffer(
     assert (
         vector_buffer.standardized_adv_r == standardized_adv_r
     ), f'vector_buffer.sstandardized_adv_r is {vector_buffer.sstandardized_adv_r}'
-    assert vector_buffer.buffers is not [], f'vector_buffer.buffers is {vector_buffer.buffers}'
 
     # checking the store function
     obs_dim = obs_space.shape[0]
@@ -96,37 +107,28 @@ def test_vector_onpolicy_buffer(
         vector_buffer.store(
             obs=obs, act=act, reward=reward, cost=cost, value_r=value_r, value_c=value_c, logp=logp
         )
-        for idx, buffer in enumerate(vector_buffer.buffers):
-            assert torch.allclose(
-                buffer.data['obs'][buffer.ptr - 1], obs[idx]
-            ), f'buffer.data[obs][buffer.ptr - 1] is {buffer.data["obs"][buffer.ptr - 1]}'
-            assert torch.allclose(
-                buffer.data['act'][buffer.ptr - 1], act[idx]
-            ), f'buffer.data[act][buffer.ptr - 1] is {buffer.data["act"][buffer.ptr - 1]}'
-            assert torch.allclose(
-                buffer.data['reward'][buffer.ptr - 1], reward[idx]
-            ), f'buffer.data[reward][buffer.ptr - 1] is {buffer.data["reward"][buffer.ptr - 1]}'
-            assert torch.allclose(
-                buffer.data['cost'][buffer.ptr - 1], cost[idx]
-            ), f'buffer.data[cost][buffer.ptr - 1] is {buffer.data["cost"][buffer.ptr - 1]}'
-            assert torch.allclose(
-                buffer.data['value_r'][buffer.ptr - 1], value_r[idx]
-            ), f'buffer.data[value_r][buffer.ptr - 1] is {buffer.data["value_r"][buffer.ptr - 1]}'
+        ptr = vector_buffer.ptr - 1
+        for key, value in {
+            'obs': obs,
+            'act': act,
+            'reward': reward,
+            'cost': cost,
+            'value_r': value_r,
+            'value_c': value_c,
+            'logp': logp,
+        }.items():
             assert torch.allclose(
-                buffer.data['value_c'][buffer.ptr - 1], value_c[idx]
-            ), f'buffer.data[value_c][buffer.ptr - 1] is {buffer.data["value_c"][buffer.ptr - 1]}'
-            assert torch.allclose(
-                buffer.data['logp'][buffer.ptr - 1], logp[idx]
-            ), f'buffer.data[logp][buffer.ptr - 1] is {buffer.data["logp"][buffer.ptr - 1]}'
+                vector_buffer.data[key][ptr], value.reshape(vector_buffer.data[key][ptr].shape)
+            ), f'vector_buffer.data[{key}][ptr] is {vector_buffer.data[key][ptr]}'
 
     # checking the finish_path function
-    for idx, buffer in enumerate(vector_buffer.buffers):
+    for idx in range(num_envs):
         last_value_r = torch.randn(1, device=device)
         last_value_c = torch.randn(1, device=device)
         vector_buffer.finish_path(last_value_r, last_value_c, idx)
         assert (
-            buffer.path_start_idx == buffer.ptr
-        ), f'buffer.path_start_idx is {buffer.path_start_idx}'
+            vector_buffer.path_start_idx[idx] == vector_buffer.ptr
+        ), f'vector_buffer.path_start_idx is {vector_buffer.path_start_idx}'
 
     # checking the get function
     data = vector_buffer.get()
@@ -389,3 +391,229 @@ def test_offpolicy_buffer(
     assert data['cost'].shape == (batch_size,)
     assert data['done'].shape == (batch_size,)
     assert data['next_obs'].shape == (batch_size, *obs_space.shape)
+
+
+@helpers.parametrize(buffer_cls=[OffPolicyBuffer, VectorOffPolicyBuffer])
+def test_offpolicy_buffer_save_load(buffer_cls: type) -> None:
+    """Test that a partially filled buffer is restored from its compressed file."""
+    buffer = helpers.make_offpolicy_buffer(buffer_cls, batch_size=4)
+    for _, data in helpers.offpolicy_transitions(buffer, 7):
+        buffer.store(**data)
+
+    file = io.BytesIO()
+    buffer.save(file)
+    file.seek(0)
+    restored = helpers.make_offpolicy_buffer(buffer_cls, batch_size=4)
+    restored.load(file)
+
+    assert (restored._ptr, restored._size) == (7, 7)
+    for key, value in buffer.data.items():
+        assert torch.equal(restored.data[key], value), f'{key} is not restored'
+
+
+@helpers.parametrize(capacity=[1, 5, 1000])
+def test_segment_tree(capacity: int) -> None:
+    """Test the batched segment trees against their dense reductions."""
+    sum_tree, min_tree = SumSegmentTree(capacity), MinSegmentTree(capacity)
+    values = torch.rand(capacity, dtype=torch.float64)
+    values[torch.rand(capacity) < 0.3] = 0.0
+    values[0] = 1.0
+    sum_tree[torch.arange(capacity)] = values
+    min_tree[torch.arange(capacity)] = values
+    idx = torch.randint(0, capacity, (capacity // 2,))
+    values[idx] = 2.0
+    sum_tree[idx] = values[idx]
+    min_tree[idx] = values[idx]
+
+    assert torch.allclose(sum_tree.reduce(), values.sum())
+    assert torch.equal(min_tree.reduce(), values.min())
+    prefixsum = torch.rand(100, dtype=torch.float64) * values.sum()
+    expected = torch.searchsorted(values.cumsum(0), prefixsum, right=True)
+    assert torch.equal(sum_tree.find_prefixsum_idx(prefixsum), expected)
+
+
+@helpers.parametrize(buffer_cls=[PrioritizedOffPolicyBuffer, PrioritizedVectorOffPolicyBuffer])
+def test_prioritized_offpolicy_buffer(buffer_cls: type) -> None:
+    """Test that transitions are sampled proportionally to their priorities."""
+    num_envs = helpers.offpolicy_num_envs(buffer_cls)
+    buffer = helpers.make_offpolicy_buffer(
+        buffer_cls,
+        batch_size=1000,
+        alpha=1.0,
+        beta=1.0,
+        cost_priority_scale=3.0,
+        eps=0.0,
+    )
+    for _, data in helpers.offpolicy_transitions(buffer, 12, fill=torch.zeros_like):
+        buffer.store(**data)
+
+    # new transitions all get the maximum priority
+    batch = buffer.sample_batch()
+    assert batch['obs'].shape == (1000 * num_envs, 3)
+    assert torch.allclose(batch['weights'], torch.ones(1000 * num_envs))
+    assert torch.equal(batch['indices'], batch['reward'].long())
+    assert set(batch['indices'].tolist()) == set(range(10 * num_envs))
+
+    # only the transitions of one row have non-zero TD errors, one of them non-zero cost
+    indices = torch.arange(10 * num_envs)
+    td_errors = torch.zeros(10 * num_envs)
+    td_errors[:num_envs] = 1.0
+    buffer.data['cost'][0, ...] = 1.0
+    buffer.update_priorities(indices, td_errors)
+    batch = buffer.sample_batch()
+    assert torch.all(torch.isin(batch['indices'], indices[:num_envs]))
+
+    # the weights correct the sampling bias, relative to the least likely transition
+    td_errors[num_envs:] = 0.5
+    buffer.update_priorities(indices, td_errors)
+    batch = buffer.sample_batch()
+    expected = torch.where(batch['indices'] < num_envs, 0.5 / 3.0, 1.0)
+    assert torch.allclose(batch['weights'], expected)
+
+
+@helpers.parametrize(
+    buffer_cls=[MemmapOffPolicyBuffer, MemmapVectorOffPolicyBuffer],
+    cache_size=[0, 4],
+)
+def test_memmap_offpolicy_buffer(buffer_cls: type, cache_size: int) -> None:
+    """Test that the memory-mapped buffer matches the in-memory one, and can be reopened."""
+    num_envs = helpers.offpolicy_num_envs(buffer_cls)
+    dense = helpers.make_offpolicy_buffer(
+        VectorOffPolicyBuffer if num_envs > 1 else OffPolicyBuffer
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        buffer = helpers.make_offpolicy_buffer(
+            buffer_cls, directory=directory, cache_size=cache_size
+        )
+        for _, data in helpers.offpolicy_transitions(dense, 13):
+            dense.store(**data)
+            buffer.store(**data)
+        for key, value in dense.data.items():
+            assert torch.equal(buffer.data[key], value), f'{key} is not stored'
+
+        # every sampled transition is a stored one, whether it is read from the cache or the file
+        batch = buffer.sample_batch()
+        assert batch['obs'].shape == (64 * num_envs, 3)
+        stored = dense.data['obs'].reshape(-1, 3)[batch['reward'].long()]
+        assert torch.equal(batch['obs'], stored)
+
+        buffer.flush()
+        reopened = helpers.make_offpolicy_buffer(buffer_cls, directory=directory)
+        assert (reopened._ptr, reopened._size) == (3, 10)
+        for key, value in dense.data.items():
+            assert torch.equal(reopened.data[key], value), f'{key} is not reopened'
+
+
+@helpers.parametrize(buffer_cls=[MemmapOffPolicyBuffer, MemmapVectorOffPolicyBuffer])
+def test_memmap_offpolicy_buffer_sample_batches(buffer_cls: type) -> None:
+    """Test that each batch of the memory-mapped buffer is drawn from the whole buffer."""
+    num_envs = helpers.offpolicy_num_envs(buffer_cls)
+    with tempfile.TemporaryDirectory() as directory:
+        buffer = helpers.make_offpolicy_buffer(
+            buffer_cls, size=1000, batch_size=100, directory=directory
+        )
+        for _, data in helpers.offpolicy_transitions(buffer, 1000):
+            buffer.store(**data)
+        for batch in BatchPrefetcher(buffer).batches(10):
+            # a slice of a sorted sample would only hold about a tenth of the steps
+            steps = batch['reward'] // num_envs
+            assert steps.min() < 100 and steps.max() >= 900
+
+
+@helpers.parametrize(buffer_cls=[DeduplicatedOffPolicyBuffer, DeduplicatedVectorOffPolicyBuffer])
+def test_deduplicated_offpolicy_buffer(buffer_cls: type) -> None:
+    """Test that the rebuilt next observations match the stored ones, across episode ends."""
+    num_envs = helpers.offpolicy_num_envs(buffer_cls)
+    dense = helpers.make_offpolicy_buffer(
+        VectorOffPolicyBuffer if num_envs > 1 else OffPolicyBuffer
+    )
+    buffer = helpers.make_offpolicy_buffer(buffer_cls, boundary_capacity=1)
+    assert 'next_obs' not in buffer.data
+    obs = torch.randn(num_envs, 3)
+    for step, data in helpers.offpolicy_transitions(dense, 23):
+        next_obs = torch.randn(num_envs, 3)
+        data['obs'], data['next_obs'] = obs.squeeze(0), next_obs.squeeze(0)
+        dense.store(**data)
+        buffer.store(**data)
+        # the next episode of each environment starts from a new observation every 4 steps
+        new_episode = (step + torch.arange(num_envs).reshape(-1, 1)) % 4 == 0
+        obs = torch.where(new_episode, torch.randn(num_envs, 3), next_obs)
+
+    assert 0 < buffer.num_boundaries < 10 * num_envs
+    batch = buffer.sample_batch()
+    expected = dense.data['next_obs'].reshape(-1, 3)[batch['reward'].long()]
+    assert batch['next_obs'].shape == (64 * num_envs, 3)
+    assert torch.equal(batch['next_obs'], expected)
+
+    file = io.BytesIO()
+    buffer.save(file)
+    file.seek(0)
+    restored = helpers.make_offpolicy_buffer(buffer_cls)
+    restored.load(file)
+    idx = torch.arange(10 * num_envs)
+    assert torch.equal(restored._next_obs(idx), dense.data['next_obs'].reshape(-1, 3))
+
+
+@helpers.parametrize(
+    buffer_cls=[OffPolicyBuffer, VectorOffPolicyBuffer],
+    dtypes=[
+        {'obs': torch.float16, 'act': torch.bfloat16, 'done': torch.bool},
+        {'obs': torch.int8, 'done': torch.uint8},
+    ],
+)
+def test_offpolicy_buffer_dtypes(buffer_cls: type, dtypes: dict) -> None:
+    """Test that compactly stored fields are sampled as float32, within their precision."""
+    num_envs = helpers.offpolicy_num_envs(buffer_cls)
+    dense = helpers.make_offpolicy_buffer(buffer_cls)
+    buffer = helpers.make_offpolicy_buffer(buffer_cls, dtypes=dtypes)
+    assert buffer.data['next_obs'].dtype == dtypes['obs']
+    assert buffer.data['done'].dtype == dtypes['done']
+    for step, data in helpers.offpolicy_transitions(dense, 13):
+        # the observations grow, so that the quantization scale grows as well
+        data['obs'] *= 2.0**step
+        data['done'] = torch.rand_like(data['done']) < 0.5
+        dense.store(**data)
+        buffer.store(**data)
+
+    batch = buffer.sample_batch()
+    assert all(value.dtype == torch.float32 for value in batch.values())
+    idx = batch['reward'].long()
+    expected = {key: value.reshape(10 * num_envs, -1)[idx] for key, value in dense.data.items()}
+    assert torch.equal(batch['done'], expected['done'].squeeze(-1))
+    # each growth of the scale rounds the stored values again, by at most half a step
+    absmax = dense.data['obs'].reshape(-1, 3).abs().amax(0)
+    tolerance = 2.0 * absmax / 127.0 if dtypes['obs'] == torch.int8 else absmax * 2.0**-10
+    assert torch.all((batch['obs'] - expected['obs']).abs() <= tolerance)
+    assert torch.allclose(batch['act'], expected['act'], rtol=2.0**-8, atol=0.0)
+
+    file = io.BytesIO()
+    buffer.save(file)
+    file.seek(0)
+    restored = helpers.make_offpolicy_buffer(buffer_cls, dtypes=dtypes)
+    restored.load(file)
+    for key, value in buffer.data.items():
+        assert torch.equal(restored.data[key], value), f'{key} is not restored'
+        assert torch.equal(restored._decode(key, value), buffer._decode(key, value))
+
+
+@helpers.parametrize(
+    buffer_cls=[OffPolicyBuffer, VectorOffPolicyBuffer, PrioritizedVectorOffPolicyBuffer]
+)
+def test_batch_prefetcher(buffer_cls: type) -> None:
+    """Test that the prefetched batches are stored transitions, laid out like sampled ones."""
+    num_envs = helpers.offpolicy_num_envs(buffer_cls)
+    buffer = helpers.make_offpolicy_buffer(buffer_cls, batch_size=16)
+    for _, data in helpers.offpolicy_transitions(buffer, 7):
+        buffer.store(**data)
+
+    batches = list(BatchPrefetcher(buffer).batches(5))
+    assert len(batches) == 5
+    for batch in batches:
+        idx = batch['reward'].long()
+        assert batch['obs'].shape == (16 * num_envs, 3)
+        assert torch.all(idx < 7 * num_envs)
+        assert torch.equal(batch['obs'], buffer.data['obs'].reshape(-1, 3)[idx])
+        if buffer_cls is VectorOffPolicyBuffer:
+            assert torch.equal(idx % num_envs, torch.arange(num_envs).repeat(16))
+        else:
+            assert buffer_cls is OffPolicyBuffer or 'weights' in batch
@@ -25,8 +25,9 @@ import helpers
 from omnisafe.models import ActorBuilder, CriticBuilder
 from omnisafe.models.actor_critic import ActorCritic
 from omnisafe.models.actor_q_critic import ActorQCritic
+from omnisafe.models.critic import QCritic
 from omnisafe.utils.config import Config
-from omnisafe.utils.model_utils import Activation, InitFunction
+from omnisafe.utils.model_utils import Activation, EnsembleLinear, InitFunction
 
 
 @helpers.parametrize(
@@ -63,6 +64,35 @@ def test_critic(
     assert out2.shape == torch.Size([]), f'v_critic output shape is {out2.shape}'
 
 
+@helpers.parametrize(num_critics=[1, 2, 10], use_obs_encoder=[True, False])
+def test_q_critic_ensemble(num_critics: int, use_obs_encoder: bool) -> None:
+    """Test that the batched critics match independent per-critic MLPs."""
+    q_critic = QCritic(
+        obs_dim=10,
+        act_dim=5,
+        hidden_sizes=[64, 64],
+        activation='relu',
+        num_critics=num_critics,
+        use_obs_encoder=use_obs_encoder,
+    )
+    obs, act = torch.randn(32, 10), torch.randn(32, 5)
+    q_values = q_critic(obs, act)
+    assert q_values.shape == (num_critics, 32)
+    for idx in range(num_critics):
+        layers = [module for module in q_critic.modules() if isinstance(module, EnsembleLinear)]
+        hidden = obs
+        for layer in layers:
+            if use_obs_encoder and layer is layers[1]:
+                hidden = torch.cat([hidden, act], dim=-1)
+            elif not use_obs_encoder and layer is layers[0]:
+                hidden = torch.cat([hidden, act], dim=-1)
+            hidden = hidden @ layer.weight[idx] + layer.bias[idx]
+            if layer is not layers[-1]:
+                hidden = torch.relu(hidden)
+        assert torch.allclose(q_values[idx], hidden.squeeze(-1), atol=1e-5)
+    assert q_critic(obs[0], act[0]).shape == (num_critics,)
+
+
 @helpers.parametrize(
     actor_type=['gaussian', 'gaussian_stdnet'],
     obs_dim=[10],
@@ -63,6 +63,39 @@ def test_off_policy(off_policy_algo):
     agent.learn()
 
 
+@helpers.parametrize(off_policy_algo=['DDPG', 'SACLag', 'TD3Lag'])
+def test_off_policy_fused_update(off_policy_algo):
+    """Test off policy algorithms with the fused update loop."""
+    env_id = 'SafetyHumanoidVelocity-v4'
+    custom_cfgs = {
+        'epochs': 1,
+        'steps_per_epoch': 1000,
+        'update_after': 998,
+        'update_every': 2,
+        'utd_ratio': 2,
+        'fused_update': True,
+        'use_wandb': False,
+    }
+    agent = omnisafe.Agent(off_policy_algo, env_id, custom_cfgs=custom_cfgs, parallel=1)
+    agent.learn()
+
+
+@helpers.parametrize(off_policy_algo=['SACLag', 'TD3Lag'])
+def test_off_policy_async(off_policy_algo):
+    """Test off policy algorithms with decoupled actor processes."""
+    env_id = 'SafetyHumanoidVelocity-v4'
+    custom_cfgs = {
+        'epochs': 1,
+        'steps_per_epoch': 1000,
+        'update_after': 900,
+        'update_every': 50,
+        'async_cfgs': {'num_actors': 2},
+        'use_wandb': False,
+    }
+    agent = omnisafe.Agent(off_policy_algo, env_id, custom_cfgs=custom_cfgs, parallel=1)
+    agent.learn()
+
+
 @helpers.parametrize(algo=naive_lagrange_policy)
 def test_naive_lagrange_policy(algo):
     """Test naive lagrange algorithms."""
@@ -112,6 +145,25 @@ def test_second_order_policy(algo):
     agent.learn()
 
 
+@helpers.parametrize(algo=['TRPO', 'TRPOPid'] + second_order_policy)
+def test_batched_line_search(algo):
+    """Test second order algorithms with the batched line search and the analytic Fisher."""
+    env_id = 'SafetyHumanoidVelocity-v4'
+    custom_cfgs = {
+        'epochs': 1,
+        'steps_per_epoch': 1000,
+        'pi_iters': 1,
+        'critic_iters': 1,
+        'env_cfgs': {'num_envs': 1},
+        'cost_limit': 0.01,
+        'batched_line_search': True,
+        'analytic_fisher': True,
+        'use_wandb': False,
+    }
+    agent = omnisafe.Agent(algo, env_id, custom_cfgs=custom_cfgs, parallel=1)
+    agent.learn()
+
+
 @helpers.parametrize(algo=pid_lagrange_policy)
 def test_pid_lagrange_policy(algo):
     """Test pid lagrange algorithms."""
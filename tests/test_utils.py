@@ -15,18 +15,34 @@
 """Test Utils"""
 
 import os
+import subprocess
 import sys
+import tempfile
+from copy import deepcopy
 
 import numpy as np
+import pytest
 import torch
+import torch.distributed as dist
 
 import helpers
 import omnisafe
 from omnisafe.common.experiment_grid import ExperimentGrid
+from omnisafe.common.fisher_vector_product import FisherVectorProduct
+from omnisafe.common.logger import Logger
+from omnisafe.common.polyak_averager import PolyakAverager
+from omnisafe.models.actor.gaussian_actor import GaussianActor
 from omnisafe.typing import NamedTuple, Tuple
+from omnisafe.utils import distributed_utils, training_state
+from omnisafe.utils.config import Config
 from omnisafe.utils.core import discount_cumsum_torch
-from omnisafe.utils.distributed_utils import mpi_fork, mpi_statistics_scalar
-from omnisafe.utils.tools import to_ndarray
+from omnisafe.utils.distributed_utils import (
+    mpi_fork,
+    mpi_statistics_packed,
+    mpi_statistics_scalar,
+)
+from omnisafe.utils.tools import iterate_minibatches, to_ndarray
+from omnisafe.utils.vtrace import calculate_v_trace
 
 
 @helpers.parametrize(item=[1, 1.0, [1, 2, 3], (1, 2, 3), {'a': 1, 'b': 2}, torch.tensor([1, 2, 3])])
@@ -50,6 +66,225 @@ def test_to_ndarray(item):
         assert isinstance(to_ndarray(item), np.ndarray)
 
 
+@helpers.parametrize(size=[10, 64], batch_size=[4, 64])
+def test_iterate_minibatches(size: int, batch_size: int):
+    """Test iterate_minibatches."""
+    obs = torch.arange(size)
+    act = torch.arange(size) * 2
+    batches = list(iterate_minibatches(obs, act, batch_size=batch_size))
+    assert len(batches) == -(-size // batch_size)
+    for obs_b, act_b in batches:
+        assert len(obs_b) <= batch_size
+        assert torch.equal(act_b, obs_b * 2), 'fields are not shuffled together'
+    assert torch.equal(torch.cat([obs_b for obs_b, _ in batches]).sort().values, obs)
+
+
+# the first forward-mode jvp of the analytic Fisher loads decompositions with torch.jit.script
+@pytest.mark.filterwarnings('ignore:`torch.jit.script` is deprecated:FutureWarning')
+@helpers.parametrize(analytic=[False, True])
+def test_fisher_vector_product(analytic: bool):
+    """Test FisherVectorProduct against the full KL Hessian-vector product."""
+    actor = GaussianActor(
+        obs_dim=5,
+        act_dim=2,
+        act_max=torch.ones(2),
+        act_min=-torch.ones(2),
+        hidden_sizes=[16, 16],
+    )
+    obs = torch.randn(32, 5)
+    params = list(actor.parameters())
+    vector = torch.randn(sum(param.numel() for param in params))
+
+    q_dist = actor(obs)
+    with torch.no_grad():
+        p_dist = actor(obs)
+    kl = torch.distributions.kl.kl_divergence(p_dist, q_dist).mean()
+    grads = torch.autograd.grad(kl, params, create_graph=True)
+    flat_grad_kl = torch.cat([grad.view(-1) for grad in grads])
+    grads = torch.autograd.grad((flat_grad_kl * vector).sum(), params)
+    expected = torch.cat([grad.contiguous().view(-1) for grad in grads]) + 0.1 * vector
+
+    fvp = FisherVectorProduct(actor=actor, damping=0.1, analytic=analytic)
+    fvp.build(obs)
+    for _ in range(2):
+        assert torch.allclose(fvp(vector), expected, atol=1e-5)
+    fvp.release()
+    assert not fvp.is_built
+
+
+def test_polyak_averager():
+    """Test PolyakAverager against the per-parameter ``mul_``/``add_`` update."""
+    source = torch.nn.Sequential(torch.nn.Linear(4, 8), torch.nn.Tanh(), torch.nn.Linear(8, 2))
+    target = deepcopy(source)
+    expected = deepcopy(source)
+    for param in target.parameters():
+        param.requires_grad = False
+    averager = PolyakAverager(source, target, polyak=0.995)
+    for _ in range(3):
+        with torch.no_grad():
+            for param in source.parameters():
+                param.add_(torch.randn_like(param))
+            for param, param_targ in zip(source.parameters(), expected.parameters()):
+                param_targ.mul_(0.995)
+                param_targ.add_(0.005 * param)
+        averager.update()
+        for param, param_targ in zip(expected.parameters(), target.parameters()):
+            assert torch.allclose(param, param_targ, atol=1e-6)
+
+
+def test_mpi_statistics_packed():
+    """Test mpi_statistics_packed against mpi_statistics_scalar."""
+    series = [torch.rand(10) * 100, torch.randn(1), torch.arange(1000.0)]
+    series = [val.double() for val in series]
+    stats = torch.stack(
+        [
+            torch.stack(
+                [val.sum(), torch.tensor(len(val)), val.square().sum(), val.min(), val.max()]
+            )
+            for val in series
+        ]
+    )
+    mean, std, min_val, max_val = mpi_statistics_packed(stats, with_min_and_max=True)
+    for idx, val in enumerate(series):
+        expected_mean, expected_std = mpi_statistics_scalar(val)
+        assert torch.allclose(mean[idx], expected_mean), 'mean is not correct'
+        assert torch.allclose(std[idx], expected_std, atol=1e-4), 'std is not correct'
+        assert min_val[idx] == val.min() and max_val[idx] == val.max()
+
+
+@helpers.parametrize(async_logging=[False, True])
+def test_logger_dump_tabular(async_logging: bool):
+    """Test that the asynchronous logger writes the same progress.txt."""
+    with tempfile.TemporaryDirectory() as output_dir:
+        logger = Logger(
+            output_dir=output_dir,
+            exp_name='test',
+            verbose=False,
+            use_tensorboard=True,
+            async_logging=async_logging,
+            max_queue_size=2,
+            config=Config(epochs=5),
+        )
+        logger.register_key('Metrics/EpRet')
+        logger.register_key('Metrics/EpCost', window_length=2)
+        for epoch in range(5):
+            logger.store(**{'Metrics/EpRet': float(epoch), 'Metrics/EpCost': torch.ones(3)})
+            logger.dump_tabular()
+        progress = os.path.join(logger._log_dir, 'progress.txt')
+        logger.close()
+        with open(progress, encoding='utf-8') as file:
+            lines = file.read().splitlines()
+    assert lines[0] == 'Metrics/EpRet Metrics/EpCost'
+    assert lines[1:] == [f'{float(epoch)} 1.0' for epoch in range(5)]
+
+
+@helpers.parametrize(window_length=[None, 3])
+def test_logger_store_tensors(window_length):
+    """Test that stored tensors and numbers give the same statistics."""
+    with tempfile.TemporaryDirectory() as output_dir:
+        logger = Logger(
+            output_dir=output_dir, exp_name='test', verbose=False, config=Config(epochs=1)
+        )
+        logger.register_key('Values/V', window_length=window_length, min_and_max=True)
+        values = [1.0, 4.0, -2.0, 5.0]
+        logger.store(**{'Values/V': values[0]})
+        for val in values[1:]:
+            logger.store(**{'Values/V': torch.full((2, 3), val, requires_grad=True)})
+        expected = values if window_length is None else values[-window_length:]
+        mean, min_val, max_val, std = logger.get_stats('Values/V', min_and_max=True)
+        assert np.isclose(mean, np.mean(expected))
+        assert np.isclose(std, np.std(expected))
+        assert (min_val, max_val) == (min(expected), max(expected))
+        logger.dump_tabular()
+        logger.store(**{'Values/V': torch.tensor(2.0)})
+        expected = [2.0] if window_length is None else [-2.0, 5.0, 2.0]
+        assert np.isclose(logger.get_stats('Values/V')[0], np.mean(expected))
+        logger.close()
+
+
+@helpers.parametrize(async_checkpoint=[False, True])
+def test_logger_torch_save(async_checkpoint: bool):
+    """Test the checkpoint retention policy and the background checkpoint writer."""
+    with tempfile.TemporaryDirectory() as output_dir:
+        logger = Logger(
+            output_dir=output_dir,
+            exp_name='test',
+            verbose=False,
+            use_tensorboard=False,
+            config=Config(epochs=8),
+            async_checkpoint=async_checkpoint,
+            keep_checkpoint_last=2,
+            keep_checkpoint_every=3,
+        )
+        model = torch.nn.Linear(2, 1)
+        logger.setup_torch_saver(what_to_save={'pi': model})
+        logger.register_key('Metrics/EpRet')
+        for epoch in range(8):
+            with torch.no_grad():
+                model.bias.fill_(epoch)
+            logger.torch_save()
+            logger.store(**{'Metrics/EpRet': float(epoch)})
+            logger.dump_tabular()
+        save_dir = os.path.join(logger._log_dir, 'torch_save')
+        logger.close()
+        assert sorted(os.listdir(save_dir)) == [f'epoch-{epoch}.pt' for epoch in (0, 3, 6, 7)]
+        for epoch in (0, 3, 6, 7):
+            params = torch.load(os.path.join(save_dir, f'epoch-{epoch}.pt'))
+            assert params['pi']['bias'].item() == epoch
+
+
+def test_training_state():
+    """Test that the stateful attributes and the random number generators are restored."""
+
+    class Algo:  # pylint: disable=too-few-public-methods
+        state_attributes = ('counter',)
+
+        def __init__(self):
+            self.net = torch.nn.Linear(2, 1)
+            self.optimizer = torch.optim.Adam(self.net.parameters())
+            self.multiplier = torch.nn.Parameter(torch.zeros(()))
+            self.counter = 0
+            self.name = 'algo'
+
+    algo = Algo()
+    algo.net(torch.randn(4, 2)).sum().backward()
+    algo.optimizer.step()
+    with torch.no_grad():
+        algo.multiplier.fill_(3.0)
+    algo.counter = 5
+    states = training_state.get_attribute_states(algo)
+    rng_state = training_state.get_rng_state()
+    expected = torch.rand(3), np.random.rand(3)
+    assert set(states) == {'net', 'optimizer', 'multiplier', 'counter'}
+
+    restored = Algo()
+    multiplier = restored.multiplier
+    training_state.load_attribute_states(restored, states)
+    training_state.set_rng_state(rng_state)
+    assert torch.equal(restored.net.weight, algo.net.weight)
+    assert restored.optimizer.state_dict()['state'][0]['step'] == 1
+    assert restored.multiplier is multiplier and multiplier.item() == 3.0
+    assert restored.counter == 5
+    assert torch.equal(torch.rand(3), expected[0])
+    assert np.array_equal(np.random.rand(3), expected[1])
+
+
+def test_lazy_import():
+    """Test that algorithms and heavy dependencies are only imported when they are used."""
+    code = (
+        'import sys, omnisafe\n'
+        'heavy = ("wandb", "torch.utils.tensorboard", "safety_gymnasium", "moviepy")\n'
+        'assert not [name for name in heavy if name in sys.modules]\n'
+        'assert "omnisafe.algorithms.off_policy.ddpg" not in sys.modules\n'
+        'from omnisafe.algorithms import registry\n'
+        'assert registry.get("DDPGLag").__module__ == "omnisafe.algorithms.off_policy.ddpg_lag"\n'
+        'assert omnisafe.algorithms.on_policy.PPOLag is registry.get("PPOLag")\n'
+        'assert registry.get("Unknown") is None\n'
+    )
+    env = dict(os.environ, PYTHONPATH=os.path.dirname(os.path.dirname(omnisafe.__file__)))
+    subprocess.run([sys.executable, '-c', code], check=True, env=env)
+
+
 def get_answer(gamma: float) -> torch.Tensor:
     """Input gamma and return the answer."""
     if gamma == 0.9:
@@ -74,11 +309,134 @@ def test_discount_cumsum_torch(
     ), 'discount_cumsum_torch is not correct'
 
 
+@helpers.parametrize(
+    discount=[0.9, 0.99, 0.999],
+)
+def test_batched_discount_cumsum_torch(
+    discount: float,
+):
+    """Test discount_cumsum_torch with a block of sequences and episode ends."""
+    x_block = torch.rand((300, 4), dtype=torch.float64)
+    done = torch.zeros((300, 4), dtype=torch.bool)
+    done[[10, 150, 299], 1] = True
+    done[99, 3] = True
+    y_block = discount_cumsum_torch(x_block, discount, done=done)
+    for env_idx in range(4):
+        ends = [-1] + done[:, env_idx].nonzero().flatten().tolist() + [299]
+        for start, end in zip(ends[:-1], ends[1:]):
+            if start == end:
+                continue
+            assert torch.allclose(
+                y_block[start + 1 : end + 1, env_idx],
+                discount_cumsum_torch(x_block[start + 1 : end + 1, env_idx], discount),
+            ), 'discount_cumsum_torch is not correct'
+
+
+def test_batched_calculate_v_trace():
+    """Test calculate_v_trace with a block of sequences."""
+    policy_action_probs = torch.rand((50, 3))
+    behavior_action_probs = torch.rand((50, 3)) + 0.1
+    values = torch.randn((51, 3))
+    rewards = torch.randn((51, 3))
+    batched = calculate_v_trace(
+        policy_action_probs, values, rewards, behavior_action_probs, rho_bar=2.0, c_bar=0.5
+    )
+    for env_idx in range(3):
+        single = calculate_v_trace(
+            policy_action_probs[:, env_idx],
+            values[:, env_idx],
+            rewards[:, env_idx],
+            behavior_action_probs[:, env_idx],
+            rho_bar=2.0,
+            c_bar=0.5,
+        )
+        for batched_val, single_val in zip(batched, single):
+            assert torch.allclose(
+                batched_val[:, env_idx], single_val, atol=1e-5
+            ), 'calculate_v_trace is not correct'
+
+
+def test_calculate_v_trace_with_done():
+    """Test calculate_v_trace with episode ends against the V-trace recursion."""
+    gamma, rho_bar, c_bar = 0.9, 2.0, 0.5
+    policy_action_probs = torch.rand((50, 3), dtype=torch.float64)
+    behavior_action_probs = torch.rand((50, 3), dtype=torch.float64) + 0.1
+    values = torch.randn((51, 3), dtype=torch.float64)
+    rewards = torch.randn((51, 3), dtype=torch.float64)
+    done = torch.zeros((50, 3), dtype=torch.bool)
+    done[[10, 30], 0] = True
+    done[49, 2] = True
+    v_s, policy_advantage, clip_rhos = calculate_v_trace(
+        policy_action_probs,
+        values,
+        rewards,
+        behavior_action_probs,
+        gamma=gamma,
+        rho_bar=rho_bar,
+        c_bar=c_bar,
+        done=done,
+    )
+    rhos = policy_action_probs / behavior_action_probs
+    for env_idx in range(3):
+        # the recursion does not bootstrap from, or carry over, the step after an episode end
+        v_next, correction = values[50, env_idx], 0.0
+        for step in reversed(range(50)):
+            not_done = 0.0 if done[step, env_idx] else 1.0
+            rho = min(rhos[step, env_idx].item(), rho_bar)
+            c = min(rhos[step, env_idx].item(), c_bar)
+            reward, value = rewards[step, env_idx], values[step, env_idx]
+            assert torch.isclose(clip_rhos[step, env_idx], torch.tensor(rho, dtype=torch.float64))
+            assert torch.isclose(
+                policy_advantage[step, env_idx], rho * (reward + gamma * not_done * v_next - value)
+            ), 'calculate_v_trace is not correct'
+            delta = rho * (reward + gamma * not_done * values[step + 1, env_idx] - value)
+            correction = delta + gamma * c * not_done * correction
+            v_next = value + correction
+            assert torch.isclose(v_s[step, env_idx], v_next), 'calculate_v_trace is not correct'
+
+
 def test_distributed_tools():
     """Test mpi_fork."""
     mpi_fork(2, test_message=['examples/train_from_custom_dict.py', '--parallel', '2'])
 
 
+def test_off_policy_distributed_tools():
+    """Test mpi_fork with an off-policy algorithm."""
+    mpi_fork(
+        2,
+        test_message=['examples/train_from_custom_dict.py', '--parallel', '2', '--algo', 'SACLag'],
+    )
+
+
+def _avg_grads_worker(rank: int, world_size: int, overlap: bool, port: int):
+    """Check mpi_avg_grads against an all_gather of the local gradients."""
+    os.environ.update(MASTER_ADDR='127.0.0.1', MASTER_PORT=str(port))
+    dist.init_process_group('gloo', rank=rank, world_size=world_size)
+    torch.manual_seed(0)
+    net = torch.nn.Sequential(torch.nn.Linear(4, 64), torch.nn.Tanh(), torch.nn.Linear(64, 2))
+    if overlap:
+        distributed_utils.overlap_grad_allreduce(net, bucket_cap_mb=0.0005)
+    for num_backward in (1, 2):
+        net.zero_grad()
+        for _ in range(num_backward):
+            net(torch.full((8, 4), float(rank + num_backward))).pow(2).sum().backward()
+        expected = []
+        for param in net.parameters():
+            grads = [torch.zeros_like(param.grad) for _ in range(world_size)]
+            dist.all_gather(grads, param.grad)
+            expected.append(torch.stack(grads).mean(0))
+        distributed_utils.mpi_avg_grads(net, bucket_cap_mb=0.0005)
+        for param, grad in zip(net.parameters(), expected):
+            assert torch.allclose(param.grad, grad, atol=1e-6), 'mpi_avg_grads is not correct'
+    dist.destroy_process_group()
+
+
+@helpers.parametrize(overlap=[False, True])
+def test_mpi_avg_grads(overlap: bool):
+    """Test bucketed and overlapped mpi_avg_grads with two processes."""
+    torch.multiprocessing.spawn(_avg_grads_worker, args=(2, overlap, 29500 + overlap), nprocs=2)
+
+
 def train(
     exp_id: str, algo: str, env_id: str, custom_cfgs: NamedTuple, num_threads: int = 6
 ) -> Tuple[float, float, float]: